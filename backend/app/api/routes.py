@@ -2,14 +2,18 @@
 API route definitions
 """
 
-from fastapi import APIRouter, HTTPException, Query as QueryParam, Depends, Request
-from typing import List
+from fastapi import APIRouter, HTTPException, Query as QueryParam, Depends, Request, Response
+from fastapi.responses import JSONResponse
+from datetime import date
+from typing import List, Optional
 from app.models.schemas import QueryRequest, QueryResponse, TickerListResponse
 from app.services.query_service import query_service
 from app.services.constituents_service import constituents_service
+from app.services.ticker_catalog import ticker_catalog
 from app.core.config import settings
 from app.core.security import verify_api_key
 from app.core.rate_limit import limiter
+from app.core.timing import span
 
 router = APIRouter()
 
@@ -25,8 +29,16 @@ def limiter_if_enabled(func):
 
 
 @router.get("/tickers", response_model=TickerListResponse)
-async def get_available_tickers():
-    """Get list of all available tickers"""
+async def get_available_tickers(
+    type: Optional[str] = QueryParam(None, description="Only stored tickers of this type (stock, etf, ...)"),
+    exchange: Optional[str] = QueryParam(None, description="Only stored tickers on this exchange"),
+):
+    """
+    Get list of all available tickers
+
+    The category lists come from settings; `tickers` lists every stored
+    ticker with its date coverage, served from the in-memory catalog
+    """
     return TickerListResponse(
         market_indices=settings.MARKET_INDICES,
         sector_etfs=settings.SECTOR_ETFs,
@@ -34,6 +46,8 @@ async def get_available_tickers():
         sentiment_indicators=settings.SENTIMENT_INDICATORS,
         commodities=settings.COMMODITIES,
         top_stocks=settings.TOP_STOCKS,
+        tickers=[info.to_dict() for info in ticker_catalog.tickers(type=type, exchange=exchange)],
+        catalog_version=ticker_catalog.version,
     )
 
 
@@ -48,13 +62,21 @@ async def query_historical_patterns(request: Request, query: QueryRequest):
     - VIX exceeded 30: {"ticker": "VIX", "condition_type": "absolute_threshold", "threshold": 30, "operator": "gt"}
     """
     try:
+        # Malformed (and in strict mode, unknown) tickers are rejected from memory
+        ticker_catalog.validate(query.ticker)
         result = await query_service.execute_query(query)
-        return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+    constituents_service.record_query(query.ticker)
+
+    # Serialize here rather than via response_model so the stage is timed
+    # and the already-validated response is not validated a second time
+    with span("serialize"):
+        return Response(content=result.model_dump_json(), media_type="application/json")
+
 
 @router.get("/health")
 async def health_check():
@@ -67,7 +89,8 @@ async def suggest_tickers(q: str = QueryParam(..., min_length=1, description="Se
     """
     Get ticker suggestions based on search query
 
-    Searches through cached ETF constituents and returns matching tickers with company names
+    Searches an in-memory index of symbols and company names and returns ranked
+    matches: exact symbol, symbol prefix, company name, then typo-tolerant matches
     """
     try:
         suggestions = await constituents_service.search_tickers(q)
@@ -82,13 +105,18 @@ async def get_etf_constituents(request: Request, etf_ticker: str):
     """
     Get constituents for a specific ETF
 
-    Returns the list of stocks held by the specified ETF
+    Returns the list of stocks held by the specified ETF, with portfolio
+    weights (fractions, null when unknown) and the holdings date
     """
     try:
-        holdings = await constituents_service.get_etf_holdings(etf_ticker.upper())
+        etf = etf_ticker.upper()
+        holdings = await constituents_service.get_etf_holdings(etf, with_weights=True)
+        as_of = constituents_service.snapshot.as_of.get(etf)
         return {
-            "etf": etf_ticker.upper(),
-            "constituents": holdings,
+            "etf": etf,
+            "constituents": [h.symbol for h in holdings],
+            "weights": {h.symbol: h.weight for h in holdings},
+            "as_of": as_of.isoformat() if as_of else None,
             "count": len(holdings)
         }
     except Exception as e:
@@ -100,37 +128,41 @@ async def get_etf_constituents(request: Request, etf_ticker: str):
 async def get_historical_prices(
     request: Request,
     ticker: str,
-    start_date: str = QueryParam(None, description="Start date (YYYY-MM-DD)"),
-    end_date: str = QueryParam(None, description="End date (YYYY-MM-DD)")
+    start_date: Optional[date] = QueryParam(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = QueryParam(None, description="End date (YYYY-MM-DD)"),
+    max_points: Optional[int] = QueryParam(
+        None, ge=3, le=10000, description="Downsample to at most this many points (LTTB on close)"
+    ),
 ):
     """
     Get historical price data for a ticker
 
     Returns daily price data for the specified date range.
-    If no dates provided, returns last 5 years of data.
+    If no dates provided, returns the full stored history.
+    With max_points, the series is downsampled server-side for charting.
     """
     from app.services.data_service import data_service
-    from datetime import datetime
+    from app.services.downsample_service import downsample_service
 
     try:
         # Fetch historical data
         data = await data_service.fetch_historical_data(ticker.upper(), period="20y")
-
-        # Convert to list of dicts for JSON response
-        prices = []
-        for date, row in data.iterrows():
-            prices.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "open": float(row["Open"]),
-                "high": float(row["High"]),
-                "low": float(row["Low"]),
-                "close": float(row["Close"]),
-                "volume": int(row["Volume"])
+        version = data_service.get_data_version(data)
+
+        if start_date or end_date:
+            data = data.loc[
+                start_date.isoformat() if start_date else None:end_date.isoformat() if end_date else None
+            ]
+
+        with span("downsample"):
+            prices = downsample_service.get_price_records(
+                ticker.upper(), data, max_points, version, window=(start_date, end_date)
+            )
+
+        with span("serialize"):
+            return JSONResponse({
+                "ticker": ticker.upper(),
+                "prices": prices
             })
-
-        return {
-            "ticker": ticker.upper(),
-            "prices": prices
-        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching prices: {str(e)}")
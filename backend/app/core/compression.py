@@ -0,0 +1,251 @@
+"""
+Negotiated gzip/brotli response compression
+"""
+
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+# Content types that are already compressed or must not be buffered
+EXCLUDED_CONTENT_TYPES = ("image/", "audio/", "video/", "application/zip", "application/gzip", "text/event-stream")
+
+
+class _GzipEncoder:
+    """Incremental gzip encoder"""
+
+    name = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31 produces a gzip container rather than raw zlib
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    """Incremental brotli encoder"""
+
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionStats:
+    """Thread-safe counters for bytes saved and CPU time spent per encoding"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(
+                encoding,
+                {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0},
+            )
+            entry["responses"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            entry["cpu_seconds"] += cpu_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get a copy of the counters
+
+        Returns:
+            Dictionary mapping encoding to responses, bytes_in, bytes_out,
+            bytes_saved, cpu_seconds and ratio (bytes_out / bytes_in)
+        """
+        with self._lock:
+            result = {}
+            for encoding, entry in self._stats.items():
+                result[encoding] = {
+                    **entry,
+                    "bytes_saved": entry["bytes_in"] - entry["bytes_out"],
+                    "ratio": entry["bytes_out"] / entry["bytes_in"] if entry["bytes_in"] else 1.0,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+compression_stats = CompressionStats()
+
+
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = True) -> Optional[str]:
+    """
+    Pick the best supported content encoding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        brotli_available: Whether the brotli module is installed
+
+    Returns:
+        "br", "gzip" or None if the client accepts neither
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            weights[token] = q
+
+    candidates = ["br", "gzip"] if brotli_available else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses responses with brotli or gzip
+
+    Responses smaller than minimum_size, responses for excluded paths,
+    already-encoded responses and binary media types are passed through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_paths: Optional[List[str]] = None,
+        stats: Optional[CompressionStats] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_paths = set(excluded_paths or [])
+        self.stats = stats or compression_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), brotli is not None
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def create_encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Per-response state for CompressionMiddleware"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.encoder = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until we know whether the body is compressed
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Too small to be worth the CPU time
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.encoder = self.middleware.create_encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            compressed = self._compress(body, more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({**message, "body": compressed})
+        else:
+            await self._send({**message, "body": self._compress(body, more_body)})
+
+        if not more_body:
+            self.middleware.stats.record(
+                self.encoding, self.bytes_in, self.bytes_out, self.cpu_seconds
+            )
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        started = time.thread_time()
+        compressed = self.encoder.compress(body)
+        if not more_body:
+            compressed += self.encoder.flush()
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
@@ -35,6 +35,70 @@ class Settings(BaseSettings):
     # Data fetching
     DATA_CACHE_ENABLED: bool = True
     DATA_CACHE_TTL: int = 86400  # 24 hours in seconds
+    DATA_CACHE_MAX_TICKERS: int = 64  # Price histories kept in memory by DataService
+    # Startup warm-up: load MARKET_INDICES, SECTOR_ETFs, VOLATILITY_INDICATORS,
+    # COMMODITIES and the most queried tickers into memory before /ready reports ready
+    WARMUP_ENABLED: bool = True
+    WARMUP_TOP_N: int = 20
+    WARMUP_TIMEOUT: float = 120.0  # Seconds before /ready reports ready regardless
+    DOWNSAMPLE_CACHE_SIZE: int = 256  # Downsampled chart series kept in memory
+    TICKER_INDEX_REFRESH_SECONDS: int = 300  # Check tickers for changes to re-index; 0 disables
+    # Reject /api/query tickers missing from the loaded ticker catalog instead of
+    # fetching them from the market data provider
+    CATALOG_STRICT: bool = False
+    # Query counts boosting popular tickers in search; "" keeps them in memory only
+    TICKER_POPULARITY_PATH: str = "./data/ticker_popularity.json"
+
+    # Market data provider used by the API fallback, init_poc and the updater:
+    # "yahoo" (v8 chart API over a pooled async client) or "yfinance"
+    MARKET_DATA_PROVIDER: str = "yahoo"
+    YAHOO_BASE_URL: str = "https://query2.finance.yahoo.com/v8/finance/chart/"
+    MARKET_DATA_TIMEOUT: float = 10.0  # Seconds per request
+    MARKET_DATA_MAX_RETRIES: int = 3  # Retries for network errors, 429 and 5xx
+    MARKET_DATA_MAX_CONNECTIONS_PER_HOST: int = 8
+    MARKET_DATA_BREAKER_THRESHOLD: int = 5  # Consecutive failures before failing fast
+    MARKET_DATA_BREAKER_RESET: float = 30.0  # Seconds before a trial request
+
+    # Tickers the provider returned no data for are not fetched again until the
+    # TTL expires (errors use the shorter ERROR_TTL); persisted across restarts
+    NEGATIVE_CACHE_TTL: int = 3600  # Seconds; 0 disables
+    NEGATIVE_CACHE_ERROR_TTL: int = 300
+    NEGATIVE_CACHE_PATH: str = "./data/negative_tickers.json"  # "" keeps entries in memory only
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 10000
+
+    # Fallback fetches are returned immediately and written to the database by a
+    # background writer that batches tickers and retries failed writes
+    CACHE_WRITER_BATCH_SIZE: int = 8  # Tickers per transaction
+    CACHE_WRITER_MAX_PENDING: int = 256  # Queued tickers before writes are dropped
+    CACHE_WRITER_MAX_RETRIES: int = 3
+    CACHE_WRITER_RETRY_BACKOFF: float = 1.0  # Seconds before the first retry; doubles each attempt
+
+    # Raw Yahoo chart responses cached on disk: "off", "read_write" or "replay"
+    # (replay serves only from the cache and never calls Yahoo)
+    YAHOO_CACHE_MODE: str = "off"
+    YAHOO_CACHE_DIR: str = "./data/yahoo_cache"
+    YAHOO_CACHE_TTL: int = 86400  # Seconds; 0 keeps entries until evicted
+    YAHOO_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Response compression (brotli is used when the optional `brotli` package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller responses are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (fastest) - 9 (smallest)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0 (fastest) - 11 (smallest)
+    COMPRESSION_EXCLUDED_PATHS: List[str] = ["/health", "/api/health", "/ready"]
+
+    # Logging: records are written by a background thread through a queue
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_ENABLED: bool = True
+    # Access log sampling: with more than REQUEST_LOG_HIGH_LOAD requests in flight
+    # (0 = always), only REQUEST_LOG_SAMPLE_RATE of fast successful requests are logged
+    REQUEST_LOG_SAMPLE_RATE: float = 1.0
+    REQUEST_LOG_HIGH_LOAD: int = 32
+    REQUEST_LOG_SLOW_SECONDS: float = 1.0  # Slower requests are always logged
+
+    # Per-stage request timing (stage latency histograms, optional Server-Timing header)
+    TIMING_SAMPLE_RATE: float = 0.0  # Fraction of requests timed; 0 disables spans
+    SERVER_TIMING_HEADER: bool = False  # Send timed requests' stages to clients
 
     # Supported tickers
     MARKET_INDICES: List[str] = ["SPY", "QQQ", "DIA"]
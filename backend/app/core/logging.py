@@ -1,24 +1,42 @@
 """
 Logging configuration for the application
+
+Records are put on an in-memory queue by a QueueHandler on the root logger;
+a QueueListener thread writes them to stdout and the log files, so request
+handlers never block on disk or console I/O.
 """
 
+import atexit
 import logging
+import queue
+import random
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
+
 from app.core.config import settings
 
+_listener: Optional[QueueListener] = None
+
 
-def setup_logging() -> None:
+def setup_logging(log_dir: str = "logs") -> None:
     """
     Set up application logging with both file and console handlers.
+
+    Args:
+        log_dir: Directory for app.log and errors.log
     """
+    stop_logging()
+
     # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    log_path = Path(log_dir)
+    log_path.mkdir(exist_ok=True)
 
     # Configure root logger
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    logger.setLevel(settings.LOG_LEVEL)
 
     # Remove existing handlers
     logger.handlers.clear()
@@ -36,24 +54,101 @@ def setup_logging() -> None:
 
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(settings.LOG_LEVEL)
     console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
 
     # File handler for all logs
-    file_handler = logging.FileHandler(log_dir / "app.log")
-    file_handler.setLevel(logging.INFO)
+    file_handler = logging.FileHandler(log_path / "app.log")
+    file_handler.setLevel(settings.LOG_LEVEL)
     file_handler.setFormatter(detailed_formatter)
-    logger.addHandler(file_handler)
 
     # Error file handler
-    error_handler = logging.FileHandler(log_dir / "errors.log")
+    error_handler = logging.FileHandler(log_path / "errors.log")
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    logger.addHandler(error_handler)
+
+    handlers = (console_handler, file_handler, error_handler)
+    if settings.LOG_QUEUE_ENABLED:
+        # The writer thread applies each handler's own level
+        global _listener
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     # Suppress noisy loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
     logger.info("Logging configured successfully")
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread (safe to call twice)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class RequestLogSampler:
+    """
+    Decide which requests get an access log line
+
+    Every request is logged until more than `high_load` requests are in
+    flight; past that, successful fast requests are logged with probability
+    `sample_rate`. Errors (status >= 500) and slow requests are always logged.
+
+    Args:
+        sample_rate: Fraction of requests logged under high load
+        high_load: Concurrent requests above which sampling starts; 0 samples always
+        slow_seconds: Requests at least this slow are always logged
+    """
+
+    def __init__(self, sample_rate: float = 1.0, high_load: int = 0, slow_seconds: float = 1.0):
+        self.sample_rate = sample_rate
+        self.high_load = high_load
+        self.slow_seconds = slow_seconds
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "RequestLogSampler":
+        return cls(
+            sample_rate=settings.REQUEST_LOG_SAMPLE_RATE,
+            high_load=settings.REQUEST_LOG_HIGH_LOAD,
+            slow_seconds=settings.REQUEST_LOG_SLOW_SECONDS,
+        )
+
+    def start(self) -> int:
+        """Count a request as in flight; returns the number in flight including it"""
+        with self._lock:
+            self.in_flight += 1
+            return self.in_flight
+
+    def finish(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def should_log(self, in_flight: int, status: int, duration: float) -> bool:
+        """
+        Check whether a finished request is logged
+
+        Args:
+            in_flight: Requests in flight when it started (from start())
+            status: Response status code
+            duration: Seconds taken
+        """
+        if self.sample_rate >= 1.0 or status >= 500 or duration >= self.slow_seconds:
+            return True
+        if self.high_load > 0 and in_flight <= self.high_load:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
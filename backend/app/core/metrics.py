@@ -0,0 +1,323 @@
+"""
+In-process metrics primitives and Prometheus text exposition
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond stages to slow fallbacks
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together by the /metrics endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[MetricsRegistry] = registry,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the counter for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    """
+    Gauge whose samples are produced by a callback at scrape time
+
+    The callback returns a list of (labels dict, value) pairs, so values that
+    already live elsewhere (pool stats, RSS) are read only when scraped.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], List[Tuple[Dict[str, str], float]]],
+        registry: Optional[MetricsRegistry] = registry,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        if registry is not None:
+            registry.register(self)
+
+    def render(self) -> Iterable[str]:
+        try:
+            samples = self.callback()
+        except Exception:
+            # A failing collector must not break the whole scrape
+            return
+        for labels, value in samples:
+            if value is not None:
+                yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+class CallbackCounter(Gauge):
+    """
+    Counter whose totals are read by a callback at scrape time
+
+    For monotonic totals kept elsewhere (e.g. compression byte counts), so
+    rate() works on them; the callback must never return a smaller value.
+    """
+
+    type = "counter"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[MetricsRegistry] = registry,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label values"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> List[dict]:
+        """
+        Get a copy of every labelled series
+
+        Returns:
+            List of {"labels", "buckets" (cumulative, keyed by upper bound),
+            "sum", "count"} dicts
+        """
+        with self._lock:
+            items = [(key, list(s[0]), s[1], s[2]) for key, s in self._series.items()]
+
+        result = []
+        for key, counts, total, count in items:
+            cumulative, running = {}, 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                cumulative[bound] = running
+            result.append({
+                "labels": dict(zip(self.labelnames, key)),
+                "buckets": cumulative,
+                "sum": total,
+                "count": count,
+            })
+        return result
+
+    def render(self) -> Iterable[str]:
+        for series in self.snapshot():
+            labels = series["labels"]
+            for bound, count in series["buckets"].items():
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                yield f"{self.name}_bucket{_format_labels(bucket_labels)} {count}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(series['sum'])}"
+            yield f"{self.name}_count{_format_labels(labels)} {series['count']}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    Get the current resident set size of this process
+
+    Reads /proc/self/statm on Linux and falls back to the peak RSS reported
+    by getrusage elsewhere.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+# Per-stage latency recorded by app.core.timing spans
+stage_latency = Histogram(
+    "app_stage_duration_seconds",
+    "Time spent in each request processing stage",
+    labelnames=("stage",),
+)
+
+# HTTP traffic, recorded by the log_requests middleware
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    labelnames=("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    labelnames=("method", "route"),
+)
+
+# DataService lookups: the database acts as the cache in front of the fallback fetch
+data_cache_requests = Counter(
+    "data_service_cache_requests_total",
+    "DataService historical data lookups by result (hit = served from cache)",
+    labelnames=("result",),
+)
+
+# Network fallback when a ticker is not in the database
+fallback_fetches = Counter(
+    "market_data_fallback_total",
+    "Fallback fetches from the market data provider by outcome",
+    labelnames=("outcome",),
+)
+fallback_duration = Histogram(
+    "market_data_fallback_duration_seconds",
+    "Duration of fallback fetches from the market data provider",
+)
+
+# Negative cache of tickers the provider could not serve (app.services.negative_cache)
+negative_cache_requests = Counter(
+    "negative_ticker_cache_total",
+    "Negative ticker cache lookups and updates by result (hit, miss, expired, added)",
+    labelnames=("result",),
+)
+
+# Background database writes of fallback fetches (app.services.cache_writer)
+cache_writes = Counter(
+    "cache_writer_writes_total",
+    "Background cache writes per ticker by outcome (success, retry, failed, deduplicated, dropped)",
+    labelnames=("outcome",),
+)
+cache_write_duration = Histogram(
+    "cache_writer_batch_duration_seconds",
+    "Duration of background cache write batches",
+)
+
+# Upstream requests made by market data providers (app.services.market_data_provider)
+market_data_requests = Counter(
+    "market_data_requests_total",
+    "Market data provider requests by outcome (success, empty, retry, error, circuit_open)",
+    labelnames=("provider", "outcome"),
+)
+
+rate_limit_rejections = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter",
+    labelnames=("route",),
+)
+
+process_rss = Gauge(
+    "process_resident_memory_bytes",
+    "Resident memory size of the API process",
+    lambda: [({}, process_rss_bytes())],
+)
@@ -0,0 +1,115 @@
+"""
+Lightweight per-request stage timing
+
+Code marks stages with `span("name")`. When the current request is sampled,
+each span's duration is collected for the request's Server-Timing header and
+recorded in the stage latency histogram. When it is not sampled, `span()`
+returns a shared no-op context manager.
+"""
+
+import random
+import time
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import stage_latency
+
+
+class RequestTimings:
+    """Spans collected for a single sampled request"""
+
+    __slots__ = ("spans",)
+
+    def __init__(self):
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans.append((name, seconds))
+
+    def server_timing_header(self, total: Optional[float] = None) -> str:
+        """
+        Format spans as a Server-Timing header value
+
+        Repeated spans with the same name are summed.
+
+        Args:
+            total: Optional total request duration in seconds
+
+        Returns:
+            Header value such as "db_load;dur=12.1, mask;dur=0.4"
+        """
+        durations = {}
+        for name, seconds in self.spans:
+            durations[name] = durations.get(name, 0.0) + seconds
+        if total is not None:
+            durations["total"] = total
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in durations.items())
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+class _NullSpan:
+    """No-op span used when the request is not sampled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "timings", "started")
+
+    def __init__(self, name: str, timings: RequestTimings):
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.timings.add(self.name, elapsed)
+        stage_latency.observe(elapsed, stage=self.name)
+        return False
+
+
+def span(name: str):
+    """
+    Time a stage of the current request
+
+    Usage:
+        with span("db_load"):
+            ...
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return _NULL_SPAN
+    return _Span(name, timings)
+
+
+def start_request_timing() -> Tuple[Optional[RequestTimings], Token]:
+    """
+    Begin collecting spans for the current request if it is sampled
+
+    Returns:
+        Tuple of (RequestTimings or None when not sampled, context token to
+        pass to finish_request_timing)
+    """
+    rate = settings.TIMING_SAMPLE_RATE
+    timings = RequestTimings() if rate >= 1.0 or (rate > 0 and random.random() < rate) else None
+    return timings, _current_timings.set(timings)
+
+
+def finish_request_timing(token: Token) -> None:
+    """Stop collecting spans for the current request"""
+    _current_timings.reset(token)
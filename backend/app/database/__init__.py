@@ -2,14 +2,28 @@
 Database package initialization
 """
 
-from app.database.models import Base, engine, get_db, Ticker, HistoricalPrice, DailyReturn, init_db
+from app.database.models import (
+    Base, get_db, get_engine, Ticker, HistoricalPrice, DailyReturn, EtfConstituent, CompanyName, DataVersion,
+    init_db,
+)
 
 __all__ = [
     "Base",
     "engine",
     "get_db",
+    "get_engine",
     "Ticker",
     "HistoricalPrice",
     "DailyReturn",
+    "EtfConstituent",
+    "CompanyName",
+    "DataVersion",
     "init_db",
 ]
+
+
+def __getattr__(name: str):
+    # The engine is created on first access (see app.database.models.get_engine)
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
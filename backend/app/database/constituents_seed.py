@@ -0,0 +1,474 @@
+"""
+Seed data for ETF constituents and company names
+
+The curated names and partial QQQ/SPY/IWM holdings below used to live in
+ConstituentsService; they are now written to the etf_constituents and
+company_names tables, which the service loads into a read-only snapshot.
+When data/SPY-components.csv is present, its rows replace the SPY list and
+add company names (a third weight column is used when present).
+
+Run after creating tables (safe to re-run; rows are upserted):
+    python -m app.database.constituents_seed [--csv ../data/SPY-components.csv] [--as-of 2024-06-30]
+"""
+
+import argparse
+import csv
+import os
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from app.database.models import Base, get_engine
+from app.utils.bulk_load import bulk_upsert, dialect_of
+
+SPY_COMPONENTS_CSV = os.path.join(os.path.dirname(__file__), '../../../data/SPY-components.csv')
+
+# Ticker to company name mapping
+CURATED_NAMES = {
+    # Technology
+    "AAPL": "Apple Inc.",
+    "MSFT": "Microsoft Corporation",
+    "NVDA": "NVIDIA Corporation",
+    "AVGO": "Broadcom Inc.",
+    "GOOGL": "Alphabet Inc.",
+    "GOOG": "Alphabet Inc.",
+    "META": "Meta Platforms Inc.",
+    "TSLA": "Tesla Inc.",
+    "AMD": "Advanced Micro Devices",
+    "ARM": "ARM Holdings",
+    "ADBE": "Adobe Inc.",
+    "CSCO": "Cisco Systems",
+    "NFLX": "Netflix Inc.",
+    "AMZN": "Amazon.com Inc.",
+    "QCOM": "Qualcomm Inc.",
+    "TXN": "Texas Instruments",
+    "INTC": "Intel Corporation",
+    "ORCL": "Oracle Corporation",
+    "CRM": "Salesforce Inc.",
+    "IBM": "IBM",
+    "ACN": "Accenture",
+    "INTU": "Intuit Inc.",
+    "MU": "Micron Technology",
+    "AMAT": "Applied Materials",
+    "LRCX": "Lam Research",
+    "MRVL": "Marvell Technology",
+    "ADI": "Analog Devices",
+    "SNPS": "Synopsys Inc.",
+    "CDNS": "Cadence Design",
+    "KLAC": "KLA Corporation",
+    "NXPI": "NXP Semiconductors",
+    "ARM": "ARM Holdings",
+
+    # Software & Cloud
+    "SHOP": "Shopify Inc.",
+    "SNOW": "Snowflake Inc.",
+    "DOCU": "DocuSign Inc.",
+    "OKTA": "Okta Inc.",
+    "DDOG": "Datadog Inc.",
+    "ZM": "Zoom Video Communications",
+    "TWLO": "Twilio Inc.",
+    "CRWD": "CrowdStrike Holdings",
+    "PLTR": "Palantir Technologies",
+    "COIN": "Coinbase Global",
+    "SQ": "Block Inc.",
+    "U": "Unity Software",
+    "ROKU": "Roku Inc.",
+    "Z": "Zillow Group",
+    "RBLX": "Roblox Corporation",
+    "AFRM": "Affirm Holdings",
+    "UPST": "Upstart Holdings",
+    "HOOD": "Robinhood Markets",
+    "ETSY": "Etsy Inc.",
+    "WDAY": "Workday Inc.",
+    "SPLK": "Splunk Inc.",
+    "PANW": "Palo Alto Networks",
+    "ZS": "Zscaler Inc.",
+    "FTNT": "Fortinet Inc.",
+    "GEN": "Gen Digital",
+    "CTXS": "Citrix Systems",
+
+    # Semiconductors
+    "ASML": "ASML Holding",
+    "TSM": "Taiwan Semiconductor",
+    "SOXX": "iShares Semiconductor ETF",
+
+    # Consumer & Retail
+    "COST": "Costco Wholesale",
+    "SBUX": "Starbucks Corporation",
+    "MCD": "McDonald's Corporation",
+    "NKE": "Nike Inc.",
+    "HD": "Home Depot Inc.",
+    "LOW": "Lowe's Companies",
+    "TGT": "Target Corporation",
+    "WMT": "Walmart Inc.",
+    "AMZN": "Amazon.com Inc.",
+    "BKNG": "Booking Holdings",
+    "MAR": "Marriott International",
+    "ABNB": "Airbnb Inc.",
+    "LULU": "Lululemon Athletica",
+    "KHC": "Kraft Heinz Co.",
+    "KDP": "Keurig Dr Pepper",
+    "MNST": "Monster Beverage",
+    "PEP": "PepsiCo Inc.",
+    "KO": "Coca-Cola Company",
+    "PG": "Procter & Gamble",
+    "CL": "Colgate-Palmolive",
+    "EL": "Estee Lauder Companies",
+    "DIS": "Walt Disney Company",
+    "CMCSA": "Comcast Corporation",
+    "FOXA": "Fox Corporation",
+    "WBD": "Warner Bros. Discovery",
+
+    # Healthcare
+    "JNJ": "Johnson & Johnson",
+    "UNH": "UnitedHealth Group",
+    "PFE": "Pfizer Inc.",
+    "ABBV": "AbbVie Inc.",
+    "MRK": "Merck & Co.",
+    "TMO": "Thermo Fisher Scientific",
+    "ABT": "Abbott Laboratories",
+    "DHR": "Danaher Corporation",
+    "BMY": "Bristol-Myers Squibb",
+    "AMGN": "Amgen Inc.",
+    "GILD": "Gilead Sciences",
+    "REGN": "Regeneron Pharmaceuticals",
+    "VRTX": "Vertex Pharmaceuticals",
+    "ILMN": "Illumina Inc.",
+    "IDXX": "IDEXX Laboratories",
+    "DXCM": "DexCom Inc.",
+    "ISRG": "Intuitive Surgical",
+    "BDX": "Becton Dickinson",
+    "BIIB": "Biogen Inc.",
+    "MRNA": "Moderna Inc.",
+    "SGEN": "Seagen Inc.",
+    "LLY": "Eli Lilly and Company",
+    "AZN": "AstraZeneca",
+    "CVS": "CVS Health",
+
+    # Financial Services
+    "BRK.B": "Berkshire Hathaway",
+    "JPM": "JPMorgan Chase & Co.",
+    "BAC": "Bank of America",
+    "WFC": "Wells Fargo",
+    "C": "Citigroup Inc.",
+    "GS": "Goldman Sachs",
+    "MS": "Morgan Stanley",
+    "SCHW": "Charles Schwab",
+    "BLK": "BlackRock Inc.",
+    "SPGI": "S&P Global",
+    "ICE": "Intercontinental Exchange",
+    "AXP": "American Express",
+    "MA": "Mastercard Incorporated",
+    "V": "Visa Inc.",
+    "PYPL": "PayPal Holdings",
+    "ADP": "Automatic Data Processing",
+    "FISV": "Fiserv Inc.",
+    "GPN": "Global Payments",
+    "SQ": "Block Inc.",
+    "COIN": "Coinbase Global",
+    "IBKR": "Interactive Brokers",
+    "ETFC": "E*TRADE Financial",
+    "MET": "MetLife Inc.",
+    "PRU": "Prudential Financial",
+    "AIG": "American International",
+    "AON": "Aon plc",
+    "MMC": "Marsh & McLennan",
+    "TRV": "The Travelers Companies",
+
+    # Energy & Utilities
+    "XOM": "Exxon Mobil",
+    "CVX": "Chevron Corporation",
+    "COP": "ConocoPhillips",
+    "SLB": "Schlumberger NV",
+    "EOG": "EOG Resources",
+    "PXD": "Pioneer Natural Resources",
+    "NEE": "NextEra Energy",
+    "DUK": "Duke Energy",
+    "SO": "Southern Company",
+    "EXC": "Exelon Corporation",
+    "D": "Dominion Energy",
+    "XEL": "Xcel Energy",
+    "ETR": "Entergy Corporation",
+
+    # Industrials
+    "BA": "Boeing Company",
+    "CAT": "Caterpillar Inc.",
+    "HON": "Honeywell International",
+    "GE": "General Electric",
+    "UNP": "Union Pacific",
+    "UPS": "United Parcel Service",
+    "FDX": "FedEx Corporation",
+    "RTX": "Raytheon Technologies",
+    "LMT": "Lockheed Martin",
+    "NOC": "Northrop Grumman",
+    "GD": "General Dynamics",
+    "DE": "Deere & Company",
+    "CM": "Cummins Inc.",
+    "EMR": "Emerson Electric",
+    "ITW": "Illinois Tool Works",
+    "MMM": "3M Company",
+    "OTIS": "Otis Worldwide",
+    "CARR": "Carrier Global",
+    "TM": "Toyota Motor",
+    "GM": "General Motors",
+    "F": "Ford Motor",
+
+    # Materials
+    "APD": "Air Products and Chemicals",
+    "SHW": "Sherwin-Williams",
+    "LIN": "Linde plc",
+    "FCX": "Freeport-McMoRan",
+    "NEM": "Newmont Corporation",
+    "DOW": "Dow Inc.",
+    "DD": "DuPont de Nemours",
+
+    # Real Estate
+    "AMT": "American Tower",
+    "PLD": "Prologis Inc.",
+    "CCI": "Crown Castle",
+    "EQIX": "Equinix Inc.",
+    "SPG": "Simon Property Group",
+    "O": "Realty Income",
+    "WELL": "Welltower Inc.",
+    "AVB": "AvalonBay Communities",
+    "EQR": "Equity Residential",
+
+    # Communication & Telecom
+    "GOOGL": "Alphabet Inc.",
+    "META": "Meta Platforms Inc.",
+    "T": "AT&T Inc.",
+    "VZ": "Verizon Communications",
+    "TMUS": "T-Mobile US",
+    "CMCSA": "Comcast Corporation",
+    "CHTR": "Charter Communications",
+    "DIS": "Walt Disney Company",
+    "NFLX": "Netflix Inc.",
+    "EA": "Electronic Arts",
+    "ATVI": "Activision Blizzard",
+
+    # ETFs & Indices
+    "SPY": "SPDR S&P 500 ETF",
+    "QQQ": "Invesco QQQ Trust",
+    "IWM": "iShares Russell 2000 ETF",
+    "DIA": "SPDR Dow Jones Industrial Average ETF",
+    "GLD": "SPDR Gold Shares",
+    "USO": "United States Oil Fund",
+    "SLV": "iShares Silver Trust",
+    "TLT": "iShares 20+ Year Treasury Bond",
+    "VXX": "iPath Series B S&P 500 VIX",
+    "SVXY": "ProShares Short VIX Short-Term",
+    "XLF": "Financial Select Sector SPDR",
+    "XLE": "Energy Select Sector SPDR",
+    "XLK": "Technology Select Sector SPDR",
+    "XLV": "Health Care Select Sector SPDR",
+    "XLY": "Consumer Discretionary Select Sector SPDR",
+    "XLP": "Consumer Staples Select Sector SPDR",
+
+    # Volatility & Indicators
+    "VIX": "CBOE Volatility Index",
+    "^VIX": "CBOE Volatility Index",
+    "VXN": "Nasdaq-100 Volatility Index",
+    "^VXN": "Nasdaq-100 Volatility Index",
+    "RVX": "Russell 2000 Volatility Index",
+    "PCR": "CBOE Total Put/Call Ratio",
+
+    # Small Caps
+    "SMCI": "Super Micro Computer",
+    "SMG": "Scotts Miracle-Gro",
+    "FRG": "Ferguson",
+    "IART": "Integra LifeSciences",
+    "PCT": "PCTEL",
+    "INMD": "InMode Ltd.",
+    "AYTU": "AyTu Bio Holdings",
+    "EYPT": "EyePoint Pharmaceuticals",
+    "KALA": "KALA Pharmaceuticals",
+    "RGLS": "Regulus Therapeutics",
+    "SLNO": "Silence Therapeutics",
+    "TARS": "Tarsius Pharmaceuticals",
+    "VYNE": "Vyne Therapeutics",
+    "WVE": "Wave Life Sciences",
+    "XAIR": "XAIR",
+    "ZLAB": "Zai Lab",
+
+    # Other Notable
+    "MELI": "MercadoLibre Inc.",
+    "NTES": "NetEase Inc.",
+    "JD": "JD.com Inc.",
+    "PDD": "PDD Holdings",
+    "BABA": "Alibaba Group",
+    "TCOM": "Trip.com Group",
+    "PAYX": "Paychex Inc.",
+    "PCAR": "PACCAR Inc.",
+    "ODFL": "Old Dominion Freight",
+    "ORLY": "O'Reilly Automotive",
+    "ROST": "Ross Stores",
+    "WBA": "Walgreens Boots Alliance",
+    "CTSH": "Cognizant Technology",
+    "FISV": "Fiserv Inc.",
+    "IDXX": "IDEXX Laboratories",
+    "REGN": "Regeneron Pharmaceuticals",
+    "SIRI": "Sirius XM Holdings",
+    "VRSK": "Verisk Analytics",
+    "CSX": "CSX Corporation",
+    "GEHC": "GE HealthCare",
+    "HON": "Honeywell International",
+    "SWKS": "Skyworks Solutions",
+}
+
+# Popular Nasdaq-100 stocks (top holdings)
+QQQ_HOLDINGS = [
+    "AAPL", "MSFT", "NVDA", "AVGO", "GOOGL", "META", "TSLA", "AMD", "ARM",
+    "ADBE", "CSCO", "NFLX", "AMZN", "QCOM", "TXN", "INTC", "GOOG", "COST",
+    "AMGN", "SBUX", "INTU", "MU", "ISRG", "GILD", "BKNG",
+    "ADI", "MRVL", "LRCX", "CHTR", "AMAT", "TMUS", "SNPS", "CDNS",
+    "MAR", "AZN", "ABNB", "CMCSA", "CSX",
+    "CTSH", "DDOG", "DXCM", "EA", "EXC",
+    "IDXX", "ILMN", "JD", "KDP", "KHC", "KLAC", "LULU", "MELI", "MNST",
+    "MRNA", "NTES", "NXPI", "ODFL", "ORLY", "PANW", "PAYX",
+    "PCAR", "PEP", "PDD", "PYPL", "REGN", "ROST", "SIRI", "SPLK",
+    "SWKS", "TCOM", "VRSK", "VRTX", "WBD", "WDAY",
+    "XEL", "ZM", "ZS"
+]
+
+# Popular S&P 500 stocks (top holdings by market cap)
+SPY_HOLDINGS = [
+    "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "GOOG", "BRK.B", "LLY",
+    "AVGO", "JPM", "XOM", "MA", "V", "JNJ", "UNH", "HD", "PG", "COST", "ABBV",
+    "MRK", "CVX", "KO", "BAC", "PEP", "TMO", "WMT", "CSCO", "CRM", "ABT",
+    "MCD", "ADBE", "NFLX", "AMD", "CMCSA", "INTU", "VZ", "DIS", "DHR", "QCOM",
+    "NEE", "PFE", "HON", "WFC", "ABNB", "TXN", "ACN", "IBM", "AMGN", "PM",
+    "BA", "CAT", "DE", "GE", "GM", "INTC", "LOW", "LMT", "MDLZ",
+    "MET", "MS", "NKE", "ORCL", "PYPL", "SCHW", "SHOP", "SLB", "SPG", "T",
+    "TGT", "UPS", "USB", "UNP", "WBA"
+]
+
+# Russell 2000 holdings (sample of notable small caps)
+IWM_HOLDINGS = [
+    "PLTR", "COIN", "SQ", "SHOP", "U", "DOCU", "SNOW", "CRWD", "ZM", "RBLX",
+    "AFRM", "UPST", "HOOD", "ETSY", "ROKU", "Z", "TWLO", "OKTA", "DDOG",
+    "SG", "SMCI", "FRG", "IART", "PCT", "INMD", "AYTU",
+    "EYPT", "KALA", "RGLS", "SLNO", "TARS", "VYNE", "WVE", "XAIR", "ZLAB"
+]
+
+DEFAULT_HOLDINGS = {
+    "QQQ": QQQ_HOLDINGS,
+    "SPY": SPY_HOLDINGS,
+    "IWM": IWM_HOLDINGS,
+}
+
+
+def load_components_csv(path: str) -> List[Tuple[str, str, Optional[float]]]:
+    """
+    Read `symbol,name[,weight]` rows from an index components CSV
+
+    Weights are returned as fractions; a weight column that sums to more
+    than 1.5 is taken to be in percent.
+
+    Args:
+        path: CSV path
+
+    Returns:
+        List of (symbol, name, weight or None), in file order
+    """
+    rows = []
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip():
+                continue
+            symbol = row[0].strip().upper()
+            if symbol in ("SYMBOL", "TICKER"):
+                continue
+            name = row[1].strip() if len(row) > 1 else symbol
+            try:
+                weight = float(row[2].strip().rstrip('%')) if len(row) > 2 else None
+            except ValueError:
+                weight = None
+            rows.append((symbol, name, weight))
+
+    total = sum(w for _, _, w in rows if w is not None)
+    if total > 1.5:
+        rows = [(s, n, w / 100 if w is not None else None) for s, n, w in rows]
+    return rows
+
+
+def default_constituents(csv_path: Optional[str] = SPY_COMPONENTS_CSV):
+    """
+    Built-in holdings and names, with the components CSV applied when it exists
+
+    Returns:
+        Tuple of (etf -> [(symbol, weight)], symbol -> (name, source))
+    """
+    holdings: Dict[str, List[Tuple[str, Optional[float]]]] = {
+        etf: [(symbol, None) for symbol in symbols] for etf, symbols in DEFAULT_HOLDINGS.items()
+    }
+    names = {symbol: (name, 'curated') for symbol, name in CURATED_NAMES.items()}
+
+    if csv_path and os.path.exists(csv_path):
+        rows = load_components_csv(csv_path)
+        if rows:
+            holdings["SPY"] = [(symbol, weight) for symbol, _, weight in rows]
+        for symbol, name, _ in rows:
+            # Prefer the curated names
+            names.setdefault(symbol, (name, 'spy_components_csv'))
+    return holdings, names
+
+
+def seed_constituents(
+    bind: Optional[Engine] = None,
+    csv_path: Optional[str] = SPY_COMPONENTS_CSV,
+    as_of: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Write the default holdings and company names in one transaction
+
+    Args:
+        bind: Engine to write to (defaults to the application engine)
+        csv_path: SPY components CSV; skipped when missing
+        as_of: Holdings date (defaults to today)
+
+    Returns:
+        Number of rows written per table
+    """
+    bind = bind or get_engine()
+    as_of = (as_of or date.today()).isoformat()
+    holdings, names = default_constituents(csv_path)
+
+    constituent_rows = [
+        (etf, symbol, weight, as_of) for etf, members in holdings.items() for symbol, weight in members
+    ]
+    name_rows = [(symbol, name, source) for symbol, (name, source) in names.items()]
+
+    dialect = dialect_of(bind)
+    conn = bind.raw_connection()
+    try:
+        constituents = bulk_upsert(
+            conn, dialect, 'etf_constituents', ['etf', 'symbol', 'weight', 'as_of'], constituent_rows,
+            conflict_columns=['etf', 'symbol', 'as_of'],
+        )
+        company_names = bulk_upsert(
+            conn, dialect, 'company_names', ['symbol', 'name', 'source'], name_rows,
+            conflict_columns=['symbol'],
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return {'etf_constituents': constituents.rows, 'company_names': company_names.rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed ETF constituents and company names")
+    parser.add_argument("--csv", default=SPY_COMPONENTS_CSV, help="SPY components CSV (symbol,name[,weight])")
+    parser.add_argument("--as-of", type=date.fromisoformat, help="Holdings date (YYYY-MM-DD, default: today)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=get_engine())
+    counts = seed_constituents(csv_path=args.csv, as_of=args.as_of)
+    print(f"✅ Seeded {counts['etf_constituents']} constituents and {counts['company_names']} company names")
+
+
+if __name__ == "__main__":
+    main()
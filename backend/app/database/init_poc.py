@@ -3,13 +3,31 @@ Proof of Concept: Initialize database with popular tickers
 
 Run this script to populate the database with initial data:
     python -m app.database.init_poc
+
+Seed a larger list (e.g. the SPY constituents) with concurrent fetches:
+    python -m app.database.init_poc --tickers-csv ../data/SPY-components.csv --workers 8
+
+Tickers are fetched concurrently through the market data provider; each
+ticker's rows are written with bulk inserts in a single transaction on the
+main thread while the remaining fetches are in flight.
 """
 
-import pandas as pd
+import argparse
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
-from sqlalchemy.orm import Session
-from app.database.models import Base, engine, SessionLocal, Ticker, HistoricalPrice, DailyReturn
-from app.services.yahoo_direct_fetcher import yahoo_fetcher
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from app.database.models import Base, get_engine, SessionLocal
+from app.services.market_data_provider import MarketDataError, MarketDataProvider, market_data_provider
+from app.services.ticker_catalog import bump_catalog_version
+from app.utils.bulk_load import bulk_upsert, dialect_of
+from app.utils.records import price_records, return_records
 
 # POC: Start with popular tickers
 POC_TICKERS = {
@@ -24,95 +42,200 @@ POC_TICKERS = {
     "META": "Meta Platforms Inc.",
 }
 
+ETF_TICKERS = {"SPY", "QQQ", "DIA", "IWM"}
 
-def init_database():
+
+@dataclass
+class SeedResult:
+    """Outcome of seeding one ticker"""
+    ticker: str
+    price_rows: int = 0
+    return_rows: int = 0
+    fetch_seconds: float = 0.0
+    write_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def init_database(bind: Optional[Engine] = None):
     """Initialize database tables"""
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=bind or get_engine())
     print("✅ Database tables created\n")
 
 
-def populate_ticker_data(ticker: str, name: str, db: Session):
+def load_ticker_csv(path: str) -> Dict[str, str]:
     """
-    Fetch data from Yahoo Finance API and store in database
+    Read a ticker list from a CSV of `symbol,name` rows (header optional)
+
+    Args:
+        path: CSV path, e.g. data/SPY-components.csv
+
+    Returns:
+        Dictionary mapping symbol to name, in file order
+    """
+    tickers = {}
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip():
+                continue
+            symbol = row[0].strip().upper()
+            if symbol in ("SYMBOL", "TICKER"):
+                continue
+            tickers[symbol] = row[1].strip() if len(row) > 1 else symbol
+    return tickers
+
+
+def write_ticker_data(ticker: str, name: str, data: pd.DataFrame, bind: Optional[Engine] = None):
+    """
+    Write a ticker's prices, returns and tickers row in one transaction
 
     Args:
         ticker: Ticker symbol
         name: Company name
-        db: Database session
+        data: Full history from the market data provider
+        bind: Engine to write to (defaults to the application engine)
+
+    Returns:
+        Tuple of (price BulkLoadResult, return BulkLoadResult)
     """
-    print(f"Fetching {ticker} ({name})...")
+    bind = bind or get_engine()
+    prices = price_records(ticker, data)
+    # Calculate daily returns
+    returns = return_records(ticker, data['Close'].pct_change() * 100)
 
+    ticker_row = [(
+        ticker,
+        name,
+        "etf" if ticker in ETF_TICKERS else "stock",
+        True,
+        data.index[0].date().isoformat(),
+        data.index[-1].date().isoformat(),
+        datetime.now().date().isoformat(),
+    )]
+
+    dialect = dialect_of(bind)
+    conn = bind.raw_connection()
     try:
-        # Fetch maximum historical data using our custom fetcher
-        data = yahoo_fetcher.fetch_data(ticker, period="max")
-
-        if data is None or data.empty:
-            print(f"  ⚠️  No data available for {ticker}")
-            return False
-
-        # Insert ticker metadata
-        ticker_obj = Ticker(
-            symbol=ticker,
-            name=name,
-            type="stock" if ticker not in ["SPY", "QQQ"] else "etf",
-            data_available=True,
-            earliest_date=data.index[0].date(),
-            latest_date=data.index[-1].date(),
-            last_updated=datetime.now().date()
+        bulk_upsert(
+            conn, dialect, 'tickers',
+            ['symbol', 'name', 'type', 'data_available', 'earliest_date', 'latest_date', 'last_updated'],
+            ticker_row, conflict_columns=['symbol'],
+        )
+        price_result = bulk_upsert(
+            conn, dialect, 'historical_prices',
+            ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume', 'adjusted_close'],
+            prices, conflict_columns=['ticker', 'date'],
+        )
+        return_result = bulk_upsert(
+            conn, dialect, 'daily_returns', ['ticker', 'date', 'return_pct'], returns,
+            conflict_columns=['ticker', 'date'],
         )
-        db.merge(ticker_obj)
-
-        # Insert price data
-        price_count = 0
-        for date_idx, row in data.iterrows():
-            # Convert Timestamp to date
-            date_val = date_idx.date() if hasattr(date_idx, 'date') else date_idx
-
-            price = HistoricalPrice(
-                ticker=ticker,
-                date=date_val,
-                open=float(row['Open']),
-                high=float(row['High']),
-                low=float(row['Low']),
-                close=float(row['Close']),
-                volume=int(row['Volume']),
-                adjusted_close=float(row['Adj Close'])
-            )
-            db.merge(price)
-            price_count += 1
-
-        # Calculate and insert daily returns
-        data_copy = data.copy()
-        data_copy['daily_return'] = data_copy['Close'].pct_change() * 100
-
-        return_count = 0
-        for date_idx, row in data_copy.iterrows():
-            date_val = date_idx.date() if hasattr(date_idx, 'date') else date_idx
-
-            if pd.notna(row['daily_return']):
-                ret = DailyReturn(
-                    ticker=ticker,
-                    date=date_val,
-                    return_pct=float(row['daily_return'])
-                )
-                db.merge(ret)
-                return_count += 1
-
-        db.commit()
-        print(f"  ✅ Loaded {price_count} price records, {return_count} return records")
-        return True
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return price_result, return_result
+
 
+def fetch_ticker_data(ticker: str, provider: MarketDataProvider):
+    """Fetch maximum history for a ticker; returns (data or None, seconds)"""
+    started = time.perf_counter()
+    data = provider.fetch_history_sync(ticker, period="max")
+    return data, time.perf_counter() - started
+
+
+def seed_tickers(
+    tickers: Dict[str, str],
+    workers: int = 8,
+    provider: Optional[MarketDataProvider] = None,
+    bind: Optional[Engine] = None,
+    progress: Optional[Callable[[int, int, SeedResult], None]] = None,
+) -> List[SeedResult]:
+    """
+    Fetch tickers concurrently and bulk-load each in its own transaction
+
+    Args:
+        tickers: Dictionary mapping symbol to name
+        workers: Concurrent fetches
+        provider: Market data provider (defaults to the shared provider)
+        bind: Engine to write to (defaults to the application engine)
+        progress: Called with (done, total, result) after each ticker
+
+    Returns:
+        One SeedResult per ticker, in completion order
+    """
+    provider = provider or market_data_provider
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="seed-fetch") as pool:
+        futures = {pool.submit(fetch_ticker_data, ticker, provider): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            result = SeedResult(ticker)
+            try:
+                data, result.fetch_seconds = future.result()
+                if data is None or data.empty:
+                    result.error = "no data available"
+                else:
+                    started = time.perf_counter()
+                    price_result, return_result = write_ticker_data(ticker, tickers[ticker], data, bind)
+                    result.write_seconds = time.perf_counter() - started
+                    result.price_rows, result.return_rows = price_result.rows, return_result.rows
+            except MarketDataError as e:
+                result.error = f"fetch failed: {e}"
+            except Exception as e:
+                result.error = f"load failed: {e}"
+            results.append(result)
+            if progress:
+                progress(len(results), len(tickers), result)
+    return results
+
+
+def bump_ticker_catalog(bind: Optional[Engine] = None):
+    """Tell running API processes to reload their ticker catalog"""
+    bind = bind or get_engine()
+    conn = bind.raw_connection()
+    try:
+        bump_catalog_version(conn, dialect_of(bind))
+        conn.commit()
     except Exception as e:
-        print(f"  ❌ Error loading {ticker}: {e}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        return False
+        conn.rollback()
+        print(f"⚠️  Could not bump ticker catalog version: {e}")
+    finally:
+        conn.close()
+
+
+def print_progress(done: int, total: int, result: SeedResult):
+    """Print one line per seeded ticker"""
+    prefix = f"[{done}/{total}] {result.ticker}"
+    if result.ok:
+        rate = result.price_rows / result.write_seconds if result.write_seconds else 0
+        print(f"  ✅ {prefix}: {result.price_rows} prices, {result.return_rows} returns "
+              f"(fetch {result.fetch_seconds:.1f}s, write {result.write_seconds:.2f}s, {rate:,.0f} prices/s)")
+    else:
+        print(f"  ❌ {prefix}: {result.error}")
 
 
 def main():
     """Main entry point for database initialization"""
+    parser = argparse.ArgumentParser(description="Initialize the database with historical data")
+    parser.add_argument("--tickers-csv", help="CSV of symbol,name rows to seed instead of the POC tickers")
+    parser.add_argument("--tickers", help="Comma-separated symbols to seed instead of the POC tickers")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetches (default: 8)")
+    args = parser.parse_args()
+
+    if args.tickers_csv:
+        tickers = load_ticker_csv(args.tickers_csv)
+    elif args.tickers:
+        tickers = {t.strip().upper(): t.strip().upper() for t in args.tickers.split(",") if t.strip()}
+    else:
+        tickers = POC_TICKERS
+
     print("=" * 60)
     print("Proof of Concept: Database Initialization")
     print("=" * 60)
@@ -122,29 +245,43 @@ def main():
     init_database()
 
     # Step 2: Populate data
-    print("Populating database with proof of concept data...")
+    print(f"Populating database with {len(tickers)} tickers ({args.workers} concurrent fetches)...")
     print()
 
+    started = time.perf_counter()
+    results = seed_tickers(tickers, workers=args.workers, progress=print_progress)
+    elapsed = time.perf_counter() - started
+
+    loaded = [r for r in results if r.ok]
+    if loaded:
+        bump_ticker_catalog()
+    price_rows = sum(r.price_rows for r in loaded)
+    return_rows = sum(r.return_rows for r in loaded)
+
+    print()
+    print("=" * 60)
+    print(f"✅ Database initialization complete!")
+    print(f"   Successfully loaded: {len(loaded)}/{len(tickers)} tickers")
+    print(f"   Rows: {price_rows:,} prices, {return_rows:,} returns in {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"   Throughput: {len(results) / elapsed:.2f} tickers/s, "
+              f"{(price_rows + return_rows) / elapsed:,.0f} rows/s")
+    print("=" * 60)
+
+    failed = [r for r in results if not r.ok]
+    if failed:
+        print(f"\n⚠️  Failed tickers: {', '.join(sorted(r.ticker for r in failed))}")
+
+    # Show summary
+    from app.database.models import Ticker
     db = SessionLocal()
     try:
-        success_count = 0
-        for ticker, name in POC_TICKERS.items():
-            if populate_ticker_data(ticker, name, db):
-                success_count += 1
-
-        print()
-        print("=" * 60)
-        print(f"✅ Database initialization complete!")
-        print(f"   Successfully loaded: {success_count}/{len(POC_TICKERS)} tickers")
-        print("=" * 60)
-
-        # Show summary
-        from app.database.models import Ticker
-        tickers = db.query(Ticker).all()
+        rows = db.query(Ticker).filter(Ticker.symbol.in_([r.ticker for r in loaded])).all()
         print(f"\n📊 Database Summary:")
-        for t in tickers:
+        for t in sorted(rows, key=lambda t: t.symbol)[:50]:
             print(f"   • {t.symbol}: {t.earliest_date} to {t.latest_date}")
-
+        if len(rows) > 50:
+            print(f"   ... and {len(rows) - 50} more")
     except Exception as e:
         print(f"❌ Fatal error: {e}")
     finally:
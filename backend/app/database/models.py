@@ -2,24 +2,58 @@
 Database models for market data storage
 """
 
-from sqlalchemy import create_engine, Column, String, Float, Integer, Date, Boolean, Text, Index
+import threading
+from typing import Optional
+
+from sqlalchemy import create_engine, Column, String, Float, Integer, Date, DateTime, Boolean, Text, Index
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Create database engine
-# Handle different connection arguments for SQLite vs PostgreSQL
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    # For PostgreSQL and other databases
-    engine = create_engine(settings.DATABASE_URL)
+# The engine is created on first use rather than at import, so importing the
+# app (or a script that only needs the models) does not load a database driver
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """Get the application engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Handle different connection arguments for SQLite vs PostgreSQL
+                if settings.DATABASE_URL.startswith("sqlite"):
+                    _engine = create_engine(
+                        settings.DATABASE_URL,
+                        connect_args={"check_same_thread": False}
+                    )
+                else:
+                    # For PostgreSQL and other databases
+                    _engine = create_engine(settings.DATABASE_URL)
+    return _engine
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that binds the application engine when the first session is opened"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
 
 # Create session factory
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
+
+
+def __getattr__(name: str):
+    # `from app.database.models import engine` keeps working and creates the engine then
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Base class for models
 Base = declarative_base()
@@ -72,9 +106,42 @@ class DailyReturn(Base):
     )
 
 
+class EtfConstituent(Base):
+    """ETF holdings with portfolio weights, one row per (etf, symbol, as_of)"""
+    __tablename__ = "etf_constituents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    etf = Column(String(10), nullable=False, index=True)
+    symbol = Column(String(10), nullable=False)
+    weight = Column(Float)  # Fraction of the fund (0-1); NULL when unknown
+    as_of = Column(Date, nullable=False)
+
+    __table_args__ = (
+        Index('idx_constituents_etf_symbol_as_of', 'etf', 'symbol', 'as_of', unique=True),
+    )
+
+
+class CompanyName(Base):
+    """Display names for symbols, including ones without stored price data"""
+    __tablename__ = "company_names"
+
+    symbol = Column(String(10), primary_key=True)
+    name = Column(String(255), nullable=False)
+    source = Column(String(50))  # e.g. 'curated', 'spy_components_csv'
+
+
+class DataVersion(Base):
+    """Version counters bumped by ingestion so in-memory caches know when to reload"""
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)  # e.g. 'tickers'
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+
 def init_db():
     """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("✅ Database tables created successfully")
 
 
@@ -2,22 +2,40 @@
 FastAPI application entry point
 """
 
+import asyncio
+import time
+from typing import List
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.api.router import api_router
+from app.core.compression import CompressionMiddleware, compression_stats
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.core.logging import RequestLogSampler, setup_logging
+from app.core.metrics import (
+    CallbackCounter,
+    Gauge,
+    registry,
+    http_requests,
+    http_request_duration,
+    rate_limit_rejections,
+)
 from app.core.rate_limit import limiter
+from app.core.timing import start_request_timing, finish_request_timing
 from app.database.models import init_db
+from app.services.constituents_service import constituents_service
+from app.services.negative_cache import negative_cache
+from app.services.ticker_catalog import ticker_catalog
 import logging
 
 # Set up logging
 setup_logging()
 logger = logging.getLogger(__name__)
+request_log_sampler = RequestLogSampler.from_settings()
 
 app = FastAPI(
     title="Historical Pattern Analysis Tool",
@@ -25,6 +43,11 @@ app = FastAPI(
     version="0.1.0",
 )
 
+# Readiness is separate from liveness: /health answers as soon as the process is
+# up, /ready only once the startup warm-up has finished
+app.state.ready = False
+app.state.warmup = {}
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -33,9 +56,119 @@ async def startup_event():
     init_db()
     logger.info("Database initialized successfully")
 
+    try:
+        await asyncio.to_thread(ticker_catalog.load)
+        logger.info(f"Ticker catalog loaded ({len(ticker_catalog)} tickers, version {ticker_catalog.version})")
+    except Exception as e:
+        logger.warning(f"Ticker catalog not loaded, falling back to per-request lookups: {e}")
+    await asyncio.to_thread(constituents_service.load_ticker_index)
+    constituents_service.load_popularity(settings.TICKER_POPULARITY_PATH)
+    logger.info(f"Ticker search index built ({len(constituents_service.ticker_index)} symbols)")
+    if settings.TICKER_INDEX_REFRESH_SECONDS > 0:
+        asyncio.create_task(refresh_ticker_index())
+
+    if settings.WARMUP_ENABLED:
+        asyncio.create_task(warm_up())
+    else:
+        app.state.ready = True
+
+
+def warmup_tickers() -> List[str]:
+    """Tickers to preload: the configured categories, then the most queried tickers"""
+    popularity = constituents_service.ticker_index.popularity()
+    top = sorted(popularity, key=lambda symbol: (-popularity[symbol], symbol))[:settings.WARMUP_TOP_N]
+    return list(dict.fromkeys(
+        settings.MARKET_INDICES + settings.SECTOR_ETFs + settings.VOLATILITY_INDICATORS
+        + settings.COMMODITIES + top
+    ))
+
+
+async def warm_up():
+    """
+    Load hot tickers from the database into DataService's in-memory cache, so
+    the first queries after a deploy skip the database load and derivations
+    """
+    from app.services.data_service import data_service
+
+    tickers = warmup_tickers()
+    started = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(
+            asyncio.to_thread(data_service.warm_cache, tickers), settings.WARMUP_TIMEOUT
+        )
+        warmed = [ticker for ticker, loaded in results.items() if loaded]
+        app.state.warmup = {
+            "warmed": len(warmed),
+            "requested": len(tickers),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info(f"Warm-up cached {len(warmed)}/{len(tickers)} tickers in {app.state.warmup['seconds']:.1f}s")
+    except asyncio.TimeoutError:
+        logger.warning(f"Warm-up did not finish within {settings.WARMUP_TIMEOUT:.0f}s; reporting ready anyway")
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {e}")
+    finally:
+        app.state.ready = True
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Finish background cache writes of fallback fetches and persist the negative cache before exiting"""
+    from app.services.data_service import data_service
+
+    if not await asyncio.to_thread(data_service.cache_writer.stop, 10.0):
+        logger.warning("Cache writer stopped with %d tickers unwritten", len(data_service.cache_writer))
+    await asyncio.to_thread(negative_cache.save)
+
+
+async def refresh_ticker_index():
+    """
+    Reload the ticker catalog after an ingestion bumped its version, rebuild the
+    ticker search index when the catalog or constituents changed, and persist
+    search popularity counts and negative cache changes
+    """
+    while True:
+        await asyncio.sleep(settings.TICKER_INDEX_REFRESH_SECONDS)
+        try:
+            if await asyncio.to_thread(ticker_catalog.load, False):
+                logger.info(f"Ticker catalog reloaded ({len(ticker_catalog)} tickers, version {ticker_catalog.version})")
+            if await asyncio.to_thread(constituents_service.load_ticker_index, False):
+                logger.info(f"Ticker search index refreshed ({len(constituents_service.ticker_index)} symbols)")
+            await asyncio.to_thread(constituents_service.save_popularity, settings.TICKER_POPULARITY_PATH)
+            await asyncio.to_thread(negative_cache.save)
+        except Exception as e:
+            logger.warning(f"Ticker search index refresh failed: {e}")
+
+
+def route_template(request: Request) -> str:
+    """
+    Get the matched route template (e.g. /api/prices/{ticker}) for metric labels
+
+    Routes of included routers do not always carry their router prefix, so the
+    prefix is the part of the request path before the route's own pattern
+    matches. Path parameters never leak into the label, including catch-alls
+    like /{path:path}.
+    """
+    route = request.scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return "unmatched"
+    path = request.scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and path_regex.match(path[i:]):
+            return path[:i] + route.path_format
+    return route.path_format
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Count rate limiter rejections before returning slowapi's 429 response"""
+    rate_limit_rejections.inc(route=route_template(request))
+    return _rate_limit_exceeded_handler(request, exc)
+
+
 # Add rate limiting error handler
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 # Configure CORS - MUST be before other middleware
 # Allow all origins if CORS_ALLOW_ALL is enabled (for development)
@@ -50,6 +183,16 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Compress large JSON payloads (price histories, query results) for mobile clients
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        excluded_paths=settings.COMPRESSION_EXCLUDED_PATHS,
+    )
+
 
 @app.options("/{path:path}")
 async def options_handler(request: Request, path: str):
@@ -61,26 +204,38 @@ async def options_handler(request: Request, path: str):
 async def log_requests(request: Request, call_next):
     """
     Log all incoming requests with timing information.
-    """
-    import time
-
-    start_time = time.time()
 
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
+    Sampled requests also get a Server-Timing header with per-stage durations
+    when SERVER_TIMING_HEADER is enabled.
+    """
+    start_time = time.perf_counter()
+    timings, token = start_request_timing()
+    in_flight = request_log_sampler.start()
 
     # Process request
-    response = await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        finish_request_timing(token)
+        request_log_sampler.finish()
 
     # Calculate duration
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
 
-    # Log response
-    logger.info(
-        f"Response: {response.status_code} - "
-        f"{request.method} {request.url.path} - "
-        f"{duration:.3f}s"
-    )
+    # Label by route template rather than raw path to bound cardinality
+    route = route_template(request)
+    http_requests.inc(method=request.method, route=route, status=response.status_code)
+    http_request_duration.observe(duration, method=request.method, route=route)
+
+    if timings is not None and settings.SERVER_TIMING_HEADER:
+        response.headers["Server-Timing"] = timings.server_timing_header(total=duration)
+
+    # One access log line per request, sampled under high load
+    if request_log_sampler.should_log(in_flight, response.status_code, duration):
+        logger.info(
+            "Response: %d - %s %s - %.3fs",
+            response.status_code, request.method, request.url.path, duration,
+        )
 
     return response
 
@@ -101,3 +256,68 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until the startup warm-up has finished"""
+    if not app.state.ready:
+        return JSONResponse({"status": "warming"}, status_code=503)
+    return {"status": "ready", **app.state.warmup}
+
+
+def _db_pool_samples():
+    """Connection pool usage for the database engines, read at scrape time"""
+    from app.database.models import get_engine
+    from app.services.data_service import data_service
+
+    samples = []
+    for name, engine in (("orm", get_engine()), ("data_service", data_service.db_engine)):
+        pool = engine.pool
+        for state, method in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+            if hasattr(pool, method):
+                samples.append(({"engine": name, "state": state}, getattr(pool, method)()))
+    return samples
+
+
+def _compression_samples(field):
+    def collect():
+        return [
+            ({"encoding": encoding}, entry[field])
+            for encoding, entry in compression_stats.snapshot().items()
+        ]
+    return collect
+
+
+Gauge("db_pool_connections", "Database connection pool usage by engine and state", _db_pool_samples)
+CallbackCounter("compression_bytes_in_total", "Uncompressed response bytes by encoding",
+                _compression_samples("bytes_in"))
+CallbackCounter("compression_bytes_out_total", "Compressed response bytes by encoding",
+                _compression_samples("bytes_out"))
+CallbackCounter("compression_cpu_seconds_total", "CPU time spent compressing responses",
+                _compression_samples("cpu_seconds"))
+Gauge("app_ready", "1 once the startup warm-up has finished", lambda: [({}, int(app.state.ready))])
+Gauge("negative_ticker_cache_entries", "Tickers currently in the negative cache", lambda: [({}, len(negative_cache))])
+
+
+def _cache_writer_samples():
+    from app.services.data_service import data_service
+    return [({}, len(data_service.cache_writer))]
+
+
+Gauge("cache_writer_queue_depth", "Fetched tickers waiting for the background database write", _cache_writer_samples)
+
+
+def _data_cache_samples():
+    from app.services.data_service import data_service
+    return [({}, len(data_service.cache))]
+
+
+Gauge("data_service_cached_tickers", "Price histories held in DataService's memory cache", _data_cache_samples)
+
+
+@app.get("/metrics")
+@limiter.exempt
+async def metrics(request: Request):
+    """Prometheus text exposition of in-process metrics"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
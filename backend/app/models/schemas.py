@@ -2,7 +2,7 @@
 Pydantic schemas for request/response validation
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional, Literal
 from datetime import date
 
@@ -24,6 +24,37 @@ class QueryRequest(BaseModel):
     lookback_days: Optional[int] = Field(
         None, description="Number of trading days to look back (None = all history)"
     )
+    include_instances: Literal["all", "none", "recent", "page"] = Field(
+        "all",
+        description=(
+            "Which matching instances to return: all, none (summary only), "
+            "the most recent `limit` matches, or a page of `limit` matches after `cursor`"
+        ),
+    )
+    limit: Optional[int] = Field(
+        None, ge=1, le=5000, description="Instances per response for 'recent' and 'page' (default 100)"
+    )
+    cursor: Optional[date] = Field(
+        None, description="Return instances after this date in sort order (next_cursor of the previous page)"
+    )
+    sort: Literal["date_asc", "date_desc"] = Field(
+        "date_asc", description="Order of returned instances"
+    )
+
+    @field_validator("ticker")
+    @classmethod
+    def normalize_ticker(cls, value: str) -> str:
+        """Use one key (" spy" -> "SPY") for the catalog, caches, database and popularity"""
+        return value.strip().upper()
+
+    @model_validator(mode="after")
+    def check_pagination(self) -> "QueryRequest":
+        """Reject limit/cursor where they would be silently ignored"""
+        if self.cursor is not None and self.include_instances != "page":
+            raise ValueError("cursor is only valid with include_instances='page'")
+        if self.limit is not None and self.include_instances not in ("recent", "page"):
+            raise ValueError("limit is only valid with include_instances='recent' or 'page'")
+        return self
 
 
 class PatternInstance(BaseModel):
@@ -41,7 +72,19 @@ class QueryResponse(BaseModel):
     reference_ticker: Optional[str] = None
     instances: List[PatternInstance]
     summary_statistics: dict[str, dict[str, float]]  # e.g., {"1d": {"mean": 0.02, ...}}
-    total_occurrences: int
+    total_occurrences: int  # Always the full match count, regardless of include_instances
+    next_cursor: Optional[date] = None  # Set when include_instances="page" has more results
+
+
+class TickerMetadata(BaseModel):
+    """Stored ticker with its data coverage"""
+
+    symbol: str
+    name: Optional[str] = None
+    type: Optional[str] = None
+    exchange: Optional[str] = None
+    earliest_date: Optional[date] = None
+    latest_date: Optional[date] = None
 
 
 class TickerListResponse(BaseModel):
@@ -53,6 +96,8 @@ class TickerListResponse(BaseModel):
     sentiment_indicators: List[str]
     commodities: List[str]
     top_stocks: List[str]
+    tickers: List[TickerMetadata] = []  # Stored tickers from the catalog
+    catalog_version: Optional[int] = None
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,180 @@
+"""
+Background writer for the DataService cache fill
+
+Frames fetched by the fallback path are returned to the caller immediately
+and handed to this writer, which persists them on a worker thread:
+- pending frames are keyed by ticker, so a ticker queued twice is written once
+  (the newest frame wins) and readers can be served from the pending frame
+- each wake-up drains up to `batch_size` tickers into one write call
+- failed writes are retried with exponential backoff, then dropped
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.metrics import cache_write_duration, cache_writes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    frame: pd.DataFrame
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+class CacheWriter:
+    """
+    Queue of (ticker, frame) writes persisted by a daemon thread
+
+    Args:
+        write_batch: Persists a list of (ticker, frame); raises on failure
+        batch_size: Tickers written per call
+        max_pending: Queued tickers before new submissions are dropped
+        max_retries: Retries per ticker after the first failed write
+        retry_backoff: Seconds before the first retry (doubles each attempt)
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Tuple[str, pd.DataFrame]]], None],
+        batch_size: int = 8,
+        max_pending: int = 256,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+    ):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._pending: "OrderedDict[str, _PendingWrite]" = OrderedDict()
+        self._in_flight: Dict[str, pd.DataFrame] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @classmethod
+    def from_settings(cls, write_batch: Callable[[List[Tuple[str, pd.DataFrame]]], None]) -> "CacheWriter":
+        return cls(
+            write_batch,
+            batch_size=settings.CACHE_WRITER_BATCH_SIZE,
+            max_pending=settings.CACHE_WRITER_MAX_PENDING,
+            max_retries=settings.CACHE_WRITER_MAX_RETRIES,
+            retry_backoff=settings.CACHE_WRITER_RETRY_BACKOFF,
+        )
+
+    def __len__(self) -> int:
+        """Queue depth: tickers waiting to be written or being written"""
+        return len(self._pending) + len(self._in_flight)
+
+    def submit(self, ticker: str, frame: pd.DataFrame) -> bool:
+        """
+        Queue a frame for persistence
+
+        Returns:
+            False if the queue is full and the write was dropped
+        """
+        with self._cond:
+            if ticker in self._pending:
+                self._pending[ticker].frame = frame
+                cache_writes.inc(outcome="deduplicated")
+                return True
+            if len(self._pending) >= self.max_pending:
+                cache_writes.inc(outcome="dropped")
+                return False
+            self._pending[ticker] = _PendingWrite(frame)
+            self._ensure_thread()
+            self._cond.notify()
+        return True
+
+    def pending(self, ticker: str) -> Optional[pd.DataFrame]:
+        """The queued or in-flight frame for a ticker that is not persisted yet"""
+        entry = self._pending.get(ticker)
+        return entry.frame if entry is not None else self._in_flight.get(ticker)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the queue is empty (retries pending backoff included)
+
+        Returns:
+            True if everything was written or dropped before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            for entry in self._pending.values():
+                entry.not_before = 0.0
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = 10.0) -> bool:
+        """Flush and stop the worker thread"""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._stopping = False
+        return flushed
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="cache-writer", daemon=True)
+            self._thread.start()
+
+    def _take_batch(self) -> List[Tuple[str, _PendingWrite]]:
+        """Wait for due writes and remove up to batch_size of them (caller holds the lock)"""
+        while not self._stopping:
+            now = time.monotonic()
+            due = [t for t, entry in self._pending.items() if entry.not_before <= now][:self.batch_size]
+            if due:
+                return [(ticker, self._pending.pop(ticker)) for ticker in due]
+            wake = min((entry.not_before for entry in self._pending.values()), default=None)
+            self._cond.wait(None if wake is None else max(wake - now, 0.0))
+        return []
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+                if not batch:
+                    return
+                self._in_flight = {ticker: entry.frame for ticker, entry in batch}
+
+            started = time.perf_counter()
+            try:
+                self.write_batch([(ticker, entry.frame) for ticker, entry in batch])
+                failed = False
+            except Exception as e:
+                logger.warning("Background cache write failed for %s: %s", [t for t, _ in batch], e)
+                failed = True
+            cache_write_duration.observe(time.perf_counter() - started)
+
+            with self._cond:
+                self._in_flight = {}
+                for ticker, entry in batch:
+                    if not failed:
+                        cache_writes.inc(outcome="success")
+                    elif entry.attempts < self.max_retries and ticker not in self._pending:
+                        entry.attempts += 1
+                        entry.not_before = time.monotonic() + self.retry_backoff * 2 ** (entry.attempts - 1)
+                        self._pending[ticker] = entry
+                        cache_writes.inc(outcome="retry")
+                    elif ticker not in self._pending:
+                        cache_writes.inc(outcome="failed")
+                self._cond.notify_all()
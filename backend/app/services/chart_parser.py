@@ -0,0 +1,85 @@
+"""
+Parsing of Yahoo Finance v8 chart API responses
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+_DAY_NS = 86_400 * 10**9
+
+
+def parse_chart_result(result: dict, interval: str = "1d") -> Optional[pd.DataFrame]:
+    """
+    Build an OHLCV DataFrame from one chart API result with vectorized operations
+
+    Timestamps are converted from epoch seconds in one step and expressed in
+    the exchange's timezone (from meta), so each daily bar lands on its trading
+    date regardless of the server's local timezone. Daily and longer bars are
+    normalized to midnight; the index is timezone-naive like before.
+
+    Args:
+        result: Element of chart.result in the API response
+        interval: Requested bar interval
+
+    Returns:
+        DataFrame indexed by Date with Open, High, Low, Close, Volume and
+        Adj Close (from indicators.adjclose when present, otherwise Close),
+        or None if there are no complete bars
+    """
+    timestamps = result.get("timestamp") or []
+    quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+    if not timestamps:
+        return None
+
+    n = len(timestamps)
+    # None -> NaN during the float conversion; short arrays are padded with NaN
+    columns = {}
+    for name in PRICE_FIELDS + ("volume",):
+        values = np.asarray(quote.get(name) or [], dtype=float)
+        if len(values) < n:
+            values = np.concatenate([values, np.full(n - len(values), np.nan)])
+        columns[name] = values[:n]
+
+    # Keep only bars where every field is present
+    valid = np.ones(n, dtype=bool)
+    for values in columns.values():
+        valid &= np.isfinite(values)
+    if not valid.any():
+        return None
+
+    epoch = np.asarray(timestamps, dtype=np.int64)[valid]
+    index = pd.DatetimeIndex((epoch * 10**9).view("datetime64[ns]"), tz="UTC")
+    tz_name = result.get("meta", {}).get("exchangeTimezoneName")
+    if tz_name:
+        try:
+            index = index.tz_convert(tz_name)
+        except Exception:
+            pass
+    # Wall-clock time at the exchange as int64 nanoseconds; flooring to whole
+    # days here avoids DatetimeIndex.normalize(), which infers a frequency
+    local_ns = index.tz_localize(None).asi8
+    if interval.endswith(("d", "wk", "mo")):
+        local_ns = local_ns - local_ns % _DAY_NS
+    index = pd.DatetimeIndex(local_ns.view("datetime64[ns]"), name="Date")
+
+    close = columns["close"][valid]
+    adjusted = close
+    adjclose = (result.get("indicators", {}).get("adjclose") or [{}])[0].get("adjclose")
+    if adjclose and len(adjclose) == n:
+        adjusted = np.asarray(adjclose, dtype=float)[valid]
+        # Fill the odd missing adjusted value with the raw close
+        adjusted = np.where(np.isfinite(adjusted), adjusted, close)
+    return pd.DataFrame(
+        {
+            "Open": columns["open"][valid],
+            "High": columns["high"][valid],
+            "Low": columns["low"][valid],
+            "Close": close,
+            "Volume": columns["volume"][valid].astype(np.int64),
+            "Adj Close": adjusted,
+        },
+        index=index,
+    )
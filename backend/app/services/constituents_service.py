@@ -1,381 +1,180 @@
 """
 Service for fetching ETF constituents
+
+Holdings (with weights) and company names live in the etf_constituents and
+company_names tables. They are loaded into an immutable ConstituentsSnapshot
+that is replaced as a whole on refresh, so readers never see a partial
+update. Until the tables are seeded (python -m app.database.constituents_seed)
+the built-in defaults are served.
 """
 
-from typing import List, Dict
-import csv
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import List, Dict, Mapping, NamedTuple, Optional, Tuple, Union
+import json
+import logging
 import os
 
+from app.services.ticker_index import TickerIndex
+
+logger = logging.getLogger(__name__)
+
+
+class Holding(NamedTuple):
+    """One ETF constituent"""
+    symbol: str
+    weight: Optional[float]  # Fraction of the fund; None when unknown
+
+
+@dataclass(frozen=True)
+class ConstituentsSnapshot:
+    """Read-only view of all ETF holdings and company names"""
+    holdings: Mapping[str, Tuple[Holding, ...]]
+    names: Mapping[str, str]
+    as_of: Mapping[str, Optional[date]]
+    source: str  # "database" or "defaults"
+
+    @classmethod
+    def build(cls, holdings: Dict[str, List[Tuple[str, Optional[float]]]], names: Dict[str, str],
+              as_of: Optional[Dict[str, date]] = None, source: str = "database") -> "ConstituentsSnapshot":
+        return cls(
+            holdings=MappingProxyType({
+                etf.upper(): tuple(Holding(symbol, weight) for symbol, weight in members)
+                for etf, members in holdings.items()
+            }),
+            names=MappingProxyType(dict(names)),
+            as_of=MappingProxyType({etf: (as_of or {}).get(etf) for etf in holdings}),
+            source=source,
+        )
+
+
+def default_snapshot(csv_path: Optional[str] = None) -> ConstituentsSnapshot:
+    """Snapshot of the built-in holdings and names, plus a components CSV when given"""
+    from app.database.constituents_seed import default_constituents
+
+    holdings, names = default_constituents(csv_path)
+    return ConstituentsSnapshot.build(
+        holdings, {symbol: name for symbol, (name, _) in names.items()}, source="defaults"
+    )
+
 
 class ConstituentsService:
     """Service for managing ETF holdings/constituents"""
 
-    def __init__(self):
-        # Ticker to company name mapping
-        self.ticker_names = {
-            # Technology
-            "AAPL": "Apple Inc.",
-            "MSFT": "Microsoft Corporation",
-            "NVDA": "NVIDIA Corporation",
-            "AVGO": "Broadcom Inc.",
-            "GOOGL": "Alphabet Inc.",
-            "GOOG": "Alphabet Inc.",
-            "META": "Meta Platforms Inc.",
-            "TSLA": "Tesla Inc.",
-            "AMD": "Advanced Micro Devices",
-            "ARM": "ARM Holdings",
-            "ADBE": "Adobe Inc.",
-            "CSCO": "Cisco Systems",
-            "NFLX": "Netflix Inc.",
-            "AMZN": "Amazon.com Inc.",
-            "QCOM": "Qualcomm Inc.",
-            "TXN": "Texas Instruments",
-            "INTC": "Intel Corporation",
-            "ORCL": "Oracle Corporation",
-            "CRM": "Salesforce Inc.",
-            "IBM": "IBM",
-            "ACN": "Accenture",
-            "INTU": "Intuit Inc.",
-            "MU": "Micron Technology",
-            "AMAT": "Applied Materials",
-            "LRCX": "Lam Research",
-            "MRVL": "Marvell Technology",
-            "ADI": "Analog Devices",
-            "SNPS": "Synopsys Inc.",
-            "CDNS": "Cadence Design",
-            "KLAC": "KLA Corporation",
-            "NXPI": "NXP Semiconductors",
-            "ARM": "ARM Holdings",
-
-            # Software & Cloud
-            "SHOP": "Shopify Inc.",
-            "SNOW": "Snowflake Inc.",
-            "DOCU": "DocuSign Inc.",
-            "OKTA": "Okta Inc.",
-            "DDOG": "Datadog Inc.",
-            "ZM": "Zoom Video Communications",
-            "TWLO": "Twilio Inc.",
-            "CRWD": "CrowdStrike Holdings",
-            "PLTR": "Palantir Technologies",
-            "COIN": "Coinbase Global",
-            "SQ": "Block Inc.",
-            "U": "Unity Software",
-            "ROKU": "Roku Inc.",
-            "Z": "Zillow Group",
-            "RBLX": "Roblox Corporation",
-            "AFRM": "Affirm Holdings",
-            "UPST": "Upstart Holdings",
-            "HOOD": "Robinhood Markets",
-            "ETSY": "Etsy Inc.",
-            "WDAY": "Workday Inc.",
-            "SPLK": "Splunk Inc.",
-            "PANW": "Palo Alto Networks",
-            "ZS": "Zscaler Inc.",
-            "FTNT": "Fortinet Inc.",
-            "GEN": "Gen Digital",
-            "CTXS": "Citrix Systems",
-
-            # Semiconductors
-            "ASML": "ASML Holding",
-            "TSM": "Taiwan Semiconductor",
-            "SOXX": "iShares Semiconductor ETF",
-
-            # Consumer & Retail
-            "COST": "Costco Wholesale",
-            "SBUX": "Starbucks Corporation",
-            "MCD": "McDonald's Corporation",
-            "NKE": "Nike Inc.",
-            "HD": "Home Depot Inc.",
-            "LOW": "Lowe's Companies",
-            "TGT": "Target Corporation",
-            "WMT": "Walmart Inc.",
-            "AMZN": "Amazon.com Inc.",
-            "BKNG": "Booking Holdings",
-            "MAR": "Marriott International",
-            "ABNB": "Airbnb Inc.",
-            "LULU": "Lululemon Athletica",
-            "KHC": "Kraft Heinz Co.",
-            "KDP": "Keurig Dr Pepper",
-            "MNST": "Monster Beverage",
-            "PEP": "PepsiCo Inc.",
-            "KO": "Coca-Cola Company",
-            "PG": "Procter & Gamble",
-            "CL": "Colgate-Palmolive",
-            "EL": "Estee Lauder Companies",
-            "DIS": "Walt Disney Company",
-            "CMCSA": "Comcast Corporation",
-            "FOXA": "Fox Corporation",
-            "WBD": "Warner Bros. Discovery",
-
-            # Healthcare
-            "JNJ": "Johnson & Johnson",
-            "UNH": "UnitedHealth Group",
-            "PFE": "Pfizer Inc.",
-            "ABBV": "AbbVie Inc.",
-            "MRK": "Merck & Co.",
-            "TMO": "Thermo Fisher Scientific",
-            "ABT": "Abbott Laboratories",
-            "DHR": "Danaher Corporation",
-            "BMY": "Bristol-Myers Squibb",
-            "AMGN": "Amgen Inc.",
-            "GILD": "Gilead Sciences",
-            "REGN": "Regeneron Pharmaceuticals",
-            "VRTX": "Vertex Pharmaceuticals",
-            "ILMN": "Illumina Inc.",
-            "IDXX": "IDEXX Laboratories",
-            "DXCM": "DexCom Inc.",
-            "ISRG": "Intuitive Surgical",
-            "BDX": "Becton Dickinson",
-            "BIIB": "Biogen Inc.",
-            "MRNA": "Moderna Inc.",
-            "SGEN": "Seagen Inc.",
-            "LLY": "Eli Lilly and Company",
-            "AZN": "AstraZeneca",
-            "CVS": "CVS Health",
-
-            # Financial Services
-            "BRK.B": "Berkshire Hathaway",
-            "JPM": "JPMorgan Chase & Co.",
-            "BAC": "Bank of America",
-            "WFC": "Wells Fargo",
-            "C": "Citigroup Inc.",
-            "GS": "Goldman Sachs",
-            "MS": "Morgan Stanley",
-            "SCHW": "Charles Schwab",
-            "BLK": "BlackRock Inc.",
-            "SPGI": "S&P Global",
-            "ICE": "Intercontinental Exchange",
-            "AXP": "American Express",
-            "MA": "Mastercard Incorporated",
-            "V": "Visa Inc.",
-            "PYPL": "PayPal Holdings",
-            "ADP": "Automatic Data Processing",
-            "FISV": "Fiserv Inc.",
-            "GPN": "Global Payments",
-            "SQ": "Block Inc.",
-            "COIN": "Coinbase Global",
-            "IBKR": "Interactive Brokers",
-            "ETFC": "E*TRADE Financial",
-            "MET": "MetLife Inc.",
-            "PRU": "Prudential Financial",
-            "AIG": "American International",
-            "AON": "Aon plc",
-            "MMC": "Marsh & McLennan",
-            "TRV": "The Travelers Companies",
-
-            # Energy & Utilities
-            "XOM": "Exxon Mobil",
-            "CVX": "Chevron Corporation",
-            "COP": "ConocoPhillips",
-            "SLB": "Schlumberger NV",
-            "EOG": "EOG Resources",
-            "PXD": "Pioneer Natural Resources",
-            "NEE": "NextEra Energy",
-            "DUK": "Duke Energy",
-            "SO": "Southern Company",
-            "EXC": "Exelon Corporation",
-            "D": "Dominion Energy",
-            "XEL": "Xcel Energy",
-            "ETR": "Entergy Corporation",
-
-            # Industrials
-            "BA": "Boeing Company",
-            "CAT": "Caterpillar Inc.",
-            "HON": "Honeywell International",
-            "GE": "General Electric",
-            "UNP": "Union Pacific",
-            "UPS": "United Parcel Service",
-            "FDX": "FedEx Corporation",
-            "RTX": "Raytheon Technologies",
-            "LMT": "Lockheed Martin",
-            "NOC": "Northrop Grumman",
-            "GD": "General Dynamics",
-            "DE": "Deere & Company",
-            "CM": "Cummins Inc.",
-            "EMR": "Emerson Electric",
-            "ITW": "Illinois Tool Works",
-            "MMM": "3M Company",
-            "OTIS": "Otis Worldwide",
-            "CARR": "Carrier Global",
-            "TM": "Toyota Motor",
-            "GM": "General Motors",
-            "F": "Ford Motor",
-
-            # Materials
-            "APD": "Air Products and Chemicals",
-            "SHW": "Sherwin-Williams",
-            "LIN": "Linde plc",
-            "FCX": "Freeport-McMoRan",
-            "NEM": "Newmont Corporation",
-            "DOW": "Dow Inc.",
-            "DD": "DuPont de Nemours",
-
-            # Real Estate
-            "AMT": "American Tower",
-            "PLD": "Prologis Inc.",
-            "CCI": "Crown Castle",
-            "EQIX": "Equinix Inc.",
-            "SPG": "Simon Property Group",
-            "O": "Realty Income",
-            "WELL": "Welltower Inc.",
-            "AVB": "AvalonBay Communities",
-            "EQR": "Equity Residential",
-
-            # Communication & Telecom
-            "GOOGL": "Alphabet Inc.",
-            "META": "Meta Platforms Inc.",
-            "T": "AT&T Inc.",
-            "VZ": "Verizon Communications",
-            "TMUS": "T-Mobile US",
-            "CMCSA": "Comcast Corporation",
-            "CHTR": "Charter Communications",
-            "DIS": "Walt Disney Company",
-            "NFLX": "Netflix Inc.",
-            "EA": "Electronic Arts",
-            "ATVI": "Activision Blizzard",
-
-            # ETFs & Indices
-            "SPY": "SPDR S&P 500 ETF",
-            "QQQ": "Invesco QQQ Trust",
-            "IWM": "iShares Russell 2000 ETF",
-            "DIA": "SPDR Dow Jones Industrial Average ETF",
-            "GLD": "SPDR Gold Shares",
-            "USO": "United States Oil Fund",
-            "SLV": "iShares Silver Trust",
-            "TLT": "iShares 20+ Year Treasury Bond",
-            "VXX": "iPath Series B S&P 500 VIX",
-            "SVXY": "ProShares Short VIX Short-Term",
-            "XLF": "Financial Select Sector SPDR",
-            "XLE": "Energy Select Sector SPDR",
-            "XLK": "Technology Select Sector SPDR",
-            "XLV": "Health Care Select Sector SPDR",
-            "XLY": "Consumer Discretionary Select Sector SPDR",
-            "XLP": "Consumer Staples Select Sector SPDR",
-
-            # Volatility & Indicators
-            "VIX": "CBOE Volatility Index",
-            "^VIX": "CBOE Volatility Index",
-            "VXN": "Nasdaq-100 Volatility Index",
-            "^VXN": "Nasdaq-100 Volatility Index",
-            "RVX": "Russell 2000 Volatility Index",
-            "PCR": "CBOE Total Put/Call Ratio",
-
-            # Small Caps
-            "SMCI": "Super Micro Computer",
-            "SMG": "Scotts Miracle-Gro",
-            "FRG": "Ferguson",
-            "IART": "Integra LifeSciences",
-            "PCT": "PCTEL",
-            "INMD": "InMode Ltd.",
-            "AYTU": "AyTu Bio Holdings",
-            "EYPT": "EyePoint Pharmaceuticals",
-            "KALA": "KALA Pharmaceuticals",
-            "RGLS": "Regulus Therapeutics",
-            "SLNO": "Silence Therapeutics",
-            "TARS": "Tarsius Pharmaceuticals",
-            "VYNE": "Vyne Therapeutics",
-            "WVE": "Wave Life Sciences",
-            "XAIR": "XAIR",
-            "ZLAB": "Zai Lab",
-
-            # Other Notable
-            "MELI": "MercadoLibre Inc.",
-            "NTES": "NetEase Inc.",
-            "JD": "JD.com Inc.",
-            "PDD": "PDD Holdings",
-            "BABA": "Alibaba Group",
-            "TCOM": "Trip.com Group",
-            "PAYX": "Paychex Inc.",
-            "PCAR": "PACCAR Inc.",
-            "ODFL": "Old Dominion Freight",
-            "ORLY": "O'Reilly Automotive",
-            "ROST": "Ross Stores",
-            "WBA": "Walgreens Boots Alliance",
-            "CTSH": "Cognizant Technology",
-            "FISV": "Fiserv Inc.",
-            "IDXX": "IDEXX Laboratories",
-            "REGN": "Regeneron Pharmaceuticals",
-            "SIRI": "Sirius XM Holdings",
-            "VRSK": "Verisk Analytics",
-            "CSX": "CSX Corporation",
-            "GEHC": "GE HealthCare",
-            "HON": "Honeywell International",
-            "SWKS": "Skyworks Solutions",
-        }
-
-        # Popular Nasdaq-100 stocks (top holdings)
-        self.qqq_holdings = [
-            "AAPL", "MSFT", "NVDA", "AVGO", "GOOGL", "META", "TSLA", "AMD", "ARM",
-            "ADBE", "CSCO", "NFLX", "AMZN", "QCOM", "TXN", "INTC", "GOOG", "COST",
-            "AMGN", "SBUX", "INTU", "MU", "ISRG", "GILD", "BKNG",
-            "ADI", "MRVL", "LRCX", "CHTR", "AMAT", "TMUS", "SNPS", "CDNS",
-            "MAR", "AZN", "ABNB", "CMCSA", "CSX",
-            "CTSH", "DDOG", "DXCM", "EA", "EXC",
-            "IDXX", "ILMN", "JD", "KDP", "KHC", "KLAC", "LULU", "MELI", "MNST",
-            "MRNA", "NTES", "NXPI", "ODFL", "ORLY", "PANW", "PAYX",
-            "PCAR", "PEP", "PDD", "PYPL", "REGN", "ROST", "SIRI", "SPLK",
-            "SWKS", "TCOM", "VRSK", "VRTX", "WBD", "WDAY",
-            "XEL", "ZM", "ZS"
-        ]
-
-        # Popular S&P 500 stocks (top holdings by market cap)
-        self.spy_holdings = [
-            "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "GOOG", "BRK.B", "LLY",
-            "AVGO", "JPM", "XOM", "MA", "V", "JNJ", "UNH", "HD", "PG", "COST", "ABBV",
-            "MRK", "CVX", "KO", "BAC", "PEP", "TMO", "WMT", "CSCO", "CRM", "ABT",
-            "MCD", "ADBE", "NFLX", "AMD", "CMCSA", "INTU", "VZ", "DIS", "DHR", "QCOM",
-            "NEE", "PFE", "HON", "WFC", "ABNB", "TXN", "ACN", "IBM", "AMGN", "PM",
-            "BA", "CAT", "DE", "GE", "GM", "INTC", "LOW", "LMT", "MDLZ",
-            "MET", "MS", "NKE", "ORCL", "PYPL", "SCHW", "SHOP", "SLB", "SPG", "T",
-            "TGT", "UPS", "USB", "UNP", "WBA"
-        ]
-
-        # Russell 2000 holdings (sample of notable small caps)
-        self.iwm_holdings = [
-            "PLTR", "COIN", "SQ", "SHOP", "U", "DOCU", "SNOW", "CRWD", "ZM", "RBLX",
-            "AFRM", "UPST", "HOOD", "ETSY", "ROKU", "Z", "TWLO", "OKTA", "DDOG",
-            "SG", "SMCI", "FRG", "IART", "PCT", "INMD", "AYTU",
-            "EYPT", "KALA", "RGLS", "SLNO", "TARS", "VYNE", "WVE", "XAIR", "ZLAB"
-        ]
-
-        self.cache = {
-            "QQQ": self.qqq_holdings,
-            "SPY": self.spy_holdings,
-            "IWM": self.iwm_holdings,
-        }
-
-        # Load additional company names from SPY components CSV
-        self._load_company_names_from_csv()
-
-    def _load_company_names_from_csv(self):
-        """Load company names from SPY-components.csv file"""
-        csv_path = os.path.join(os.path.dirname(__file__), '../../../data/SPY-components.csv')
-
-        if os.path.exists(csv_path):
+    def __init__(self, snapshot: Optional[ConstituentsSnapshot] = None, session_factory=None):
+        # The built-in defaults and the search index are built on first use,
+        # keeping the singleton cheap to import
+        self._snapshot = snapshot
+        self._session_factory = session_factory
+        self._snapshot_fingerprint: Optional[Tuple] = None
+        self._ticker_index: Optional[TickerIndex] = None
+        self._index_fingerprint: Optional[Tuple] = None
+        self._popularity_dirty = False  # Queries recorded since the last save_popularity()
+
+    def _session(self):
+        """Open a database session (the application's SessionLocal unless one was given)"""
+        if self._session_factory is None:
+            from app.database.models import SessionLocal
+            return SessionLocal()
+        return self._session_factory()
+
+    @property
+    def snapshot(self) -> ConstituentsSnapshot:
+        if self._snapshot is None:
+            self._snapshot = default_snapshot()
+        return self._snapshot
+
+    @property
+    def ticker_index(self) -> TickerIndex:
+        """Search index; starts with the known names and gains the symbols in
+        the tickers table when load_ticker_index runs at startup"""
+        if self._ticker_index is None:
+            self._ticker_index = TickerIndex(dict(self.snapshot.names))
+        return self._ticker_index
+
+    @property
+    def ticker_names(self) -> Mapping[str, str]:
+        """Ticker to company name mapping"""
+        return self.snapshot.names
+
+    def _constituents_fingerprint(self, db) -> Tuple:
+        """Cheap summary of the constituents and names tables used to detect changes"""
+        from sqlalchemy import func
+        from app.database.models import CompanyName, EtfConstituent
+        constituents = db.query(func.count(EtfConstituent.id), func.max(EtfConstituent.as_of)).one()
+        return tuple(constituents) + (db.query(func.count(CompanyName.symbol)).scalar(),)
+
+    def load_snapshot(self, force: bool = True) -> bool:
+        """
+        Load the latest holdings per ETF and all company names into a new snapshot
+
+        Args:
+            force: Reload even if the tables look unchanged
+
+        Returns:
+            True if the snapshot was replaced
+        """
+        try:
+            from sqlalchemy import func
+            from app.database.models import CompanyName, EtfConstituent
+            db = self._session()
             try:
-                with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row and len(row) >= 2:
-                            ticker = row[0].strip()
-                            company_name = row[1].strip()
-                            # Only add if not already in ticker_names (prefer hardcoded names)
-                            if ticker and ticker not in self.ticker_names:
-                                self.ticker_names[ticker] = company_name
-            except Exception as e:
-                print(f"Warning: Could not load company names from CSV: {e}")
-
-    async def get_etf_holdings(self, etf_ticker: str) -> List[str]:
+                fingerprint = self._constituents_fingerprint(db)
+                if not force and fingerprint == self._snapshot_fingerprint:
+                    return False
+
+                latest = (
+                    db.query(EtfConstituent.etf, func.max(EtfConstituent.as_of).label("as_of"))
+                    .group_by(EtfConstituent.etf)
+                    .subquery()
+                )
+                rows = (
+                    db.query(EtfConstituent.etf, EtfConstituent.symbol, EtfConstituent.weight, EtfConstituent.as_of)
+                    .join(latest, (EtfConstituent.etf == latest.c.etf) & (EtfConstituent.as_of == latest.c.as_of))
+                    .order_by(EtfConstituent.etf, EtfConstituent.weight.desc().nullslast(), EtfConstituent.id)
+                    .all()
+                )
+                names = dict(db.query(CompanyName.symbol, CompanyName.name).all())
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning("Could not load constituents from database: %s", e)
+            return False
+
+        if not rows and not names:
+            # Tables not seeded yet: serve the defaults, reading the CSV once
+            from app.database.constituents_seed import SPY_COMPONENTS_CSV
+            self._snapshot = default_snapshot(SPY_COMPONENTS_CSV)
+            self._snapshot_fingerprint = fingerprint
+            return True
+
+        holdings: Dict[str, List[Tuple[str, Optional[float]]]] = {}
+        as_of: Dict[str, date] = {}
+        for etf, symbol, weight, row_as_of in rows:
+            holdings.setdefault(etf, []).append((symbol, weight))
+            as_of[etf] = row_as_of
+        self._snapshot = ConstituentsSnapshot.build(holdings, names, as_of)
+        self._snapshot_fingerprint = fingerprint
+        return True
+
+    async def get_etf_holdings(
+        self, etf_ticker: str, with_weights: bool = False
+    ) -> Union[List[str], List[Holding]]:
         """
         Get holdings for an ETF
 
         Args:
             etf_ticker: ETF symbol (e.g., "QQQ", "SPY", "IWM")
+            with_weights: Return Holding(symbol, weight) tuples instead of symbols
 
         Returns:
-            List of constituent ticker symbols
+            Constituents, largest weight first when weights are known
         """
-        return self.cache.get(etf_ticker.upper(), [])
+        holdings = self.snapshot.holdings.get(etf_ticker.upper(), ())
+        if with_weights:
+            return list(holdings)
+        return [holding.symbol for holding in holdings]
 
     async def get_all_index_constituents(self) -> Dict[str, List[str]]:
         """
@@ -384,63 +183,95 @@ class ConstituentsService:
         Returns:
             Dictionary mapping ETF tickers to their holdings
         """
-        return self.cache
+        return {etf: [h.symbol for h in holdings] for etf, holdings in self.snapshot.holdings.items()}
 
-    async def search_tickers(self, query: str) -> List[dict]:
+    def load_ticker_index(self, force: bool = True) -> bool:
         """
-        Search for tickers matching a query
+        Reload the constituents snapshot and rebuild the search index from the
+        company names and the ticker catalog
 
         Args:
-            query: Search string (e.g., "AAP", "Tech")
+            force: Rebuild even if neither the tables nor the catalog changed
 
         Returns:
-            List of matching tickers with company names
+            True if the index was rebuilt
+        """
+        from app.services.ticker_catalog import ticker_catalog
+
+        snapshot_changed = self.load_snapshot(force)
+        fingerprint = (ticker_catalog.version, len(ticker_catalog))
+        if not force and not snapshot_changed and fingerprint == self._index_fingerprint:
+            return False
+
+        names = dict(self.ticker_names)
+        for symbol, name in ticker_catalog.names().items():
+            # Prefer the curated names; the tickers table often stores the symbol as name
+            names.setdefault(symbol, name)
+        self.ticker_index.rebuild(names)
+        self._index_fingerprint = fingerprint
+        return True
+
+    def index_ticker(self, symbol: str, name: Optional[str] = None):
+        """Make a newly stored ticker searchable without a full rebuild"""
+        self.ticker_index.add({symbol: self.ticker_names.get(symbol) or name or symbol})
+
+    def record_query(self, symbol: str):
+        """Count a pattern query towards the symbol's search popularity"""
+        self.ticker_index.record_query(symbol)
+        self._popularity_dirty = True
+
+    def load_popularity(self, path: str) -> int:
         """
-        query = query.upper()
+        Seed search popularity from a JSON file of symbol -> query count
 
-        all_tickers = set()
+        Returns:
+            Number of symbols loaded (0 if the file does not exist)
+        """
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                counts = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load ticker popularity from %s: %s", path, e)
+            return 0
+        self.ticker_index.set_popularity(counts)
+        return len(counts)
+
+    def save_popularity(self, path: str) -> bool:
+        """
+        Write current query counts so popularity survives restarts
 
-        # Get tickers from database (if available)
+        Returns:
+            True if the file was written (skipped when no query was recorded since the last save)
+        """
+        if not path or not self._popularity_dirty:
+            return False
+        self._popularity_dirty = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
         try:
-            from app.database.models import SessionLocal, Ticker
-            db = SessionLocal()
-            try:
-                # Get all tickers from database - extract symbol strings from Row objects
-                db_tickers = db.query(Ticker.symbol).all()
-                for ticker_row in db_tickers:
-                    # ticker_row is a SQLAlchemy Row object like ('SPY',)
-                    # Access via index [0] to get the string value
-                    symbol = ticker_row[0]
-                    all_tickers.add(symbol)
-                print(f"DEBUG: Loaded {len(all_tickers)} tickers from database")
-            finally:
-                db.close()
-        except Exception as e:
-            print(f"Warning: Could not load tickers from database: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # If database is empty or query returned no results, use hardcoded ticker names
-        if not all_tickers:
-            all_tickers.update(self.ticker_names.keys())
-
-        # Filter by query - check both ticker and company name
-        matches = []
-        for ticker in sorted(all_tickers):
-            # Ensure ticker is a string
-            ticker_str = str(ticker) if not isinstance(ticker, str) else ticker
-            company_name = self.ticker_names.get(ticker_str, ticker_str)
-
-            # Ensure company_name is a string before calling .upper()
-            company_name_str = str(company_name) if not isinstance(company_name, str) else company_name
-
-            if query in ticker_str or query.upper() in company_name_str.upper():
-                matches.append({
-                    "ticker": ticker_str,
-                    "name": company_name_str
-                })
-
-        return matches[:20]  # Limit to 20 results
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.ticker_index.popularity(), f, sort_keys=True)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._popularity_dirty = True
+            raise
+        return True
+
+    async def search_tickers(self, query: str) -> List[dict]:
+        """
+        Search for tickers matching a query (served from the in-memory index)
+
+        Args:
+            query: Search string (e.g., "AAP", "Tech")
+
+        Returns:
+            List of matching tickers with company names, best match first
+        """
+        return self.ticker_index.search(query, limit=20)
 
 
 constituents_service = ConstituentsService()
@@ -2,20 +2,66 @@
 Service for fetching and managing market data
 """
 
-import yfinance as yf
+import logging
+import threading
+import time
 import pandas as pd
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Dict
-from sqlalchemy import create_engine, text
+from typing import Iterable, List, NamedTuple, Optional, Dict, Tuple
+from sqlalchemy import create_engine
 from app.core.config import settings
+from app.core.metrics import data_cache_requests, fallback_fetches, fallback_duration
+from app.core.timing import span
+from app.services.cache_writer import CacheWriter
+from app.services.constituents_service import constituents_service
+from app.services.ticker_catalog import TickerInfo, bump_catalog_version, ticker_catalog
+from app.utils.bulk_load import bulk_upsert, dialect_of
+from app.utils.records import price_records, return_records
+from app.services.market_data_provider import CircuitOpenError, MarketDataProvider, market_data_provider
+from app.services.negative_cache import NegativeCache, negative_cache as default_negative_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedFrame(NamedTuple):
+    """A price history held in memory with arrays derived from it"""
+    data: pd.DataFrame
+    pct_change: pd.Series
+    catalog_version: Optional[int]
+    loaded_at: float
 
 
 class DataService:
     """Service for fetching historical market data"""
 
-    def __init__(self):
-        self.cache = {}  # In-memory cache (fallback)
-        self.db_engine = create_engine(settings.DATABASE_URL)
+    def __init__(self, provider: Optional[MarketDataProvider] = None,
+                 negative_cache: Optional[NegativeCache] = None,
+                 cache_writer: Optional[CacheWriter] = None):
+        # Recently loaded histories, invalidated when the ticker catalog version
+        # changes (ingestion) or after DATA_CACHE_TTL; frames are shared, so
+        # callers must not modify them in place
+        self.cache: "OrderedDict[str, CachedFrame]" = OrderedDict()
+        self.cache_size = settings.DATA_CACHE_MAX_TICKERS if settings.DATA_CACHE_ENABLED else 0
+        self._cache_lock = threading.Lock()
+        self._db_engine = None  # Created on first use
+        self.provider = provider or market_data_provider
+        self.negative_cache = negative_cache if negative_cache is not None else default_negative_cache
+        # Resolved on each write so tests can swap _save_batch on an instance
+        if cache_writer is None:
+            cache_writer = CacheWriter.from_settings(lambda items: self._save_batch(items))
+        self.cache_writer = cache_writer
+
+    @property
+    def db_engine(self):
+        """Engine for the raw price queries, created on first use"""
+        if self._db_engine is None:
+            self._db_engine = create_engine(settings.DATABASE_URL)
+        return self._db_engine
+
+    @db_engine.setter
+    def db_engine(self, engine):
+        self._db_engine = engine
 
     async def fetch_historical_data(
         self, ticker: str, period: str = "20y"
@@ -23,7 +69,8 @@ class DataService:
         """
         Fetch historical data for a ticker
         - First tries database (fast)
-        - Falls back to yfinance if not in DB (slow, then caches to DB)
+        - Falls back to the market data provider if not in DB (slow); the result
+          is returned right away and written to the DB by the background cache writer
 
         Args:
             ticker: Ticker symbol
@@ -32,23 +79,67 @@ class DataService:
         Returns:
             DataFrame with historical OHLCV data
         """
-        # Step 1: Try to get from database first
-        db_data = self._get_from_database(ticker)
+        # A frame fetched moments ago may still be waiting for the background writer
+        pending = self.cache_writer.pending(ticker)
+        if pending is not None:
+            data_cache_requests.inc(result="pending")
+            return pending
+
+        cached = self._cached_frame(ticker)
+        if cached is not None:
+            data_cache_requests.inc(result="memory")
+            return cached.data
+
+        # Step 1: Try to get from database first (a loaded catalog already
+        # knows which tickers are stored, so unknown ones skip the round trip)
+        if ticker_catalog.loaded and ticker not in ticker_catalog:
+            db_data = None
+        else:
+            with span("db_load"):
+                db_data = self._get_from_database(ticker)
         if db_data is not None:
-            print(f"✅ Retrieved {ticker} from database")
-            return db_data
-
-        # Step 2: Not in DB - fetch from yfinance and store
-        print(f"⚠️  {ticker} not in database, fetching from yfinance...")
+            data_cache_requests.inc(result="hit")
+            logger.debug("Retrieved %s from database", ticker)
+            return self._remember(ticker, db_data).data
+
+        # Step 2: Not in DB - fetch from the provider and store, unless the
+        # provider recently had nothing for this ticker
+        data_cache_requests.inc(result="miss")
+        reason = self.negative_cache.get(ticker)
+        if reason is not None:
+            fallback_fetches.inc(outcome="negative_cached")
+            raise ValueError(f"Failed to fetch data for {ticker}: {reason} (cached)")
+
+        logger.info("%s not in database, fetching from %s", ticker, self.provider.name)
+        # A replay miss only means the response was never recorded
+        negative_cache = None if self.provider.replaying else self.negative_cache
         try:
-            # Download with auto_adjust=False to get Adj Close column
-            data = yf.download(ticker, period=period, progress=False, auto_adjust=False)
-            if data.empty:
+            started = time.perf_counter()
+            try:
+                with span("fallback_fetch"):
+                    data = await self.provider.fetch_history(ticker, period=period)
+            except CircuitOpenError:
+                # The provider is down, which says nothing about this ticker
+                fallback_fetches.inc(outcome="error")
+                raise
+            except Exception as e:
+                fallback_fetches.inc(outcome="error")
+                if negative_cache is not None:
+                    negative_cache.add(ticker, f"fetch failed: {e}", ttl=settings.NEGATIVE_CACHE_ERROR_TTL)
+                raise
+            finally:
+                fallback_duration.observe(time.perf_counter() - started)
+            if data is None or data.empty:
+                fallback_fetches.inc(outcome="empty")
+                if negative_cache is not None:
+                    negative_cache.add(ticker, "no data available")
                 raise ValueError(f"No data available for {ticker}")
+            fallback_fetches.inc(outcome="success")
+            self.negative_cache.discard(ticker)
 
-            # Store in database for next time
-            self._save_to_database(ticker, data)
-            print(f"✅ Cached {ticker} to database")
+            # Store in database for next time without holding up the response
+            if self.cache_writer.submit(ticker, data):
+                logger.info("Queued %s for caching to database", ticker)
             return data
 
         except Exception as e:
@@ -73,14 +164,14 @@ class DataService:
                 data = await self.fetch_historical_data(ticker, period)
                 results[ticker] = data
             except Exception as e:
-                print(f"Warning: Failed to fetch {ticker}: {str(e)}")
+                logger.warning("Failed to fetch %s: %s", ticker, e)
         return results
 
     def calculate_percentage_change(
         self, data: pd.DataFrame
     ) -> pd.Series:
         """
-        Calculate daily percentage changes
+        Calculate daily percentage changes (precomputed for cached histories)
 
         Args:
             data: DataFrame with 'Close' prices
@@ -88,8 +179,64 @@ class DataService:
         Returns:
             Series of daily percentage changes
         """
+        with self._cache_lock:
+            for cached in self.cache.values():
+                if cached.data is data:
+                    return cached.pct_change
         return data["Close"].pct_change() * 100
 
+    def _cached_frame(self, ticker: str) -> Optional[CachedFrame]:
+        """The in-memory copy of a ticker's history while it is current"""
+        with self._cache_lock:
+            cached = self.cache.get(ticker)
+            if cached is None:
+                return None
+            if (cached.catalog_version != ticker_catalog.version
+                    or time.monotonic() - cached.loaded_at > settings.DATA_CACHE_TTL):
+                del self.cache[ticker]
+                return None
+            self.cache.move_to_end(ticker)
+            return cached
+
+    def _remember(self, ticker: str, data: pd.DataFrame) -> CachedFrame:
+        """Keep a history loaded from the database in memory, evicting the least recently used"""
+        cached = CachedFrame(data, data["Close"].pct_change() * 100, ticker_catalog.version, time.monotonic())
+        if self.cache_size <= 0:
+            return cached
+        with self._cache_lock:
+            self.cache[ticker] = cached
+            self.cache.move_to_end(ticker)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return cached
+
+    def warm_cache(self, tickers: Iterable[str]) -> Dict[str, bool]:
+        """
+        Load tickers from the database into the in-memory cache
+
+        Only stored tickers are loaded; nothing is fetched from the market
+        data provider, so a cold start never waits on the network.
+
+        Args:
+            tickers: Ticker symbols, most important first
+
+        Returns:
+            Dictionary mapping ticker to whether it is now cached
+        """
+        results = {}
+        for ticker in tickers:
+            if self._cached_frame(ticker) is not None:
+                results[ticker] = True
+                continue
+            if ticker_catalog.loaded and ticker not in ticker_catalog:
+                results[ticker] = False
+                continue
+            data = self._get_from_database(ticker)
+            if data is not None:
+                self._remember(ticker, data)
+            results[ticker] = data is not None
+        return results
+
     def get_forward_returns(
         self,
         data: pd.DataFrame,
@@ -129,6 +276,23 @@ class DataService:
 
         return returns
 
+    def get_data_version(self, data: pd.DataFrame) -> tuple:
+        """
+        Get a version key for a loaded price history
+
+        The version changes whenever rows are added or the latest bar moves,
+        so it can be used to key caches of values derived from the data.
+
+        Args:
+            data: DataFrame with historical prices
+
+        Returns:
+            Tuple of (row count, latest date)
+        """
+        if data.empty:
+            return (0, None)
+        return (len(data), data.index[-1])
+
     def is_indicator(self, ticker: str) -> bool:
         """Check if a ticker is an indicator"""
         return ticker in settings.INDICATOR_REFERENCES
@@ -191,9 +355,70 @@ class DataService:
             return df
 
         except Exception as e:
-            print(f"Error reading from database: {e}")
+            logger.error("Error reading %s from database: %s", ticker, e)
             return None
 
+    def _bump_catalog_version(self):
+        """Signal other processes that the tickers table changed"""
+        try:
+            conn = self.db_engine.raw_connection()
+            try:
+                bump_catalog_version(conn, dialect_of(self.db_engine))
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning("Could not bump ticker catalog version: %s", e)
+
+    def _save_batch(self, items: List[Tuple[str, pd.DataFrame]]) -> None:
+        """
+        Save several tickers' data to the database in one transaction
+
+        Called by the background cache writer; raises on failure so the
+        writer can retry.
+
+        Args:
+            items: List of (ticker, DataFrame with OHLCV data)
+        """
+        dialect = dialect_of(self.db_engine)
+        today = datetime.now().strftime('%Y-%m-%d')
+        conn = self.db_engine.raw_connection()
+        try:
+            for ticker, data in items:
+                bulk_upsert(
+                    conn, dialect, 'historical_prices',
+                    ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume', 'adjusted_close'],
+                    price_records(ticker, data), conflict_columns=['ticker', 'date'],
+                )
+                bulk_upsert(
+                    conn, dialect, 'daily_returns', ['ticker', 'date', 'return_pct'],
+                    return_records(ticker, data['Close'].pct_change() * 100),
+                    conflict_columns=['ticker', 'date'],
+                )
+                bulk_upsert(
+                    conn, dialect, 'tickers',
+                    ['symbol', 'name', 'type', 'data_available', 'earliest_date', 'latest_date', 'last_updated'],
+                    [(ticker, ticker, 'stock', True, data.index[0].strftime('%Y-%m-%d'),
+                      data.index[-1].strftime('%Y-%m-%d'), today)],
+                    conflict_columns=['symbol'],
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        # Newly fetched tickers become known and searchable right away; other
+        # processes reload their catalog on the version bump
+        for ticker, data in items:
+            ticker_catalog.upsert(TickerInfo(
+                ticker, ticker, 'stock', None, True,
+                data.index[0].date(), data.index[-1].date(), datetime.now().date(),
+            ))
+            constituents_service.index_ticker(ticker)
+        self._bump_catalog_version()
+
     def _save_to_database(self, ticker: str, data: pd.DataFrame) -> bool:
         """
         Save ticker data to database (SQLite or PostgreSQL)
@@ -206,158 +431,10 @@ class DataService:
             True if successful, False otherwise
         """
         try:
-            # Detect database type from URL
-            is_postgresql = settings.DATABASE_URL.startswith("postgresql")
-
-            # Calculate daily returns
-            data_copy = data.copy()
-            data_copy['daily_return'] = data_copy['Close'].pct_change() * 100
-
-            # Use connection context manager for SQLAlchemy 2.0+
-            with self.db_engine.connect() as conn:
-                # Check if 'Adj Close' column exists, otherwise use 'Close'
-                adj_close_col = 'Adj Close' if 'Adj Close' in data.columns else 'Close'
-
-                # Insert price data using direct column access
-                for idx in range(len(data)):
-                    date = data.index[idx]
-                    volume_val = data['Volume'].iloc[idx]
-                    # Handle large volume values - use None if too large or NaN
-                    volume_int = None if pd.isna(volume_val) or volume_val > 2147483647 else int(volume_val)
-
-                    if is_postgresql:
-                        # PostgreSQL uses ON CONFLICT instead of INSERT OR REPLACE
-                        conn.execute(
-                            text("""
-                                INSERT INTO historical_prices
-                                (ticker, date, open, high, low, close, volume, adjusted_close)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (ticker, date) DO UPDATE SET
-                                    open = EXCLUDED.open,
-                                    high = EXCLUDED.high,
-                                    low = EXCLUDED.low,
-                                    close = EXCLUDED.close,
-                                    volume = EXCLUDED.volume,
-                                    adjusted_close = EXCLUDED.adjusted_close
-                            """),
-                            (
-                                ticker,
-                                date.strftime('%Y-%m-%d'),
-                                float(data['Open'].iloc[idx]),
-                                float(data['High'].iloc[idx]),
-                                float(data['Low'].iloc[idx]),
-                                float(data['Close'].iloc[idx]),
-                                volume_int,
-                                float(data[adj_close_col].iloc[idx])
-                            )
-                        )
-                    else:
-                        # SQLite uses INSERT OR REPLACE
-                        conn.execute(
-                            text("""
-                                INSERT OR REPLACE INTO historical_prices
-                                (ticker, date, open, high, low, close, volume, adjusted_close)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            """),
-                            (
-                                ticker,
-                                date.strftime('%Y-%m-%d'),
-                                float(data['Open'].iloc[idx]),
-                                float(data['High'].iloc[idx]),
-                                float(data['Low'].iloc[idx]),
-                                float(data['Close'].iloc[idx]),
-                                volume_int,
-                                float(data[adj_close_col].iloc[idx])
-                            )
-                        )
-
-                # Insert daily returns
-                for idx in range(len(data_copy)):
-                    daily_ret = data_copy['daily_return'].iloc[idx]
-                    # Check if not NaN using numpy's isnan which handles scalars properly
-                    import numpy as np
-                    if not isinstance(daily_ret, float) or not np.isnan(daily_ret):
-                        if is_postgresql:
-                            conn.execute(
-                                text("""
-                                    INSERT INTO daily_returns (ticker, date, return_pct)
-                                    VALUES (%s, %s, %s)
-                                    ON CONFLICT (ticker, date) DO UPDATE SET
-                                        return_pct = EXCLUDED.return_pct
-                                """),
-                                (
-                                    ticker,
-                                    data_copy.index[idx].strftime('%Y-%m-%d'),
-                                    float(daily_ret)
-                                )
-                            )
-                        else:
-                            conn.execute(
-                                text("""
-                                    INSERT OR REPLACE INTO daily_returns (ticker, date, return_pct)
-                                    VALUES (?, ?, ?)
-                                """),
-                                (
-                                    ticker,
-                                    data_copy.index[idx].strftime('%Y-%m-%d'),
-                                    float(daily_ret)
-                                )
-                            )
-
-                # Update ticker metadata
-                if is_postgresql:
-                    conn.execute(
-                        text("""
-                            INSERT INTO tickers
-                            (symbol, name, type, data_available, earliest_date, latest_date, last_updated)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (symbol) DO UPDATE SET
-                                name = EXCLUDED.name,
-                                type = EXCLUDED.type,
-                                data_available = EXCLUDED.data_available,
-                                earliest_date = EXCLUDED.earliest_date,
-                                latest_date = EXCLUDED.latest_date,
-                                last_updated = EXCLUDED.last_updated,
-                                exchange = EXCLUDED.exchange
-                        """),
-                        (
-                            ticker,
-                            ticker,
-                            'stock',
-                            True,
-                            data.index[0].strftime('%Y-%m-%d'),
-                            data.index[-1].strftime('%Y-%m-%d'),
-                            datetime.now().strftime('%Y-%m-%d')
-                        )
-                    )
-                else:
-                    conn.execute(
-                        text("""
-                            INSERT OR REPLACE INTO tickers
-                            (symbol, name, type, data_available, earliest_date, latest_date, last_updated)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """),
-                        (
-                            ticker,
-                            ticker,
-                            'stock',
-                            True,
-                            data.index[0].strftime('%Y-%m-%d'),
-                            data.index[-1].strftime('%Y-%m-%d'),
-                            datetime.now().strftime('%Y-%m-%d')
-                        )
-                    )
-
-                # Commit the transaction
-                conn.commit()
-
+            self._save_batch([(ticker, data)])
             return True
-
         except Exception as e:
-            print(f"Error saving to database: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error saving %s to database: %s", ticker, e)
             return False
 
-
 data_service = DataService()
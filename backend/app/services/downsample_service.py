@@ -0,0 +1,157 @@
+"""
+Service for downsampling price series for charts
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.utils.records import clip_volume
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The remaining points are split
+    into threshold - 2 buckets and, for each bucket, the point forming the
+    largest triangle with the previously selected point and the average of the
+    next bucket is kept. Bucket averages are computed up front with cumulative
+    sums; each bucket's triangle areas are evaluated as one NumPy expression.
+
+    Args:
+        x: Monotonic x values (e.g. epoch seconds)
+        y: Values to preserve the shape of (e.g. close prices)
+        threshold: Number of points to return
+
+    Returns:
+        Sorted integer indices of the selected points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket boundaries over the interior points [1, n - 1)
+    n_buckets = threshold - 2
+    edges = np.arange(n_buckets + 1, dtype=np.int64) * (n - 2) // n_buckets + 1
+
+    # Average of each bucket via cumulative sums; the "next bucket" of the
+    # last bucket is the final point
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = edges[1:] - edges[:-1]
+    avg_x = np.append((cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts, x[-1])
+    avg_y = np.append((cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_buckets):
+        start, end = edges[i], edges[i + 1]
+        bx = x[start:end]
+        by = y[start:end]
+        # Twice the triangle area; the constant factor does not change argmax
+        areas = np.abs(
+            (x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
+
+
+def price_records(data: pd.DataFrame) -> List[dict]:
+    """
+    Convert an OHLCV DataFrame to the JSON records served by /api/prices
+
+    Args:
+        data: DataFrame with Open, High, Low, Close, Volume and a DatetimeIndex
+
+    Returns:
+        List of {"date", "open", "high", "low", "close", "volume"} dicts
+        (volume is None where it is missing)
+    """
+    dates = data.index.strftime("%Y-%m-%d")
+    columns = [data[col].to_numpy(dtype=float).tolist() for col in ("Open", "High", "Low", "Close")]
+    volumes = clip_volume(data["Volume"].to_numpy(dtype=float))
+    return [
+        {"date": d, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+        for d, o, h, lo, c, v in zip(dates, *columns, volumes)
+    ]
+
+
+class DownsampleService:
+    """Service for LTTB-downsampled chart series with an LRU cache"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.cache: "OrderedDict[Hashable, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def downsample(self, data: pd.DataFrame, max_points: int) -> pd.DataFrame:
+        """
+        Downsample an OHLCV DataFrame on its Close column
+
+        Args:
+            data: DataFrame with a DatetimeIndex and a Close column
+            max_points: Maximum number of rows to keep
+
+        Returns:
+            DataFrame containing at most max_points of the original rows
+        """
+        if len(data) <= max_points:
+            return data
+        x = data.index.asi8.astype(float)
+        y = data["Close"].to_numpy(dtype=float)
+        return data.iloc[lttb_indices(x, y, max_points)]
+
+    def get_price_records(
+        self,
+        ticker: str,
+        data: pd.DataFrame,
+        max_points: Optional[int],
+        data_version: Hashable,
+        window: Hashable = None,
+    ) -> List[dict]:
+        """
+        Get (optionally downsampled) price records, cached per series version
+
+        Args:
+            ticker: Ticker symbol
+            data: Full OHLCV DataFrame for the requested window
+            max_points: Maximum number of points, or None for every bar
+            data_version: Version of the underlying data (changes on ingestion)
+            window: Requested date window, part of the cache key
+
+        Returns:
+            List of price record dicts
+        """
+        if max_points is None:
+            return price_records(data)
+
+        key = (ticker, max_points, data_version, window)
+        with self._lock:
+            records = self.cache.get(key)
+            if records is not None:
+                self.cache.move_to_end(key)
+                return records
+
+        records = price_records(self.downsample(data, max_points))
+
+        with self._lock:
+            self.cache[key] = records
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        return records
+
+
+downsample_service = DownsampleService(max_entries=settings.DOWNSAMPLE_CACHE_SIZE)
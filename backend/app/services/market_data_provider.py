@@ -0,0 +1,571 @@
+"""
+Market data providers behind one async interface
+
+Every component that needs price history from the network (the API fallback
+in DataService, init_poc, and the market data updater) goes through a
+MarketDataProvider:
+
+    YahooChartProvider  - Yahoo v8 chart API over a pooled keep-alive httpx
+                          client, with retries (exponential backoff + jitter),
+                          per-host concurrency limits, an optional shared rate
+                          limiter, a per-host circuit breaker and the raw
+                          response cache
+    YFinanceProvider    - the yfinance library with one shared session
+    FakeMarketDataProvider - in-memory frames for tests
+
+Synchronous callers use fetch_history_sync(), which runs coroutines on one
+background event loop so they share the same pooled connections.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Coroutine, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.metrics import market_data_requests
+from app.services.chart_parser import parse_chart_result
+from app.services.response_cache import ResponseCache, response_cache
+
+if TYPE_CHECKING:
+    # Imported when the first request is made; most processes never use the fallback
+    import httpx
+
+# Browser User-Agent; Yahoo throttles obvious library clients harder
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Responses worth retrying; anything else non-200 is treated as "no data"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+PERIOD_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1wk": 7,
+    "1mo": 30,
+    "3mo": 90,
+    "6mo": 180,
+    "1y": 365,
+    "2y": 365 * 2,
+    "5y": 365 * 5,
+    "10y": 365 * 10,
+    "20y": 365 * 20,
+    "max": 365 * 50,  # 50 years
+}
+
+
+class MarketDataError(Exception):
+    """A provider could not reach its upstream (after retries)"""
+
+
+class CircuitOpenError(MarketDataError):
+    """Requests to a host are short-circuited after repeated failures"""
+
+
+def period_start(period: str, today: Optional[date] = None) -> date:
+    """
+    Get the first date covered by a period string such as "1y" or "max"
+
+    Unknown periods fall back to one year.
+    """
+    today = today or datetime.now().date()
+    return today - timedelta(days=PERIOD_DAYS.get(period, 365))
+
+
+def chart_window(start: date, end: date) -> Tuple[int, int]:
+    """
+    Convert an inclusive date range to chart API period1/period2 timestamps
+
+    Both ends are whole local days, so repeated requests for the same range
+    share a response cache key.
+    """
+    period1 = int(datetime.combine(start, datetime.min.time()).timestamp())
+    period2 = int(datetime.combine(end + timedelta(days=1), datetime.min.time()).timestamp())
+    return period1, period2
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all fetch workers
+
+    Allows bursts of up to `capacity` requests, then refills at `rate`
+    tokens per second, so the aggregate request rate stays bounded no
+    matter how many workers are running. Usable from threads (acquire)
+    and coroutines (acquire_async).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # Take a token now (possibly going negative) and return how long the
+        # caller must wait before using it
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a token is available"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After `threshold` consecutive failures the circuit opens and calls fail
+    fast for `reset_timeout` seconds. Then a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self) -> None:
+        """Free a half-open trial that ended without an outcome (cancelled or crashed)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class _BackgroundLoop:
+    """Event loop on a daemon thread for running provider coroutines from sync code"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="market-data-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+
+_background_loop = _BackgroundLoop()
+
+
+def submit(coro: Coroutine) -> Future:
+    """Schedule a coroutine on the shared background loop"""
+    return _background_loop.submit(coro)
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None):
+    """Run a coroutine on the shared background loop and wait for its result"""
+    return submit(coro).result(timeout)
+
+
+class MarketDataProvider(ABC):
+    """Interface for fetching daily price history"""
+
+    name = "base"
+
+    @property
+    def replaying(self) -> bool:
+        """Whether results come only from recorded responses (a miss says nothing about the symbol)"""
+        return False
+
+    @abstractmethod
+    async def fetch_history(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        period: str = "1y",
+        interval: str = "1d",
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch OHLCV history for a symbol
+
+        Args:
+            symbol: Ticker symbol
+            start: First date (inclusive); defaults to the start of `period`
+            end: Last date (inclusive); defaults to today
+            period: Lookback used when start is not given (e.g. "1y", "20y", "max")
+            interval: Bar interval ("1d", "1wk", "1mo")
+
+        Returns:
+            DataFrame indexed by Date with Open, High, Low, Close, Volume and
+            Adj Close, or None if the provider has no data for the symbol
+
+        Raises:
+            MarketDataError: The upstream could not be reached
+        """
+
+    def fetch_history_sync(self, symbol: str, **kwargs) -> Optional[pd.DataFrame]:
+        """Blocking version of fetch_history for scripts and sync code"""
+        return run_sync(self.fetch_history(symbol, **kwargs))
+
+    async def aclose(self) -> None:
+        """Release pooled connections"""
+
+
+class YahooChartProvider(MarketDataProvider):
+    """
+    Yahoo Finance v8 chart API over a pooled async HTTP client
+
+    Args:
+        base_url: Chart endpoint (defaults to the YAHOO_BASE_URL setting)
+        cache: Raw response cache (defaults to the shared response_cache)
+        rate_limiter: Token bucket taken before every HTTP attempt
+        max_retries: Retries after the first attempt for network errors and 429/5xx
+        backoff_base: First retry delay ceiling in seconds; doubles per attempt
+        backoff_max: Largest retry delay ceiling in seconds
+        timeout: Per-request timeout in seconds
+        max_connections_per_host: Concurrent requests allowed per host
+        breaker_threshold: Consecutive failures that open a host's circuit
+        breaker_reset: Seconds before a half-open trial request
+        transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+    """
+
+    name = "yahoo"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        timeout: Optional[float] = None,
+        max_connections_per_host: Optional[int] = None,
+        breaker_threshold: Optional[int] = None,
+        breaker_reset: Optional[float] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        self.base_url = base_url or settings.YAHOO_BASE_URL
+        self.cache = cache if cache is not None else response_cache
+        self.rate_limiter = rate_limiter
+        self.max_retries = settings.MARKET_DATA_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout or settings.MARKET_DATA_TIMEOUT
+        self.max_connections_per_host = max_connections_per_host or settings.MARKET_DATA_MAX_CONNECTIONS_PER_HOST
+        self.breaker_threshold = breaker_threshold or settings.MARKET_DATA_BREAKER_THRESHOLD
+        self.breaker_reset = settings.MARKET_DATA_BREAKER_RESET if breaker_reset is None else breaker_reset
+        self.transport = transport
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        # httpx clients and semaphores are bound to the event loop that uses them
+        self._per_loop: Dict[asyncio.AbstractEventLoop, Tuple["httpx.AsyncClient", Dict[str, asyncio.Semaphore]]] = {}
+
+    @property
+    def replaying(self) -> bool:
+        return self.cache.mode == "replay"
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+            return self._breakers[host]
+
+    def _client_and_semaphore(self, host: str):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        state = self._per_loop.get(loop)
+        if state is None or state[0].is_closed:
+            # Forget clients whose event loop has gone away
+            for stale in [l for l in self._per_loop if l.is_closed()]:
+                del self._per_loop[stale]
+            client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=None,
+                    max_keepalive_connections=self.max_connections_per_host * 4,
+                ),
+                transport=self.transport,
+            )
+            state = (client, {})
+            self._per_loop[loop] = state
+        client, semaphores = state
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return client, semaphores[host]
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # Full jitter: uniform over [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _request(self, symbol: str, params: dict) -> Optional[bytes]:
+        import httpx
+
+        url = f"{self.base_url}{symbol}"
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        client, semaphore = self._client_and_semaphore(host)
+
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                market_data_requests.inc(provider=self.name, outcome="circuit_open")
+                raise CircuitOpenError(f"Circuit open for {host}")
+
+            retry_after = None
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async()
+                async with semaphore:
+                    response = await client.get(url, params=params)
+            except httpx.HTTPError as e:
+                breaker.record_failure()
+                error = f"{type(e).__name__}: {e}"
+            except BaseException:
+                # No outcome to record; a half-open trial must not stay taken
+                breaker.release_trial()
+                raise
+            else:
+                if response.status_code == 200:
+                    breaker.record_success()
+                    market_data_requests.inc(provider=self.name, outcome="success")
+                    return response.content
+                if response.status_code == 404:
+                    # The host is healthy; it just has nothing for this symbol
+                    breaker.record_success()
+                    market_data_requests.inc(provider=self.name, outcome="empty")
+                    return None
+                if response.status_code not in RETRYABLE_STATUS:
+                    # Auth, consent or bad-request blocks say nothing about the
+                    # symbol, so they are errors rather than "no data"
+                    breaker.record_success()
+                    market_data_requests.inc(provider=self.name, outcome="error")
+                    raise MarketDataError(f"{symbol}: HTTP {response.status_code}")
+                breaker.record_failure()
+                retry_after = response.headers.get("Retry-After")
+                error = f"HTTP {response.status_code}"
+
+            if attempt < self.max_retries:
+                market_data_requests.inc(provider=self.name, outcome="retry")
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        market_data_requests.inc(provider=self.name, outcome="error")
+        raise MarketDataError(f"{symbol}: {error} after {self.max_retries + 1} attempts")
+
+    async def fetch_history(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        period: str = "1y",
+        interval: str = "1d",
+    ) -> Optional[pd.DataFrame]:
+        end = end or datetime.now().date()
+        start = start or period_start(period, end)
+        period1, period2 = chart_window(start, end)
+        params = {
+            "period1": period1,
+            "period2": period2,
+            "interval": interval,
+            "includePrePost": "true",
+        }
+
+        cached = self.cache.get(symbol, period1, period2, interval)
+        body = cached
+        if body is None:
+            if self.cache.mode == "replay":
+                return None
+            body = await self._request(symbol, params)
+            if body is None:
+                return None
+
+        # A truncated body or unexpected payload is an upstream failure, not a crash
+        try:
+            result = (json.loads(body).get("chart", {}).get("result") or [None])[0]
+            data = parse_chart_result(result, interval) if result else None
+        except (ValueError, KeyError, TypeError, AttributeError, IndexError) as e:
+            source = "cached response" if cached is not None else "response"
+            raise MarketDataError(f"{symbol}: undecodable {source} ({type(e).__name__}: {e})") from e
+
+        if cached is None:
+            self.cache.put(symbol, period1, period2, interval, body)
+        return data
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        state = self._per_loop.pop(loop, None)
+        if state is not None:
+            await state[0].aclose()
+
+
+class YFinanceProvider(MarketDataProvider):
+    """yfinance downloads on worker threads, sharing one HTTP session"""
+
+    name = "yfinance"
+
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                self._session = requests.Session()
+                self._session.headers.update({"User-Agent": USER_AGENT})
+            return self._session
+
+    def _download(self, symbol: str, start: Optional[date], end: Optional[date], period: str,
+                  interval: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        kwargs = {"progress": False, "auto_adjust": False, "interval": interval, "session": self.session}
+        if start is not None:
+            kwargs.update(start=start.isoformat(), end=((end or datetime.now().date()) + timedelta(days=1)).isoformat())
+        else:
+            kwargs["period"] = period
+        return yf.download(symbol, **kwargs)
+
+    async def fetch_history(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        period: str = "1y",
+        interval: str = "1d",
+    ) -> Optional[pd.DataFrame]:
+        try:
+            data = await asyncio.to_thread(self._download, symbol, start, end, period, interval)
+        except Exception as e:
+            market_data_requests.inc(provider=self.name, outcome="error")
+            raise MarketDataError(f"{symbol}: {e}") from e
+        if data is None or data.empty:
+            market_data_requests.inc(provider=self.name, outcome="empty")
+            return None
+        market_data_requests.inc(provider=self.name, outcome="success")
+        # Newer yfinance returns (field, ticker) columns even for one symbol
+        if isinstance(data.columns, pd.MultiIndex):
+            data = data.droplevel(1, axis=1)
+        return data
+
+
+class FakeMarketDataProvider(MarketDataProvider):
+    """
+    Provider serving prepared frames, for tests
+
+    Args:
+        frames: Symbol -> full history DataFrame; windows are sliced from it
+        fail: Symbols whose fetch raises MarketDataError
+        latency: Seconds to await before answering
+    """
+
+    name = "fake"
+
+    def __init__(self, frames: Optional[Dict[str, pd.DataFrame]] = None, fail: Optional[List[str]] = None,
+                 latency: float = 0.0):
+        self.frames = dict(frames or {})
+        self.fail = set(fail or [])
+        self.latency = latency
+        self.calls: List[Tuple[str, Optional[date], Optional[date], str]] = []
+
+    async def fetch_history(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        period: str = "1y",
+        interval: str = "1d",
+    ) -> Optional[pd.DataFrame]:
+        self.calls.append((symbol, start, end, period))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if symbol in self.fail:
+            raise MarketDataError(f"{symbol}: simulated failure")
+        frame = self.frames.get(symbol)
+        if frame is None:
+            return None
+        if start is not None:
+            frame = frame.loc[pd.Timestamp(start):pd.Timestamp(end) if end else None]
+        return frame.copy() if not frame.empty else None
+
+
+def create_provider(name: Optional[str] = None, **kwargs) -> MarketDataProvider:
+    """
+    Build a provider by name ("yahoo" or "yfinance")
+
+    Args:
+        name: Provider name; defaults to the MARKET_DATA_PROVIDER setting
+        **kwargs: Passed to the provider's constructor
+    """
+    name = name or settings.MARKET_DATA_PROVIDER
+    if name == "yahoo":
+        return YahooChartProvider(**kwargs)
+    if name == "yfinance":
+        return YFinanceProvider(**kwargs)
+    raise ValueError(f"Unknown market data provider: {name}")
+
+
+# Create singleton instance
+market_data_provider = create_provider()
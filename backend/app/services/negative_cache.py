@@ -0,0 +1,167 @@
+"""
+Negative-result cache for tickers the market data provider could not serve
+
+A bogus symbol misses the database and would otherwise trigger a provider
+fetch on every request. DataService records symbols that returned no data
+(or failed) here and checks the cache before any network call. Entries
+expire after a TTL. Changes stay in memory on the request path; save()
+writes them to a JSON file from the background refresh loop and at
+shutdown, so restarts keep them.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import negative_cache_requests
+
+logger = logging.getLogger(__name__)
+
+
+class NegativeCache:
+    """
+    Symbol -> (expiry, reason) map with TTL and optional JSON persistence
+
+    Args:
+        path: JSON file for persistence ("" keeps entries in memory only)
+        ttl: Default seconds an entry lives; 0 disables the cache
+        max_entries: Entries kept; the soonest-expiring are dropped first
+    """
+
+    def __init__(self, path: str = "", ttl: float = 3600, max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False  # The file is read on first use, not at import
+        self._dirty = False  # Entries changed since the last save()
+
+    @classmethod
+    def from_settings(cls) -> "NegativeCache":
+        return cls(
+            path=settings.NEGATIVE_CACHE_PATH,
+            ttl=settings.NEGATIVE_CACHE_TTL,
+            max_entries=settings.NEGATIVE_CACHE_MAX_ENTRIES,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load negative ticker cache from %s: %s", self.path, e)
+            return
+        now = time.time()
+        self._entries = {
+            symbol: (float(entry["expires_at"]), str(entry.get("reason", "")))
+            for symbol, entry in stored.items()
+            if float(entry.get("expires_at", 0)) > now
+        }
+
+    def save(self) -> bool:
+        """
+        Write entries atomically if they changed since the last save
+
+        Called off the request path (refresh loop, shutdown); the lock is only
+        held to snapshot the entries, not during the write.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.path or not self._dirty:
+            return False
+        with self._lock:
+            snapshot = {s: {"expires_at": e, "reason": r} for s, (e, r) in self._entries.items()}
+            self._dirty = False
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not persist negative ticker cache to %s: %s", self.path, e)
+            self._dirty = True
+            return False
+        return True
+
+    def get(self, symbol: str) -> Optional[str]:
+        """
+        Look up a symbol
+
+        Returns:
+            The recorded reason while the entry is live, else None
+        """
+        if not self.enabled:
+            return None
+        self._ensure_loaded()
+        entry = self._entries.get(symbol)
+        if entry is None:
+            negative_cache_requests.inc(result="miss")
+            return None
+        expires_at, reason = entry
+        if expires_at <= time.time():
+            with self._lock:
+                if self._entries.pop(symbol, None) is not None:
+                    self._dirty = True
+            negative_cache_requests.inc(result="expired")
+            return None
+        negative_cache_requests.inc(result="hit")
+        return reason
+
+    def add(self, symbol: str, reason: str, ttl: Optional[float] = None) -> None:
+        """Record a symbol that returned no data or failed"""
+        if not self.enabled:
+            return
+        self._ensure_loaded()
+        now = time.time()
+        with self._lock:
+            self._entries[symbol] = (now + (self.ttl if ttl is None else ttl), reason)
+            if len(self._entries) > self.max_entries:
+                live = sorted(
+                    ((e, s) for s, (e, _) in self._entries.items() if e > now), reverse=True
+                )[:self.max_entries]
+                self._entries = {s: self._entries[s] for _, s in live}
+            self._dirty = True
+        negative_cache_requests.inc(result="added")
+
+    def discard(self, symbol: str) -> None:
+        """Forget a symbol (e.g. once data for it has been stored)"""
+        self._ensure_loaded()
+        with self._lock:
+            if self._entries.pop(symbol, None) is not None:
+                self._dirty = True
+
+    def clear(self) -> None:
+        self._ensure_loaded()
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+
+# Create singleton instance
+negative_cache = NegativeCache.from_settings()
@@ -2,12 +2,21 @@
 Service for querying historical patterns
 """
 
+import logging
+
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime
+from app.core.timing import span
 from app.services.data_service import data_service
 from app.models.schemas import QueryRequest, PatternInstance, QueryResponse
 
+logger = logging.getLogger(__name__)
+
+# Instances returned by the "recent" and "page" modes when no limit is given
+DEFAULT_INSTANCE_LIMIT = 100
+
 
 class QueryService:
     """Service for querying historical patterns and calculating forward returns"""
@@ -16,6 +25,10 @@ class QueryService:
         """
         Execute a historical pattern query
 
+        Forward returns and summary statistics are computed over every
+        matching date; PatternInstance objects are only built for the
+        instances selected by query.include_instances.
+
         Args:
             query: QueryRequest with ticker, condition, and parameters
 
@@ -25,66 +38,86 @@ class QueryService:
         # Fetch historical data
         data = await data_service.fetch_historical_data(query.ticker)
 
-        # Find dates matching the condition
-        matching_dates = self._find_matching_dates(data, query)
+        # Find positions matching the condition
+        with span("mask"):
+            mask = self._build_condition_mask(data, query)
+            positions = np.flatnonzero(mask.to_numpy(dtype=bool, na_value=False))
+            match_dates = data.index[positions]
 
-        print(f"=== QUERY DEBUG ===")
-        print(f"Query: {query.ticker} {query.operator} {query.threshold}")
-        print(f"Matching dates found: {len(matching_dates)}")
-        if len(matching_dates) <= 10:
-            print(f"Dates: {matching_dates}")
-        else:
-            print(f"First 5 dates: {matching_dates[:5]}")
-        print(f"==================")
+        if logger.isEnabledFor(logging.DEBUG):
+            shown = match_dates if len(positions) <= 10 else match_dates[:5]
+            logger.debug(
+                "Query %s %s %s matched %d dates (first: %s)",
+                query.ticker, query.operator, query.threshold, len(positions),
+                [d.date().isoformat() for d in shown],
+            )
 
-        # Calculate forward returns for each matching date
+        # Calculate forward returns for every matching date
         horizons_map = {"1d": 1, "1w": 5, "1m": 21, "1y": 252}
         filtered_horizons = {
             k: v for k, v in horizons_map.items() if k in query.time_horizons
         }
-
-        instances = []
-        for match_date in matching_dates:
-            forward_returns = data_service.get_forward_returns(
-                data, match_date, filtered_horizons
+        with span("forward_returns"):
+            forward_returns = self._calculate_forward_returns(
+                data, positions, filtered_horizons
             )
-            # Filter out None values for Pydantic validation
-            forward_returns_filtered = {
-                k: v for k, v in forward_returns.items() if v is not None
-            }
-            instances.append(
-                PatternInstance(date=match_date, forward_returns=forward_returns_filtered)
+
+        # Summary statistics always cover the full match set
+        with span("stats"):
+            summary_stats = self._calculate_summary_statistics(
+                forward_returns, query.time_horizons
             )
 
-        # Calculate summary statistics
-        summary_stats = self._calculate_summary_statistics(
-            instances, query.time_horizons
-        )
+        # Only build instance objects for the dates being returned
+        with span("instances"):
+            selected, next_cursor = self._select_instances(match_dates, query)
+            instances = []
+            for i in selected:
+                # Drop horizons that run past the end of the data for Pydantic validation
+                forward_returns_filtered = {
+                    k: float(v[i]) for k, v in forward_returns.items() if not np.isnan(v[i])
+                }
+                instances.append(
+                    PatternInstance(
+                        date=match_dates[i], forward_returns=forward_returns_filtered
+                    )
+                )
 
         # Check if this is an indicator
         reference_ticker = None
         if data_service.is_indicator(query.ticker):
             reference_ticker = data_service.get_reference_ticker(query.ticker)
 
-        print(f"Creating response with {len(instances)} instances")
-        print(f"Total occurrences field: {len(instances)}")
-
         response = QueryResponse(
             ticker=query.ticker,
             condition=self._format_condition(query),
             reference_ticker=reference_ticker,
             instances=instances,
             summary_statistics=summary_stats,
-            total_occurrences=len(instances),
+            total_occurrences=len(positions),
+            next_cursor=next_cursor,
         )
 
-        print(f"Response created. total_occurrences = {response.total_occurrences}")
+        logger.debug(
+            "Query %s response: %d instances, %d total occurrences",
+            query.ticker, len(instances), response.total_occurrences,
+        )
         return response
 
     def _find_matching_dates(
         self, data: pd.DataFrame, query: QueryRequest
     ) -> List[datetime]:
         """Find all dates where the condition is met"""
+        mask = self._build_condition_mask(data, query)
+
+        # Return matching dates (exclude first row which has NaN)
+        matching_dates = data[mask].index.tolist()
+        return [d for d in matching_dates if pd.notna(d)]
+
+    def _build_condition_mask(
+        self, data: pd.DataFrame, query: QueryRequest
+    ) -> pd.Series:
+        """Build a boolean mask over data rows where the condition is met"""
         # Calculate percentage changes
         pct_changes = data_service.calculate_percentage_change(data)
 
@@ -121,24 +154,88 @@ class QueryService:
         else:
             raise ValueError(f"Unknown condition type: {query.condition_type}")
 
-        # Return matching dates (exclude first row which has NaN)
-        matching_dates = data[mask].index.tolist()
-        return [d for d in matching_dates if pd.notna(d)]
+        # Comparisons against NaN (first row of pct_change) are already False
+        return mask
+
+    def _calculate_forward_returns(
+        self, data: pd.DataFrame, positions: np.ndarray, horizons: Dict[str, int]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate forward returns for every matching row at once
+
+        Args:
+            data: DataFrame with 'Close' prices
+            positions: Integer row positions of the matching dates
+            horizons: Dictionary mapping horizon names to trading days
+
+        Returns:
+            Dictionary mapping horizon name to an array of percentage returns
+            aligned with positions (NaN where the horizon runs past the data)
+        """
+        close = data["Close"].to_numpy(dtype=float)
+        start_prices = close[positions]
+
+        returns = {}
+        for horizon_name, days in horizons.items():
+            future_idx = positions + days
+            in_range = future_idx < len(close)
+            future_prices = np.full(len(positions), np.nan)
+            future_prices[in_range] = close[future_idx[in_range]]
+            returns[horizon_name] = (future_prices - start_prices) / start_prices * 100
+        return returns
+
+    def _select_instances(
+        self, match_dates: pd.DatetimeIndex, query: QueryRequest
+    ) -> Tuple[np.ndarray, Optional[date]]:
+        """
+        Pick which matches to return as PatternInstance objects
+
+        Args:
+            match_dates: Dates of all matches, in ascending order
+            query: QueryRequest with include_instances, limit, cursor and sort
+
+        Returns:
+            Tuple of (indices into match_dates in response order, next page cursor)
+        """
+        order = np.arange(len(match_dates))
+        if query.sort == "date_desc":
+            order = order[::-1]
+
+        if query.include_instances == "all":
+            return order, None
+        if query.include_instances == "none":
+            return order[:0], None
+
+        limit = query.limit or DEFAULT_INSTANCE_LIMIT
+
+        if query.include_instances == "recent":
+            recent = order[-limit:] if query.sort == "date_asc" else order[:limit]
+            return recent, None
+
+        # Page mode: continue strictly after the cursor date in sort order
+        if query.cursor is not None:
+            cursor = pd.Timestamp(query.cursor)
+            dates = match_dates[order]
+            after = dates > cursor if query.sort == "date_asc" else dates < cursor
+            order = order[after]
+
+        page = order[:limit]
+        next_cursor = None
+        if len(order) > limit:
+            next_cursor = match_dates[page[-1]].date()
+        return page, next_cursor
 
     def _calculate_summary_statistics(
-        self, instances: List[PatternInstance], horizons: List[str]
+        self, forward_returns: Dict[str, np.ndarray], horizons: List[str]
     ) -> Dict[str, Dict[str, float]]:
         """Calculate summary statistics for each time horizon"""
         stats = {}
 
         for horizon in horizons:
-            returns = [
-                instance.forward_returns.get(horizon)
-                for instance in instances
-                if instance.forward_returns.get(horizon) is not None
-            ]
+            values = forward_returns.get(horizon)
+            returns = values[~np.isnan(values)] if values is not None else []
 
-            if returns:
+            if len(returns):
                 returns_series = pd.Series(returns)
                 stats[horizon] = {
                     "mean": float(returns_series.mean()),
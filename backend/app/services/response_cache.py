@@ -0,0 +1,203 @@
+"""
+On-disk cache of raw Yahoo chart API responses
+
+Responses are stored gzipped under a file name derived from the SHA-256 of the
+request key (symbol, period1, period2, interval), so identical requests map to
+the same entry regardless of which fetcher made them.
+
+Modes:
+    off        - always go to the network (default)
+    read_write - serve fresh entries from disk, fetch and store misses
+    replay     - serve only from disk, ignoring TTL; misses fail without any
+                 HTTP call
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+CACHE_MODES = ("off", "read_write", "replay")
+
+
+class ResponseCache:
+    """
+    Content-addressed response cache with TTL and size-based LRU eviction
+
+    Args:
+        directory: Directory holding cached responses
+        mode: One of CACHE_MODES
+        ttl: Seconds an entry is served in read_write mode (0 = never expires)
+        max_bytes: Total size on disk above which least recently used entries are evicted
+    """
+
+    def __init__(self, directory: str, mode: str = "off", ttl: int = 86400, max_bytes: int = 512 * 1024 * 1024):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    @classmethod
+    def from_settings(cls, mode: Optional[str] = None) -> "ResponseCache":
+        """Build a cache from the YAHOO_CACHE_* settings, optionally overriding the mode"""
+        return cls(
+            directory=settings.YAHOO_CACHE_DIR,
+            mode=mode or settings.YAHOO_CACHE_MODE,
+            ttl=settings.YAHOO_CACHE_TTL,
+            max_bytes=settings.YAHOO_CACHE_MAX_BYTES,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @staticmethod
+    def cache_key(symbol: str, period1: int, period2: int, interval: str) -> str:
+        """SHA-256 hex digest identifying one chart request"""
+        raw = json.dumps([symbol.upper(), int(period1), int(period2), interval], separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def get(self, symbol: str, period1: int, period2: int, interval: str = "1d") -> Optional[bytes]:
+        """
+        Get a cached response body
+
+        Returns:
+            Raw JSON bytes, or None on a miss (or an expired entry outside replay mode)
+        """
+        if not self.enabled:
+            return None
+        path = self._path(self.cache_key(symbol, period1, period2, interval))
+        try:
+            stat = os.stat(path)
+            if self.mode != "replay" and self.ttl and time.time() - stat.st_mtime > self.ttl:
+                with self._lock:
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                return None
+            with gzip.open(path, "rb") as f:
+                body = f.read()
+            # atime marks recency for LRU eviction; mtime keeps the write time for TTL
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (OSError, EOFError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return body
+
+    def put(self, symbol: str, period1: int, period2: int, interval: str, body: bytes) -> None:
+        """Store a response body, evicting old entries if the cache is over its size limit"""
+        if self.mode != "read_write":
+            return
+        path = self._path(self.cache_key(symbol, period1, period2, interval))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(body)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._stats["stores"] += 1
+            if self._total_bytes is not None:
+                self._total_bytes += os.path.getsize(path) - previous
+        self._evict_if_needed()
+
+    def fetch(
+        self,
+        symbol: str,
+        period1: int,
+        period2: int,
+        interval: str,
+        request: Callable[[], Optional[bytes]],
+    ) -> Optional[bytes]:
+        """
+        Serve a response from the cache, falling back to `request` unless replaying
+
+        Args:
+            symbol, period1, period2, interval: Request key
+            request: Performs the HTTP call and returns the body of a successful
+                     response, or None
+
+        Returns:
+            Raw JSON bytes, or None if unavailable
+        """
+        body = self.get(symbol, period1, period2, interval)
+        if body is not None or self.mode == "replay":
+            return body
+        body = request()
+        if body is not None:
+            self.put(symbol, period1, period2, interval, body)
+        return body
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json.gz"):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.stat(path)
+                    except OSError:
+                        continue
+
+    def _evict_if_needed(self) -> None:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(stat.st_size for _, stat in self._entries())
+            if self._total_bytes <= self.max_bytes:
+                return
+
+            # Least recently used first; stop once back under 90% of the limit
+            target = int(self.max_bytes * 0.9)
+            for path, stat in sorted(self._entries(), key=lambda entry: entry[1].st_atime):
+                if self._total_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._total_bytes -= stat.st_size
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Delete every cached response"""
+        with self._lock:
+            for path, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        """Hit/miss/eviction counters plus mode and size on disk"""
+        with self._lock:
+            if self._total_bytes is None and os.path.isdir(self.directory):
+                self._total_bytes = sum(stat.st_size for _, stat in self._entries())
+            return {"mode": self.mode, "bytes": self._total_bytes or 0, **self._stats}
+
+
+# Create singleton instance
+response_cache = ResponseCache.from_settings()
@@ -0,0 +1,250 @@
+"""
+Ticker metadata catalog
+
+Loads the `tickers` table into an in-memory snapshot indexed by symbol, type
+and exchange. Ingestion (the API fallback, init_poc and the market data
+updater) bumps the catalog version in `data_versions`; the application checks
+that single row periodically and reloads the snapshot only when it changed.
+
+With the catalog loaded, /api/tickers, suggestions and query validation are
+answered from memory: a symbol outside the catalog skips the database lookup,
+and is rejected outright when CATALOG_STRICT is enabled.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.core.config import settings
+
+CATALOG_VERSION_KEY = "tickers"
+
+# Upper-case letters and digits with optional ^ prefix and ./-/= separators (BRK.B, ^VIX, ES=F)
+_SYMBOL_RE = re.compile(r"^\^?[A-Z0-9][A-Z0-9.\-=]{0,9}$")
+
+
+class UnknownTickerError(ValueError):
+    """Raised when a symbol is malformed or (in strict mode) not in the catalog"""
+
+
+def is_valid_symbol(symbol: str) -> bool:
+    """Check that a symbol is well-formed (not that it exists)"""
+    return bool(_SYMBOL_RE.match(symbol))
+
+
+def bump_catalog_version(conn, dialect: str = "postgresql", key: str = CATALOG_VERSION_KEY) -> None:
+    """
+    Increment the catalog version after an ingestion run (caller commits)
+
+    Args:
+        conn: DB-API connection (psycopg2 or sqlite3)
+        dialect: "postgresql" or "sqlite" (selects the parameter style)
+        key: Version row to bump
+    """
+    param = "%s" if dialect == "postgresql" else "?"
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            f"""
+            INSERT INTO data_versions (name, version, updated_at)
+            VALUES ({param}, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (name) DO UPDATE SET
+                version = data_versions.version + 1,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (key,),
+        )
+    finally:
+        cur.close()
+
+
+@dataclass(frozen=True)
+class TickerInfo:
+    """Metadata for one stored ticker"""
+    symbol: str
+    name: Optional[str]
+    type: Optional[str]
+    exchange: Optional[str]
+    data_available: bool
+    earliest_date: Optional[date]
+    latest_date: Optional[date]
+    last_updated: Optional[date]
+
+    def to_dict(self) -> dict:
+        return {
+            "symbol": self.symbol,
+            "name": self.name,
+            "type": self.type,
+            "exchange": self.exchange,
+            "earliest_date": self.earliest_date,
+            "latest_date": self.latest_date,
+        }
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Read-only catalog contents; replaced as a whole on refresh"""
+    by_symbol: Mapping[str, TickerInfo]
+    by_type: Mapping[str, Tuple[str, ...]]
+    by_exchange: Mapping[str, Tuple[str, ...]]
+    version: Optional[int]
+
+    @classmethod
+    def build(cls, tickers: List[TickerInfo], version: Optional[int] = None) -> "CatalogSnapshot":
+        by_type: Dict[str, List[str]] = {}
+        by_exchange: Dict[str, List[str]] = {}
+        for info in sorted(tickers, key=lambda t: t.symbol):
+            by_type.setdefault(info.type or "unknown", []).append(info.symbol)
+            if info.exchange:
+                by_exchange.setdefault(info.exchange, []).append(info.symbol)
+        return cls(
+            by_symbol=MappingProxyType({info.symbol: info for info in tickers}),
+            by_type=MappingProxyType({k: tuple(v) for k, v in by_type.items()}),
+            by_exchange=MappingProxyType({k: tuple(v) for k, v in by_exchange.items()}),
+            version=version,
+        )
+
+
+class TickerCatalog:
+    """
+    In-memory catalog of the tickers table
+
+    Args:
+        session_factory: Callable returning a SQLAlchemy session (defaults to SessionLocal)
+        strict: Reject symbols missing from a loaded catalog (defaults to CATALOG_STRICT)
+    """
+
+    def __init__(self, session_factory=None, strict: Optional[bool] = None):
+        self._session_factory = session_factory
+        self.strict = settings.CATALOG_STRICT if strict is None else strict
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.database.models import SessionLocal
+            return SessionLocal()
+        return self._session_factory()
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._snapshot.version if self._snapshot else None
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot or CatalogSnapshot.build([])
+
+    def _read_version(self, db) -> Optional[int]:
+        from app.database.models import DataVersion
+        row = db.query(DataVersion.version).filter(DataVersion.name == CATALOG_VERSION_KEY).first()
+        return row[0] if row else 0
+
+    def load(self, force: bool = True) -> bool:
+        """
+        Reload the catalog from the tickers table
+
+        Args:
+            force: Reload even if the stored catalog version is unchanged
+
+        Returns:
+            True if the snapshot was replaced
+        """
+        from app.database.models import Ticker
+
+        db = self._session()
+        try:
+            version = self._read_version(db)
+            if not force and self._snapshot is not None and version == self._snapshot.version:
+                return False
+            rows = db.query(
+                Ticker.symbol, Ticker.name, Ticker.type, Ticker.exchange, Ticker.data_available,
+                Ticker.earliest_date, Ticker.latest_date, Ticker.last_updated,
+            ).all()
+        finally:
+            db.close()
+
+        tickers = [
+            TickerInfo(symbol, name, type_, exchange, bool(available) if available is not None else True,
+                       earliest, latest, updated)
+            for symbol, name, type_, exchange, available, earliest, latest, updated in rows
+        ]
+        with self._lock:
+            self._snapshot = CatalogSnapshot.build(tickers, version)
+        return True
+
+    def upsert(self, info: TickerInfo) -> None:
+        """Add or replace one entry in-process (e.g. right after the API fallback stored it)"""
+        with self._lock:
+            current = self._snapshot
+            if current is None:
+                # Not loaded yet; the first load picks the ticker up from the table
+                return
+            entries = dict(current.by_symbol)
+            entries[info.symbol] = info
+            self._snapshot = CatalogSnapshot.build(list(entries.values()), current.version)
+
+    def get(self, symbol: str) -> Optional[TickerInfo]:
+        return self.snapshot.by_symbol.get(symbol.upper())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.snapshot.by_symbol
+
+    def __len__(self) -> int:
+        return len(self.snapshot.by_symbol)
+
+    def tickers(self, type: Optional[str] = None, exchange: Optional[str] = None) -> List[TickerInfo]:
+        """
+        List catalog entries, optionally filtered by type and exchange
+
+        Args:
+            type: e.g. "stock", "etf", "index", "indicator"
+            exchange: Exchange name as stored in tickers.exchange
+
+        Returns:
+            Entries sorted by symbol
+        """
+        snapshot = self.snapshot
+        if type is not None:
+            symbols = snapshot.by_type.get(type, ())
+        else:
+            symbols = sorted(snapshot.by_symbol)
+        if exchange is not None:
+            on_exchange = set(snapshot.by_exchange.get(exchange, ()))
+            symbols = [s for s in symbols if s in on_exchange]
+        return [snapshot.by_symbol[s] for s in symbols]
+
+    def names(self) -> Dict[str, str]:
+        """Symbol -> stored name (falls back to the symbol)"""
+        return {symbol: info.name or symbol for symbol, info in self.snapshot.by_symbol.items()}
+
+    def validate(self, symbol: str) -> Optional[TickerInfo]:
+        """
+        Check a symbol before any database or provider call
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            The catalog entry, or None when the symbol is unknown but allowed
+
+        Raises:
+            UnknownTickerError: Malformed symbol, or unknown symbol in strict mode
+        """
+        symbol = symbol.strip().upper()
+        if not is_valid_symbol(symbol):
+            raise UnknownTickerError(f"Invalid ticker symbol: {symbol!r}")
+        info = self.get(symbol)
+        if info is None and self.strict and self.loaded:
+            raise UnknownTickerError(f"Unknown ticker: {symbol}")
+        return info
+
+
+# Create singleton instance
+ticker_catalog = TickerCatalog()
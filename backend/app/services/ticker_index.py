@@ -0,0 +1,255 @@
+"""
+In-memory ticker search index
+
+Built once from the `tickers` table (plus known company names) and swapped
+atomically on refresh, so suggestion lookups never touch the database:
+- a sorted symbol array answers prefix queries with binary search
+- an inverted index over company name tokens (with a sorted token array)
+  answers word-prefix queries such as "micro" -> Microsoft, Micron
+- a substring map over symbols keeps "query inside symbol" matches
+- a trigram index over symbols and name tokens catches typos ("NVIDA")
+
+Matches are ranked: exact symbol, symbol prefix, company name, symbol
+substring, then fuzzy. A popularity boost from queried tickers can lift a
+well-known company-name match (AAPL for "APP") above obscure prefix matches.
+"""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+# Base scores per match kind; popularity adds up to POPULARITY_WEIGHT
+SCORE_EXACT = 100.0
+SCORE_PREFIX = 70.0
+SCORE_NAME = 60.0
+SCORE_SUBSTRING = 45.0
+SCORE_FUZZY = 30.0
+POPULARITY_WEIGHT = 15.0
+MIN_SIMILARITY = 0.3  # Trigram Jaccard similarity needed for a fuzzy match
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a company name or query into upper-case alphanumeric tokens"""
+    return _TOKEN_RE.findall(text.upper())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a string padded with boundary markers ("AAPL" -> $AA, AAP, APL, PL$)"""
+    padded = f"${text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_range(sorted_values: List[str], prefix: str) -> Tuple[int, int]:
+    """Index range [lo, hi) of values starting with prefix in a sorted list"""
+    lo = bisect_left(sorted_values, prefix)
+    hi = bisect_left(sorted_values, prefix + "\uffff", lo)
+    return lo, hi
+
+
+class _Snapshot:
+    """Immutable index contents; replaced as a whole on refresh"""
+
+    __slots__ = ("symbols", "names", "tokens", "postings", "substrings", "grams", "gram_counts", "key_symbols")
+
+    def __init__(self, names: Dict[str, str]):
+        self.names = names
+        self.symbols = sorted(names)
+
+        postings: Dict[str, Set[str]] = {}
+        substrings: Dict[str, Set[str]] = {}
+        for symbol, name in names.items():
+            for token in tokenize(name):
+                postings.setdefault(token, set()).add(symbol)
+            for start in range(1, len(symbol)):
+                for end in range(start + 1, len(symbol) + 1):
+                    substrings.setdefault(symbol[start:end], set()).add(symbol)
+        self.postings = {token: tuple(sorted(symbols)) for token, symbols in postings.items()}
+        self.tokens = sorted(self.postings)
+        self.substrings = {key: tuple(sorted(symbols)) for key, symbols in substrings.items()}
+
+        # Fuzzy keys are symbols and name tokens of 3+ characters; each maps to
+        # the symbols it stands for
+        key_symbols: Dict[str, Set[str]] = {symbol: {symbol} for symbol in names}
+        for token, symbols in self.postings.items():
+            if len(token) >= 3:
+                key_symbols.setdefault(token, set()).update(symbols)
+        grams: Dict[str, List[str]] = {}
+        self.gram_counts: Dict[str, int] = {}
+        for key in key_symbols:
+            key_grams = trigrams(key)
+            self.gram_counts[key] = len(key_grams)
+            for gram in key_grams:
+                grams.setdefault(gram, []).append(key)
+        self.grams = {gram: tuple(keys) for gram, keys in grams.items()}
+        self.key_symbols = {key: tuple(symbols) for key, symbols in key_symbols.items()}
+
+
+class TickerIndex:
+    """
+    Ranked prefix, name and typo-tolerant search over ticker symbols
+
+    Args:
+        names: Initial symbol -> company name mapping
+        popularity: Initial symbol -> query count mapping
+    """
+
+    def __init__(self, names: Optional[Dict[str, str]] = None, popularity: Optional[Dict[str, float]] = None):
+        self._snapshot = _Snapshot(dict(names or {}))
+        self._popularity: Dict[str, float] = {}
+        self._max_popularity = 0.0
+        self._boosts: Optional[Dict[str, float]] = None
+        self._lock = threading.Lock()
+        if popularity:
+            self.set_popularity(popularity)
+
+    def __len__(self) -> int:
+        return len(self._snapshot.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._snapshot.names
+
+    def rebuild(self, names: Dict[str, str]) -> None:
+        """Replace the index contents; readers see either the old or the new snapshot"""
+        self._snapshot = _Snapshot(dict(names))
+
+    def add(self, entries: Dict[str, str]) -> None:
+        """Add or rename symbols (rebuilds the snapshot when anything changed)"""
+        current = self._snapshot.names
+        if all(current.get(symbol) == name for symbol, name in entries.items()):
+            return
+        self.rebuild({**current, **entries})
+
+    def name(self, symbol: str) -> Optional[str]:
+        return self._snapshot.names.get(symbol.upper())
+
+    def set_popularity(self, counts: Dict[str, float]) -> None:
+        """Replace popularity counts (e.g. aggregated from query logs)"""
+        popularity = {symbol.upper(): float(count) for symbol, count in counts.items() if count > 0}
+        with self._lock:
+            self._popularity = popularity
+            self._max_popularity = max(popularity.values(), default=0.0)
+            self._boosts = None
+
+    def record_query(self, symbol: str, weight: float = 1.0) -> None:
+        """Count a query for a symbol towards its popularity boost"""
+        symbol = symbol.upper()
+        with self._lock:
+            count = self._popularity.get(symbol, 0.0) + weight
+            self._popularity[symbol] = count
+            self._max_popularity = max(self._max_popularity, count)
+            self._boosts = None
+
+    def popularity(self) -> Dict[str, float]:
+        return dict(self._popularity)
+
+    def _boost_table(self) -> Dict[str, float]:
+        """Symbol -> popularity boost (log-scaled to POPULARITY_WEIGHT), cached until counts change"""
+        boosts = self._boosts
+        if boosts is None:
+            with self._lock:
+                scale = math.log1p(self._max_popularity) if self._max_popularity > 0 else 1.0
+                boosts = {s: POPULARITY_WEIGHT * math.log1p(c) / scale for s, c in self._popularity.items()}
+                self._boosts = boosts
+        return boosts
+
+    def _name_matches(self, snapshot: _Snapshot, words: List[str]) -> Iterable[str]:
+        """Symbols whose name has a token starting with every query word"""
+        matched: Optional[Set[str]] = None
+        for word in words:
+            lo, hi = prefix_range(snapshot.tokens, word)
+            symbols = {s for token in snapshot.tokens[lo:hi] for s in snapshot.postings[token]}
+            matched = symbols if matched is None else matched & symbols
+            if not matched:
+                return ()
+        return matched or ()
+
+    def _fuzzy_matches(self, snapshot: _Snapshot, query: str) -> Dict[str, float]:
+        """Symbol -> best trigram Jaccard similarity of the query to the symbol or a name token"""
+        query_grams = trigrams(query)
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for key in snapshot.grams.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        similarities: Dict[str, float] = {}
+        for key, common in shared.items():
+            similarity = common / (len(query_grams) + snapshot.gram_counts[key] - common)
+            if similarity < MIN_SIMILARITY:
+                continue
+            for symbol in snapshot.key_symbols[key]:
+                if similarity > similarities.get(symbol, 0.0):
+                    similarities[symbol] = similarity
+        return similarities
+
+    @staticmethod
+    def _kth_total(scores: Dict[str, float], boosts: Dict[str, float], k: int) -> float:
+        """k-th best score including popularity, or 0 with fewer than k candidates"""
+        if len(scores) < k:
+            return 0.0
+        totals = dict(scores)
+        for symbol, boost in boosts.items():
+            if symbol in totals:
+                totals[symbol] += boost
+        return heapq.nlargest(k, totals.values())[-1]
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """
+        Search symbols and company names
+
+        Args:
+            query: Search string (e.g., "AAP", "Tech", "NVIDA")
+            limit: Maximum number of results
+
+        Returns:
+            List of {"ticker", "name"} dicts, best match first
+        """
+        snapshot = self._snapshot
+        query = query.strip().upper()
+        if not query or limit <= 0:
+            return []
+
+        scores: Dict[str, float] = {}
+        boosts = self._boost_table()
+
+        def score(symbols: Iterable[str], base: float) -> None:
+            for symbol in symbols:
+                if base > scores.get(symbol, 0.0):
+                    scores[symbol] = base
+
+        if query in snapshot.names:
+            scores[query] = SCORE_EXACT
+        lo, hi = prefix_range(snapshot.symbols, query)
+        for symbol in snapshot.symbols[lo:hi]:
+            # Shorter completions first: "AA" ranks AAL above AAPL
+            score((symbol,), SCORE_PREFIX - min(len(symbol) - len(query), 5))
+        words = tokenize(query)
+        tiers = [(SCORE_SUBSTRING, lambda: snapshot.substrings.get(query, ()), lambda s: query in s[1:])]
+        if words:
+            tiers.insert(0, (
+                SCORE_NAME,
+                lambda: self._name_matches(snapshot, words),
+                lambda s: all(any(t.startswith(w) for t in tokenize(snapshot.names[s])) for w in words),
+            ))
+        for base, candidates, matches in tiers:
+            # Once `limit` results outscore this tier, only popular symbols can still
+            # make the cut, so short queries like "A" skip scanning broad tiers
+            threshold = self._kth_total(scores, boosts, limit)
+            if base + POPULARITY_WEIGHT < threshold:
+                continue
+            if base < threshold:
+                score([s for s in boosts if s in snapshot.names and matches(s)], base)
+            else:
+                score(candidates(), base)
+        if len(scores) < limit and len(query) >= 3:
+            for symbol, similarity in self._fuzzy_matches(snapshot, query).items():
+                score((symbol,), SCORE_FUZZY + 10.0 * similarity)
+
+        ranked = heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-(item[1] + boosts.get(item[0], 0.0)), item[0])
+        )
+        return [{"ticker": symbol, "name": snapshot.names[symbol]} for symbol, _ in ranked]
@@ -3,22 +3,20 @@ Direct Yahoo Finance API fetcher that bypasses yfinance library
 Uses the official Yahoo Finance API v8 endpoint
 """
 
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
 from typing import Optional, List
 
+import pandas as pd
+
+from app.services.chart_parser import parse_chart_result  # noqa: F401 (re-exported)
+from app.services.market_data_provider import MarketDataError, YahooChartProvider
+from app.services.response_cache import ResponseCache
+
 
 class YahooFinanceFetcher:
-    """Fetch data directly from Yahoo Finance API v8"""
+    """Fetch data directly from Yahoo Finance API v8 (blocking wrapper around YahooChartProvider)"""
 
-    def __init__(self):
-        self.base_url = "https://query2.finance.yahoo.com/v8/finance/chart/"
-        self.session = requests.Session()
-        # Use Windows User-Agent to avoid rate limiting
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+    def __init__(self, cache: Optional[ResponseCache] = None, provider: Optional[YahooChartProvider] = None):
+        self.provider = provider or YahooChartProvider(cache=cache)
 
     def fetch_data(
         self,
@@ -38,77 +36,18 @@ class YahooFinanceFetcher:
             DataFrame with OHLCV data or None if failed
         """
         try:
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = self._calculate_start_date(period)
-
-            # Build request parameters
-            params = {
-                "period1": int(start_date.timestamp()),
-                "period2": int(end_date.timestamp()),
-                "interval": interval,
-                "includePrePost": True,
-            }
-
-            # Make request
-            url = f"{self.base_url}{symbol}"
-            response = self.session.get(url, params=params, timeout=10)
-
-            if response.status_code != 200:
-                print(f"  ❌ HTTP {response.status_code} for {symbol}")
-                return None
-
-            # Parse JSON response
-            data = response.json()
-            result = data.get("chart", {}).get("result", [])
-
-            if not result:
-                print(f"  ❌ No data returned for {symbol}")
-                return None
-
-            # Extract data
-            meta = result[0].get("meta", {})
-            timestamps = result[0].get("timestamp", [])
-            indicators = result[0].get("indicators", {})
-            quote = indicators.get("quote", [{}])[0]
-
-            if not timestamps:
-                print(f"  ❌ No timestamps in response for {symbol}")
-                return None
-
-            # Build DataFrame
-            df_data = {
-                "Date": [datetime.fromtimestamp(ts) for ts in timestamps],
-                "Open": quote.get("open", []),
-                "High": quote.get("high", []),
-                "Low": quote.get("low", []),
-                "Close": quote.get("close", []),
-                "Volume": quote.get("volume", []),
-            }
-
-            # Create DataFrame
-            df = pd.DataFrame(df_data)
-            df.set_index("Date", inplace=True)
-
-            # Remove any rows with missing data
-            df.dropna(inplace=True)
-
-            # Convert to proper types
-            for col in ["Open", "High", "Low", "Close"]:
-                df[col] = df[col].astype(float)
-            df["Volume"] = df["Volume"].astype(int)
-
-            # Add Adj Close (same as Close for simplicity)
-            df["Adj Close"] = df["Close"]
-
-            print(f"  ✅ Fetched {len(df)} records for {symbol}")
-
-            return df
-
-        except Exception as e:
+            df = self.provider.fetch_history_sync(symbol, period=period, interval=interval)
+        except MarketDataError as e:
             print(f"  ❌ Error fetching {symbol}: {e}")
             return None
 
+        if df is None:
+            print(f"  ❌ No data returned for {symbol}")
+            return None
+
+        print(f"  ✅ Fetched {len(df)} records for {symbol}")
+        return df
+
     def fetch_multiple(
         self,
         symbols: List[str],
@@ -135,26 +74,6 @@ class YahooFinanceFetcher:
 
         return results
 
-    def _calculate_start_date(self, period: str) -> datetime:
-        """Calculate start date from period string"""
-        now = datetime.now()
-
-        period_map = {
-            "1d": timedelta(days=1),
-            "5d": timedelta(days=5),
-            "1mo": timedelta(days=30),
-            "3mo": timedelta(days=90),
-            "6mo": timedelta(days=180),
-            "1y": timedelta(days=365),
-            "5y": timedelta(days=365*5),
-            "max": timedelta(days=365*50),  # 50 years
-        }
-
-        if period in period_map:
-            return now - period_map[period]
-        else:
-            return now - timedelta(days=365)  # Default to 1 year
-
 
 # Create singleton instance
 yahoo_fetcher = YahooFinanceFetcher()
@@ -2,21 +2,20 @@
 Service for fetching market data from Yahoo Finance with proper headers
 """
 
-import yfinance as yf
 import pandas as pd
-import requests
 from typing import Optional
 
+from app.services.market_data_provider import MarketDataError, YFinanceProvider
+
+# One provider (and so one HTTP session) for every call
+_provider = YFinanceProvider()
+
 
 def create_yfinance_session():
     """
-    Create a requests session with headers that avoid Yahoo Finance rate limiting
+    Get the shared requests session with headers that avoid Yahoo Finance rate limiting
     """
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    })
-    return session
+    return _provider.session
 
 
 def fetch_ticker_data(ticker: str, period: str = "1y") -> Optional[pd.DataFrame]:
@@ -31,28 +30,18 @@ def fetch_ticker_data(ticker: str, period: str = "1y") -> Optional[pd.DataFrame]
         DataFrame with OHLCV data or None if failed
     """
     try:
-        # Create session with proper headers
-        session = create_yfinance_session()
-
-        # Fetch data using yfinance with custom session
-        data = yf.download(
-            ticker,
-            period=period,
-            progress=False,
-            session=session
-        )
-
-        if data.empty:
-            print(f"  ⚠️  No data returned for {ticker}")
-            return None
-
-        print(f"  ✅ Fetched {len(data)} records for {ticker}")
-        return data
-
-    except Exception as e:
+        data = _provider.fetch_history_sync(ticker, period=period)
+    except MarketDataError as e:
         print(f"  ❌ Error fetching {ticker}: {e}")
         return None
 
+    if data is None:
+        print(f"  ⚠️  No data returned for {ticker}")
+        return None
+
+    print(f"  ✅ Fetched {len(data)} records for {ticker}")
+    return data
+
 
 def fetch_multiple_tickers(tickers: list, period: str = "1y") -> dict:
     """
@@ -0,0 +1,190 @@
+"""
+Bulk loading of rows into PostgreSQL or SQLite with a single upsert
+
+PostgreSQL: rows are streamed into a temporary staging table with COPY and
+merged into the target with one INSERT ... SELECT ... ON CONFLICT statement.
+SQLite: rows are inserted with executemany and an ON CONFLICT clause.
+
+Both paths work on a DB-API connection (psycopg2, sqlite3, or the connection
+returned by SQLAlchemy's engine.raw_connection()) in transaction mode, and
+leave committing to the caller unless commit=True.
+"""
+
+import csv
+import io
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+Rows = Union[pd.DataFrame, Iterable[Sequence]]
+
+
+@dataclass
+class BulkLoadResult:
+    """
+    Row counts and timing of one bulk load
+
+    `rows` counts rows actually inserted or updated (rows skipped by DO NOTHING
+    are not included); `submitted` counts the rows passed in.
+    """
+    table: str
+    rows: int
+    seconds: float
+    submitted: int = 0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def __str__(self) -> str:
+        return (f"{self.table}: {self.rows:,} of {self.submitted:,} rows written in {self.seconds:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/s)")
+
+
+def dialect_of(engine_or_url) -> str:
+    """
+    Get the bulk-load dialect ("postgresql" or "sqlite") for an engine or URL
+
+    Args:
+        engine_or_url: SQLAlchemy Engine or database URL string
+    """
+    name = engine_or_url.dialect.name if hasattr(engine_or_url, "dialect") else str(engine_or_url)
+    return "postgresql" if name.startswith("postgres") else "sqlite"
+
+
+def _conflict_clause(
+    dialect: str,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> str:
+    keys = ", ".join(conflict_columns)
+    if not update_columns:
+        return f"ON CONFLICT ({keys}) DO NOTHING"
+    excluded = "EXCLUDED" if dialect == "postgresql" else "excluded"
+    assignments = ", ".join(f"{col} = {excluded}.{col}" for col in update_columns)
+    return f"ON CONFLICT ({keys}) DO UPDATE SET {assignments}"
+
+
+def _frame_to_csv(frame: pd.DataFrame) -> io.StringIO:
+    buffer = io.StringIO()
+    # Missing values become unquoted empty fields, which COPY reads as NULL
+    frame.to_csv(buffer, header=False, index=False, na_rep="", date_format="%Y-%m-%d")
+    buffer.seek(0)
+    return buffer
+
+
+def _rows_to_csv(rows: Iterable[Sequence]) -> Tuple[io.StringIO, int]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        count += 1
+    buffer.seek(0)
+    return buffer, count
+
+
+def _frame_to_tuples(frame: pd.DataFrame) -> List[tuple]:
+    # Dates are stored as YYYY-MM-DD text, matching the COPY path
+    frame = frame.copy()
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.strftime("%Y-%m-%d")
+    # object dtype lets NaN/NaT be replaced by None for the DB-API driver
+    cleaned = frame.astype(object).where(frame.notna(), None)
+    return list(cleaned.itertuples(index=False, name=None))
+
+
+def bulk_upsert(
+    conn,
+    dialect: str,
+    table: str,
+    columns: Sequence[str],
+    rows: Rows,
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    commit: bool = False,
+) -> BulkLoadResult:
+    """
+    Insert rows into a table, merging on a unique key in one statement
+
+    Args:
+        conn: DB-API connection
+        dialect: "postgresql" or "sqlite" (see dialect_of)
+        table: Target table name
+        columns: Target columns, in the order of the row values / frame columns
+        rows: DataFrame with exactly `columns`, or an iterable of tuples.
+              Integer columns with missing values should use pandas' Int64 dtype
+        conflict_columns: Unique key columns to merge on
+        update_columns: Columns to overwrite on conflict; None updates every
+                        non-key column, an empty list means DO NOTHING
+        commit: Commit the connection after loading
+
+    Rows sharing a key within one call are merged like sequential inserts:
+    with DO UPDATE the last row wins, with DO NOTHING the first one does.
+
+    Returns:
+        BulkLoadResult with the rows written and submitted, and elapsed time
+    """
+    started = time.perf_counter()
+    if update_columns is None:
+        update_columns = [col for col in columns if col not in conflict_columns]
+    column_list = ", ".join(columns)
+    conflict = _conflict_clause(dialect, conflict_columns, update_columns)
+
+    written = 0
+    cursor = conn.cursor()
+    try:
+        if dialect == "postgresql":
+            if isinstance(rows, pd.DataFrame):
+                buffer, count = _frame_to_csv(rows), len(rows)
+            else:
+                buffer, count = _rows_to_csv(rows)
+
+            if count:
+                stage = f"_stage_{table}"
+                # Column types only; ON COMMIT DROP cleans up with the transaction
+                cursor.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DROP AS "
+                    f"SELECT {column_list} FROM {table} WITH NO DATA"
+                )
+                cursor.execute(f"TRUNCATE {stage}")
+                cursor.copy_expert(
+                    f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+                # DISTINCT ON keeps one row per key so DO UPDATE never hits a row
+                # twice. The stage is truncated and filled by COPY, so ctid follows
+                # input order: keep the last row when updating, the first otherwise
+                keys = ", ".join(conflict_columns)
+                order = "DESC" if update_columns else "ASC"
+                cursor.execute(
+                    f"INSERT INTO {table} ({column_list}) "
+                    f"SELECT DISTINCT ON ({keys}) {column_list} FROM {stage} "
+                    f"ORDER BY {keys}, ctid {order} {conflict}"
+                )
+                written = cursor.rowcount
+        else:
+            records = _frame_to_tuples(rows) if isinstance(rows, pd.DataFrame) else [tuple(r) for r in rows]
+            count = len(records)
+            if count:
+                placeholders = ", ".join("?" for _ in columns)
+                cursor.executemany(
+                    f"INSERT INTO {table} ({column_list}) VALUES ({placeholders}) {conflict}",
+                    records,
+                )
+                # sqlite3 sums the changes of every executemany row
+                written = cursor.rowcount
+    finally:
+        cursor.close()
+
+    if commit:
+        conn.commit()
+
+    return BulkLoadResult(
+        table=table,
+        rows=written if written >= 0 else count,
+        seconds=time.perf_counter() - started,
+        submitted=count,
+    )
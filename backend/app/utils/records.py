@@ -0,0 +1,92 @@
+"""
+Insert-ready records built from DataFrame columns
+
+Rows are assembled by zipping whole column arrays instead of looking up each
+cell, so preparing N rows costs a handful of vector operations plus one
+tuple per row. The tuples can be passed straight to bulk_upsert.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BIGINT_MAX = np.iinfo(np.int64).max
+# Largest float64 below 2**63; anything at or above 2**63 is capped to BIGINT_MAX
+_BIGINT_MAX_FLOAT = float(np.nextafter(2.0 ** 63, 0))
+
+
+def nullable(values: np.ndarray, missing: Optional[np.ndarray] = None) -> List:
+    """
+    Convert an array to a list of Python values with None where data is missing
+
+    Args:
+        values: 1-D array
+        missing: Boolean mask of missing entries; defaults to NaN positions
+    """
+    out = values.astype(object)
+    if missing is None:
+        missing = np.isnan(values) if values.dtype.kind == "f" else np.zeros(len(values), dtype=bool)
+    out[missing] = None
+    return out.tolist()
+
+
+def clip_volume(volume: np.ndarray) -> List[Optional[int]]:
+    """Cast volumes to ints capped at BIGINT max, with None for missing values"""
+    volume = np.asarray(volume, dtype=float)
+    missing = np.isnan(volume)
+    capped = np.clip(np.where(missing, 0.0, volume), None, _BIGINT_MAX_FLOAT).astype(np.int64)
+    capped[volume >= 2.0 ** 63] = BIGINT_MAX
+    return nullable(capped, missing)
+
+
+def date_strings(index: pd.Index) -> np.ndarray:
+    """Format a DatetimeIndex as YYYY-MM-DD strings"""
+    return np.asarray(pd.DatetimeIndex(index).strftime("%Y-%m-%d"), dtype=object)
+
+
+def price_records(ticker: str, data: pd.DataFrame) -> List[Tuple]:
+    """
+    Build historical_prices rows from an OHLCV frame
+
+    Args:
+        ticker: Ticker symbol
+        data: Frame indexed by date with Open, High, Low, Close, Volume and
+              optionally Adj Close (Close is used when it is missing)
+
+    Returns:
+        List of tuples: (ticker, date, open, high, low, close, volume, adjusted_close)
+    """
+    if data.empty:
+        return []
+    adj_col = "Adj Close" if "Adj Close" in data.columns else "Close"
+    columns = [nullable(data[col].to_numpy(dtype=float)) for col in ("Open", "High", "Low", "Close")]
+    return list(zip(
+        [ticker] * len(data),
+        date_strings(data.index),
+        *columns,
+        clip_volume(data["Volume"].to_numpy(dtype=float)),
+        nullable(data[adj_col].to_numpy(dtype=float)),
+    ))
+
+
+def return_records(ticker: str, returns: pd.Series) -> List[Tuple]:
+    """
+    Build daily_returns rows, skipping missing returns (e.g. the first day)
+
+    Args:
+        ticker: Ticker symbol
+        returns: Percentage returns indexed by date
+
+    Returns:
+        List of tuples: (ticker, date, return_pct)
+    """
+    values = returns.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    if not present.any():
+        return []
+    return list(zip(
+        [ticker] * int(present.sum()),
+        date_strings(returns.index[present]),
+        values[present].tolist(),
+    ))
@@ -0,0 +1,98 @@
+"""
+Incremental maintenance of derived daily_returns rows
+
+Returns for newly fetched bars are chained from the last close already stored
+for the ticker, so the first new day gets its return and an incremental
+update produces exactly what a full recompute over the whole history would.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Absolute difference (in percentage points) tolerated by verification
+DEFAULT_TOLERANCE = 1e-9
+
+
+@dataclass
+class DerivationSeed:
+    """
+    State carried over from the stored history into an incremental update
+
+    Rolling-window derivations would add their trailing state here alongside
+    the last close.
+    """
+    last_date: date
+    last_close: float
+
+
+def incremental_returns(closes: pd.Series, seed: Optional[DerivationSeed] = None) -> pd.Series:
+    """
+    Compute daily percentage returns for a slice of closes
+
+    Args:
+        closes: Close prices indexed by date, sorted ascending
+        seed: Last stored close before the slice; None computes from scratch,
+              leaving the first return NaN
+
+    Returns:
+        Series of returns in percent, aligned with `closes`
+    """
+    values = closes.to_numpy(dtype=float)
+    previous = np.empty_like(values)
+    if len(values):
+        previous[0] = seed.last_close if seed is not None else np.nan
+        previous[1:] = values[:-1]
+    return pd.Series((values / previous - 1.0) * 100, index=closes.index, name="return_pct")
+
+
+@dataclass
+class ReturnsDiff:
+    """Differences between stored returns and a full recompute for one ticker"""
+    ticker: str
+    missing: List[date] = field(default_factory=list)
+    extra: List[date] = field(default_factory=list)
+    mismatched: List[date] = field(default_factory=list)
+    max_abs_error: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.extra or self.mismatched)
+
+    def __str__(self) -> str:
+        return (f"{self.ticker}: {len(self.missing)} missing, {len(self.extra)} extra, "
+                f"{len(self.mismatched)} mismatched (max error {self.max_abs_error:.3g})")
+
+
+def diff_returns(
+    ticker: str,
+    stored: pd.Series,
+    expected: pd.Series,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> ReturnsDiff:
+    """
+    Compare stored returns against freshly computed ones
+
+    Args:
+        ticker: Ticker symbol, for reporting
+        stored: return_pct values from daily_returns, indexed by date
+        expected: Returns from incremental_returns over the full close history
+        tolerance: Largest absolute difference treated as equal
+
+    Returns:
+        ReturnsDiff listing missing, extra and mismatched dates
+    """
+    expected = expected.dropna()
+    stored = stored.dropna()
+    diff = ReturnsDiff(ticker=ticker)
+    diff.missing = list(expected.index.difference(stored.index))
+    diff.extra = list(stored.index.difference(expected.index))
+
+    common = expected.index.intersection(stored.index)
+    errors = (stored.loc[common] - expected.loc[common]).abs()
+    diff.mismatched = list(errors.index[errors.to_numpy() > tolerance])
+    diff.max_abs_error = float(errors.max()) if len(errors) else 0.0
+    return diff
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark chart JSON parsing on max-history payloads.
+
+Compares the previous list-based parser (datetime.fromtimestamp per bar,
+DataFrame from Python lists, dropna, per-column astype) with the vectorized
+parse_chart_result. Payloads are read from a response cache directory when
+one is given (recorded with YAHOO_CACHE_MODE=read_write), otherwise generated
+by the stub chart server for a 50-year window.
+
+Usage:
+    python scripts/benchmark_chart_parsing.py [--cache-dir data/yahoo_cache]
+        [--symbols 20] [--years 50] [--repeat 5]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from stub_yahoo_server import build_chart_payload
+from app.services.chart_parser import parse_chart_result
+
+
+def legacy_parse(result: dict) -> pd.DataFrame:
+    """The parser fetch_data used before vectorization"""
+    timestamps = result.get("timestamp", [])
+    quote = result.get("indicators", {}).get("quote", [{}])[0]
+    df = pd.DataFrame({
+        "Date": [datetime.fromtimestamp(ts) for ts in timestamps],
+        "Open": quote.get("open", []),
+        "High": quote.get("high", []),
+        "Low": quote.get("low", []),
+        "Close": quote.get("close", []),
+        "Volume": quote.get("volume", []),
+    })
+    df.set_index("Date", inplace=True)
+    df.dropna(inplace=True)
+    for col in ["Open", "High", "Low", "Close"]:
+        df[col] = df[col].astype(float)
+    df["Volume"] = df["Volume"].astype(int)
+    df["Adj Close"] = df["Close"]
+    return df
+
+
+def load_recorded(cache_dir: str):
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(cache_dir, "*", "*.json.gz"))):
+        with gzip.open(path, "rb") as f:
+            result = (json.loads(f.read()).get("chart", {}).get("result") or [None])[0]
+        if result and result.get("timestamp"):
+            payloads.append(result)
+    return payloads
+
+
+def generate(symbols: int, years: int):
+    period2 = int(datetime.now(timezone.utc).timestamp())
+    period1 = int((datetime.now(timezone.utc) - timedelta(days=365 * years)).timestamp())
+    payloads = []
+    for i in range(symbols):
+        result = build_chart_payload(f"T{i:03d}", period1, period2)["chart"]["result"][0]
+        # Real max-history payloads contain null bars; blank every 97th close
+        result["indicators"]["quote"][0]["close"][::97] = [None] * len(result["timestamp"][::97])
+        payloads.append(result)
+    return payloads
+
+
+def bench(parse, payloads, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for result in payloads:
+            parse(result)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart JSON parsing")
+    parser.add_argument("--cache-dir", help="Response cache directory with recorded payloads")
+    parser.add_argument("--symbols", type=int, default=20, help="Generated payloads")
+    parser.add_argument("--years", type=int, default=50, help="History per generated payload")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.cache_dir:
+        payloads = load_recorded(args.cache_dir)
+        source = f"recorded payloads from {args.cache_dir}"
+    else:
+        payloads = generate(args.symbols, args.years)
+        source = f"generated {args.years}-year payloads"
+    if not payloads:
+        print("No payloads to parse")
+        sys.exit(1)
+
+    bars = sum(len(p["timestamp"]) for p in payloads)
+    print(f"{len(payloads)} {source}, {bars:,} bars")
+
+    # Same rows and OHLCV values (the new index is the exchange trading date,
+    # and Adj Close comes from adjclose when the payload has it)
+    for result in payloads:
+        old, new = legacy_parse(result), parse_chart_result(result)
+        assert len(old) == len(new)
+        assert (old.iloc[:, :5].to_numpy() == new.iloc[:, :5].to_numpy()).all()
+
+    legacy = bench(legacy_parse, payloads, args.repeat)
+    vectorized = bench(parse_chart_result, payloads, args.repeat)
+    print(f"{'parser':>12} {'total ms':>10} {'ms/payload':>11} {'bars/s':>12}")
+    for name, seconds in (("legacy", legacy), ("vectorized", vectorized)):
+        print(f"{name:>12} {seconds * 1000:>10.1f} {seconds * 1000 / len(payloads):>11.2f} "
+              f"{bars / seconds:>12,.0f}")
+    print(f"speedup: {legacy / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
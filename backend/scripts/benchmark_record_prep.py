@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark insert record preparation for historical_prices and daily_returns.
+
+Compares the previous per-row builders (.loc[idx] per column per row) with the
+column-array builders in app.utils.records on a synthetic OHLCV frame, and
+checks both produce identical tuples.
+
+Usage:
+    python scripts/benchmark_record_prep.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.records import price_records, return_records
+
+
+def legacy_price_records(ticker: str, data: pd.DataFrame):
+    """The price record builder update_market_data used before vectorization"""
+    records = []
+    for idx in data.index:
+        volume_val = data['Volume'].loc[idx]
+        if pd.isna(volume_val):
+            volume_int = None
+        elif volume_val > 9223372036854775807:
+            volume_int = 9223372036854775807
+        else:
+            volume_int = int(volume_val)
+        adj_close = float(data['Adj Close'].loc[idx]) if 'Adj Close' in data.columns else float(data['Close'].loc[idx])
+        records.append((
+            ticker,
+            idx.strftime('%Y-%m-%d'),
+            float(data['Open'].loc[idx]),
+            float(data['High'].loc[idx]),
+            float(data['Low'].loc[idx]),
+            float(data['Close'].loc[idx]),
+            volume_int,
+            adj_close,
+        ))
+    return records
+
+
+def legacy_return_records(ticker: str, returns: pd.Series):
+    """The return record builder update_market_data used before vectorization"""
+    records = []
+    for idx in returns.index:
+        daily_ret = returns.loc[idx]
+        if pd.isna(daily_ret):
+            continue
+        records.append((ticker, idx.strftime('%Y-%m-%d'), float(daily_ret)))
+    return records
+
+
+def synthetic_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    index = pd.bdate_range("1980-01-01", periods=rows)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    data = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.002, rows)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000, 10_000_000, rows).astype(float),
+        "Adj Close": close,
+    }, index=index)
+    # A few missing volumes so the None path is exercised
+    data.iloc[::500, data.columns.get_loc("Volume")] = np.nan
+    return data
+
+
+def bench(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark insert record preparation")
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows in the synthetic frame")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic_frame(args.rows)
+    returns = data["Close"].pct_change() * 100
+
+    assert legacy_price_records("SPY", data) == price_records("SPY", data)
+    assert legacy_return_records("SPY", returns) == return_records("SPY", returns)
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    print(f"{'stage':>8} {'builder':>10} {'ms':>10} {'rows/s':>12}")
+    for stage, legacy, vectorized in (
+        ("prices", lambda: legacy_price_records("SPY", data), lambda: price_records("SPY", data)),
+        ("returns", lambda: legacy_return_records("SPY", returns), lambda: return_records("SPY", returns)),
+    ):
+        old, new = bench(legacy, args.repeat), bench(vectorized, args.repeat)
+        for name, seconds in (("legacy", old), ("vectorized", new)):
+            print(f"{stage:>8} {name:>10} {seconds * 1000:>10.1f} {args.rows / seconds:>12,.0f}")
+        print(f"{stage:>8} speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
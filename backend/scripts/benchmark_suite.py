@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+End-to-end query benchmark suite over a synthetic database.
+
+Times each stage of a pattern query on a sample of tickers:
+
+    db_load              DataService._get_from_database
+    find_matching_dates  QueryService._find_matching_dates
+    forward_returns      QueryService._calculate_forward_returns
+    summary_stats        QueryService._calculate_summary_statistics
+    serialization        QueryResponse -> JSON
+    api_query_cold       POST /api/query with DataService's memory cache cleared
+    api_query_warm       POST /api/query served from the memory cache
+
+Results are written to JSON and compared against a stored baseline; the run
+exits with status 1 when a stage's median is slower than the baseline by more
+than --tolerance. Populate the database first with synthetic_market_data.py
+(or pass --generate).
+
+Usage:
+    python scripts/benchmark_suite.py --database-url sqlite:///./data/benchmark.db
+        [--generate] [--sample 20] [--repeat 5] [--output benchmark_results.json]
+        [--baseline scripts/benchmark_baseline.json] [--tolerance 0.25] [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+STAGES = (
+    "db_load",
+    "find_matching_dates",
+    "forward_returns",
+    "summary_stats",
+    "serialization",
+    "api_query_cold",
+    "api_query_warm",
+)
+
+# A broad and a selective condition, each over every horizon
+QUERIES = [
+    {"condition_type": "percentage_change", "operator": "lte", "threshold": -2.0},
+    {"condition_type": "percentage_change", "operator": "gte", "threshold": 5.0},
+]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Median / p95 / min in milliseconds"""
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "runs": len(ordered),
+    }
+
+
+def timed(samples: Dict[str, List[float]], stage: str, fn: Callable):
+    started = time.perf_counter()
+    result = fn()
+    samples[stage].append(time.perf_counter() - started)
+    return result
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> List[dict]:
+    """
+    Compare stage medians against a baseline run
+
+    Args:
+        results: Output of run_suite
+        baseline: A previous run_suite output
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% slower)
+
+    Returns:
+        One row per stage present in both runs: stage, baseline_ms, current_ms,
+        ratio and regressed
+    """
+    rows = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if previous is None:
+            continue
+        ratio = current["median_ms"] / previous["median_ms"] if previous["median_ms"] else 1.0
+        rows.append({
+            "stage": stage,
+            "baseline_ms": previous["median_ms"],
+            "current_ms": current["median_ms"],
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1 + tolerance,
+        })
+    return rows
+
+
+def run_suite(tickers: List[str], repeat: int) -> dict:
+    """Time every stage for each sampled ticker and query (app modules imported here)"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.models.schemas import QueryRequest
+    from app.services.data_service import data_service
+    from app.services.query_service import query_service
+
+    horizons = {"1d": 1, "1w": 5, "1m": 21, "1y": 252}
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    client = TestClient(app)
+    rows = 0
+
+    for ticker in tickers:
+        for params in QUERIES:
+            query = QueryRequest(ticker=ticker, **params)
+            body = query.model_dump(mode="json")
+            for _ in range(repeat):
+                data = timed(samples, "db_load", lambda: data_service._get_from_database(ticker))
+                if data is None:
+                    raise SystemExit(f"❌ {ticker} is not in the database; run synthetic_market_data.py first")
+                timed(samples, "find_matching_dates", lambda: query_service._find_matching_dates(data, query))
+
+                mask = query_service._build_condition_mask(data, query)
+                positions = mask.to_numpy(dtype=bool, na_value=False).nonzero()[0]
+                forward = timed(samples, "forward_returns",
+                                lambda: query_service._calculate_forward_returns(data, positions, horizons))
+                timed(samples, "summary_stats",
+                      lambda: query_service._calculate_summary_statistics(forward, query.time_horizons))
+
+                data_service.cache.clear()
+                response = timed(samples, "api_query_cold", lambda: client.post("/api/query", json=body))
+                if response.status_code != 200:
+                    raise SystemExit(f"❌ /api/query {ticker} returned {response.status_code}: {response.text[:200]}")
+                timed(samples, "api_query_warm", lambda: client.post("/api/query", json=body))
+
+                result = asyncio.run(query_service.execute_query(query))
+                timed(samples, "serialization", result.model_dump_json)
+            rows += len(data)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tickers": len(tickers),
+            "rows_per_ticker": round(rows / (len(tickers) * len(QUERIES))),
+            "repeat": repeat,
+        },
+        "stages": {stage: summarize(values) for stage, values in samples.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query stages over a synthetic database")
+    parser.add_argument("--database-url", default="sqlite:///./data/benchmark.db")
+    parser.add_argument("--generate", action="store_true", help="Populate the database first")
+    parser.add_argument("--tickers", type=int, default=518, help="Tickers to generate with --generate")
+    parser.add_argument("--years", type=int, default=17, help="Years per ticker with --generate")
+    parser.add_argument("--sample", type=int, default=20, help="Tickers benchmarked")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per ticker and query")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    args = parser.parse_args()
+
+    # Settings are read when the app is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("ENABLE_RATE_LIMIT", "false")
+    os.environ.setdefault("NEGATIVE_CACHE_PATH", "")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from synthetic_market_data import populate, synthetic_symbols
+
+    symbols = synthetic_symbols(args.tickers)
+    if args.generate:
+        from sqlalchemy import create_engine
+        from app.database.models import Base
+
+        engine = create_engine(args.database_url)
+        Base.metadata.create_all(engine)
+        print(f"🧪 Generating {len(symbols)} tickers x {args.years} years...")
+        rows = populate(engine, symbols, args.years)
+        print(f"✅ Wrote {rows:,} rows")
+        engine.dispose()
+
+    # Spread the sample across the universe
+    step = max(1, len(symbols) // args.sample)
+    tickers = symbols[::step][:args.sample]
+    print(f"⏱️  Benchmarking {len(tickers)} tickers x {len(QUERIES)} queries x {args.repeat} runs")
+    results = run_suite(tickers, args.repeat)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n{'stage':<22} {'median ms':>10} {'p95 ms':>10}")
+    for stage, stats in results["stages"].items():
+        print(f"{stage:<22} {stats['median_ms']:>10.3f} {stats['p95_ms']:>10.3f}")
+    print(f"\n📄 Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline}; run with --update-baseline to store one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("rows_per_ticker") != results["meta"]["rows_per_ticker"]:
+        print("⚠️  Baseline was recorded at a different data scale; ratios are indicative only")
+
+    print(f"\n{'stage':<22} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    comparison = compare_to_baseline(results, baseline, args.tolerance)
+    for row in comparison:
+        mark = "❌" if row["regressed"] else "✅"
+        print(f"{row['stage']:<22} {row['baseline_ms']:>10.3f} {row['current_ms']:>10.3f} {row['ratio']:>7.2f} {mark}")
+    regressed = [row["stage"] for row in comparison if row["regressed"]]
+    if regressed:
+        print(f"\n❌ Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+    print(f"\n✅ Every stage within {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
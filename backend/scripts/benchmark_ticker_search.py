@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark ranked ticker search latency.
+
+Builds the search index from the known company names (hard-coded names plus
+data/SPY-components.csv) padded with synthetic symbols up to --symbols, then
+times typical keystroke queries: short prefixes, company words and typos.
+
+Usage:
+    python scripts/benchmark_ticker_search.py [--symbols 5000] [--repeat 2000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.constituents_service import constituents_service
+from app.services.ticker_index import TickerIndex
+
+QUERIES = ["A", "AP", "APP", "AAPL", "micro", "bank of", "tech", "NVIDA", "microsft", "ZZZZ"]
+
+
+def synthetic_names(count: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    names = dict(constituents_service.ticker_names)
+    words = ["Holdings", "Group", "Technologies", "Energy", "Financial", "Systems", "Capital",
+             "Industries", "Partners", "Therapeutics", "Resources", "Brands"]
+    while len(names) < count:
+        symbol = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+        stem = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+        names.setdefault(symbol, f"{stem} {rng.choice(words)}")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ticker search latency")
+    parser.add_argument("--symbols", type=int, default=5000, help="Symbols in the index")
+    parser.add_argument("--repeat", type=int, default=2000, help="Searches per query")
+    args = parser.parse_args()
+
+    names = synthetic_names(args.symbols)
+    started = time.perf_counter()
+    index = TickerIndex(names, popularity={"AAPL": 500, "MSFT": 400, "NVDA": 450})
+    print(f"Built index over {len(index):,} symbols in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    print(f"{'query':>10} {'results':>8} {'top':>6} {'mean µs':>9} {'max µs':>9}")
+    worst = 0.0
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results = index.search(query)
+            timings.append(time.perf_counter() - started)
+        top = results[0]["ticker"] if results else "-"
+        mean, peak = sum(timings) / len(timings) * 1e6, max(timings) * 1e6
+        worst = max(worst, mean)
+        print(f"{query:>10} {len(results):>8} {top:>6} {mean:>9.1f} {peak:>9.1f}")
+
+    print(f"slowest mean: {worst:.1f} µs ({'under' if worst < 1000 else 'OVER'} the 1 ms budget)")
+
+
+if __name__ == "__main__":
+    main()
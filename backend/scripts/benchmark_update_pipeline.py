@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the market data update pipeline offline.
+
+Runs the fetch -> transform -> write pipeline from update_market_data.py
+through YahooChartProvider against the local stub chart server, with a writer that only simulates
+database latency, and reports ticker throughput for each worker count.
+
+Usage:
+    python scripts/benchmark_update_pipeline.py [--tickers 518] [--latency 0.2]
+        [--write-latency 0.01] [--rate 50] [--workers 1 4 8 16]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stub_yahoo_server import StubYahooServer
+from update_market_data import (
+    PreparedUpdate,
+    TokenBucket,
+    UpdateTask,
+    YahooChartProvider,
+    run_pipeline,
+)
+from app.services.response_cache import ResponseCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the update pipeline against a stub server")
+    parser.add_argument("--tickers", type=int, default=518)
+    parser.add_argument("--days", type=int, default=7, help="Days of data per ticker")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub server latency (s)")
+    parser.add_argument("--write-latency", type=float, default=0.01, help="Simulated DB write time (s)")
+    parser.add_argument("--rate", type=float, default=50.0, help="Token bucket rate (req/s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    end_date = datetime.now().date() - timedelta(days=1)
+    start_date = end_date - timedelta(days=args.days)
+    tasks = [UpdateTask(f"T{i:04d}", start_date, end_date) for i in range(args.tickers)]
+
+    def write(prepared: PreparedUpdate):
+        time.sleep(args.write_latency)
+        return {"prices_added": len(prepared.price_records),
+                "returns_added": len(prepared.return_records)}
+
+    print(f"{args.tickers} tickers, {args.latency * 1000:.0f} ms latency, "
+          f"{args.write_latency * 1000:.0f} ms writes, {args.rate:g} req/s limit")
+    print(f"{'workers':>8} {'seconds':>9} {'tickers/s':>10} {'failed':>7}")
+
+    with StubYahooServer(latency=args.latency) as server:
+        for workers in args.workers:
+            provider = YahooChartProvider(
+                base_url=server.base_url,
+                cache=ResponseCache("", mode="off"),
+                rate_limiter=TokenBucket(rate=args.rate, capacity=workers),
+                max_connections_per_host=workers,
+            )
+            started = time.perf_counter()
+            totals = run_pipeline(tasks, provider, write, workers=workers)
+            elapsed = time.perf_counter() - started
+            print(f"{workers:>8} {elapsed:>9.2f} {args.tickers / elapsed:>10.1f} "
+                  f"{len(totals['failed_tickers']):>7}")
+
+
+if __name__ == "__main__":
+    main()
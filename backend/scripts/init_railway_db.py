@@ -84,6 +84,43 @@ def init_tables():
         conn.execute(text("CREATE INDEX IF NOT EXISTS idx_returns_ticker_date ON daily_returns (ticker, date)"))
         print("✅ daily_returns table created")
 
+        # Create etf_constituents table
+        print("\nCreating etf_constituents table...")
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS etf_constituents (
+                id SERIAL PRIMARY KEY,
+                etf VARCHAR(10) NOT NULL,
+                symbol VARCHAR(10) NOT NULL,
+                weight FLOAT,
+                as_of DATE NOT NULL,
+                UNIQUE (etf, symbol, as_of)
+            )
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_etf_constituents_etf ON etf_constituents (etf)"))
+        print("✅ etf_constituents table created")
+
+        # Create company_names table
+        print("\nCreating company_names table...")
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS company_names (
+                symbol VARCHAR(10) PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                source VARCHAR(50)
+            )
+        """))
+        print("✅ company_names table created")
+
+        # Create data_versions table
+        print("\nCreating data_versions table...")
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                name VARCHAR(50) PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP
+            )
+        """))
+        print("✅ data_versions table created")
+
         conn.commit()
 
     print("\n" + "=" * 60)
@@ -1,13 +1,32 @@
 """
 Migrate data from SQLite to PostgreSQL database
 
-This script exports data from the local SQLite database and imports it into Railway PostgreSQL
+This script exports data from the local SQLite database and imports it into Railway PostgreSQL.
+
+Tickers are migrated by parallel workers. Each ticker's prices and returns are
+read with keyset pagination on (ticker, date), bulk-loaded with COPY, and
+committed together with a checkpoint row, so an interrupted run resumes with
+the tickers it had not finished. A final pass compares per-ticker row counts
+and checksums between the two databases.
+
+Usage:
+    python scripts/migrate_to_postgres.py [--workers 4] [--batch-size 10000]
+        [--restart] [--verify-only] [--skip-verify]
 """
 
 import sys
 import os
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set
+
 import pandas as pd
-from datetime import datetime
 from sqlalchemy import create_engine, text
 from tqdm import tqdm
 
@@ -15,178 +34,439 @@ from tqdm import tqdm
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.config import settings
-
-
-def migrate_data():
+from app.utils.bulk_load import bulk_upsert
+
+PRICE_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume', 'adjusted_close']
+RETURN_COLUMNS = ['ticker', 'date', 'return_pct']
+TICKER_COLUMNS = ['symbol', 'name', 'type', 'data_available', 'earliest_date', 'latest_date', 'last_updated']
+
+# Per-ticker tables, each keyed by (ticker, date)
+MIGRATED_TABLES = {
+    'historical_prices': PRICE_COLUMNS,
+    'daily_returns': RETURN_COLUMNS,
+}
+
+CHECKPOINT_TABLE = 'migration_checkpoints'
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_WORKERS = 4
+
+
+def _placeholder(dialect: str) -> str:
+    return '%s' if dialect == 'postgresql' else '?'
+
+
+def iter_ticker_rows(conn, dialect: str, table: str, columns: Sequence[str], ticker: str,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """
+    Read one ticker's rows in date order, a page at a time.
+
+    Pages continue from the last date seen (keyset pagination on the
+    (ticker, date) index) instead of using OFFSET, so every page costs the same.
+
+    Args:
+        conn: DB-API connection
+        dialect: "postgresql" or "sqlite"
+        table: Table keyed by (ticker, date)
+        columns: Columns to select; must include 'date'
+        ticker: Ticker symbol
+        batch_size: Rows per page
+
+    Yields:
+        Lists of row tuples
+    """
+    p = _placeholder(dialect)
+    column_list = ', '.join(columns)
+    date_index = list(columns).index('date')
+    last_date = None
+    while True:
+        cursor = conn.cursor()
+        try:
+            if last_date is None:
+                cursor.execute(
+                    f"SELECT {column_list} FROM {table} WHERE ticker = {p} ORDER BY date LIMIT {p}",
+                    (ticker, batch_size),
+                )
+            else:
+                cursor.execute(
+                    f"SELECT {column_list} FROM {table} WHERE ticker = {p} AND date > {p} "
+                    f"ORDER BY date LIMIT {p}",
+                    (ticker, last_date, batch_size),
+                )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_date = rows[-1][date_index]
+
+
+def _canonical(value) -> str:
+    # Both databases must hash identical text for identical data: dates as
+    # YYYY-MM-DD (SQLite stores text, PostgreSQL returns date objects) and all
+    # numbers as floats (SQLite may hold integral volumes as REAL)
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)) or hasattr(value, 'as_integer_ratio'):
+        return repr(float(value))
+    return str(value)
+
+
+class RowChecksum:
+    """Order-sensitive MD5 over canonicalized rows"""
+
+    def __init__(self):
+        self._hash = hashlib.md5()
+        self.rows = 0
+
+    def update(self, rows: Sequence[tuple]) -> None:
+        for row in rows:
+            self._hash.update(('\x1f'.join(_canonical(v) for v in row) + '\n').encode())
+        self.rows += len(rows)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _rows_to_frame(rows: List[tuple], columns: Sequence[str]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=list(columns))
+    if 'volume' in frame.columns:
+        frame['volume'] = pd.to_numeric(frame['volume']).astype('Int64')
+    return frame
+
+
+@dataclass
+class TickerResult:
+    """Outcome of migrating or verifying one ticker"""
+    ticker: str
+    rows: Dict[str, int] = field(default_factory=dict)
+    checksums: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class MigrationSummary:
+    """Totals for a migration or verification run"""
+    completed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    rows: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class Migrator:
+    """
+    Resumable per-ticker copy between two databases
+
+    Each worker thread opens its own source and target connections on first
+    use. The target dialect decides how rows are loaded (COPY on PostgreSQL).
+
+    Args:
+        connect_source: Factory returning a new DB-API connection to the SQLite source
+        connect_target: Factory returning a new DB-API connection to the target
+        target_dialect: "postgresql" or "sqlite"
+        batch_size: Rows per keyset page
+        workers: Number of tickers migrated concurrently
+    """
+
+    def __init__(
+        self,
+        connect_source: Callable[[], object],
+        connect_target: Callable[[], object],
+        target_dialect: str = 'postgresql',
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        self.connect_source = connect_source
+        self.connect_target = connect_target
+        self.target_dialect = target_dialect
+        self.batch_size = batch_size
+        self.workers = workers
+        # Thread ident -> (source, target) connections opened by that thread
+        self._connections_by_thread: Dict[int, tuple] = {}
+        self._connections_lock = threading.Lock()
+
+    def _connections(self):
+        ident = threading.get_ident()
+        with self._connections_lock:
+            pair = self._connections_by_thread.get(ident)
+        if pair is None:
+            pair = (self.connect_source(), self.connect_target())
+            with self._connections_lock:
+                self._connections_by_thread[ident] = pair
+        return pair
+
+    def _close_connections(self, keep_current: bool = False) -> None:
+        current = threading.get_ident()
+        with self._connections_lock:
+            idents = [i for i in self._connections_by_thread if not (keep_current and i == current)]
+            pairs = [self._connections_by_thread.pop(i) for i in idents]
+        for pair in pairs:
+            for conn in pair:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def close(self) -> None:
+        """Close every connection opened by the migrator"""
+        self._close_connections()
+
+    def prepare(self, restart: bool = False) -> int:
+        """
+        Create the checkpoint table and migrate the (small) tickers table.
+
+        Args:
+            restart: Drop existing checkpoints so every ticker is migrated again
+
+        Returns:
+            Number of ticker rows loaded
+        """
+        source, target = self._connections()
+        cursor = target.cursor()
+        try:
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                    ticker VARCHAR(10) NOT NULL,
+                    table_name VARCHAR(64) NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    checksum VARCHAR(32) NOT NULL,
+                    completed_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (ticker, table_name)
+                )
+                """
+            )
+            if restart:
+                cursor.execute(f"DELETE FROM {CHECKPOINT_TABLE}")
+        finally:
+            cursor.close()
+
+        tickers_df = pd.read_sql(f"SELECT {', '.join(TICKER_COLUMNS)} FROM tickers", source)
+        tickers_df['data_available'] = tickers_df['data_available'].astype('boolean')
+        result = bulk_upsert(target, self.target_dialect, 'tickers', TICKER_COLUMNS, tickers_df,
+                             conflict_columns=['symbol'])
+        target.commit()
+        return result.rows
+
+    def source_tickers(self) -> List[str]:
+        """Every ticker with prices or returns in the source"""
+        source, _ = self._connections()
+        cursor = source.cursor()
+        try:
+            cursor.execute(
+                " UNION ".join(f"SELECT DISTINCT ticker FROM {table}" for table in MIGRATED_TABLES)
+                + " ORDER BY 1"
+            )
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def completed_tickers(self) -> Set[str]:
+        """Tickers with a checkpoint for every migrated table"""
+        _, target = self._connections()
+        cursor = target.cursor()
+        try:
+            cursor.execute(
+                f"SELECT ticker FROM {CHECKPOINT_TABLE} GROUP BY ticker HAVING COUNT(*) = {len(MIGRATED_TABLES)}"
+            )
+            tickers = {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+        target.commit()
+        return tickers
+
+    def migrate_ticker(self, ticker: str) -> TickerResult:
+        """
+        Copy one ticker's rows and record its checkpoint in a single transaction.
+
+        Returns:
+            TickerResult with per-table row counts and source checksums
+        """
+        source, target = self._connections()
+        result = TickerResult(ticker=ticker)
+        started = time.perf_counter()
+        try:
+            checkpoints = []
+            for table, columns in MIGRATED_TABLES.items():
+                checksum = RowChecksum()
+                for rows in iter_ticker_rows(source, 'sqlite', table, columns, ticker, self.batch_size):
+                    bulk_upsert(target, self.target_dialect, table, columns, _rows_to_frame(rows, columns),
+                                conflict_columns=['ticker', 'date'])
+                    checksum.update(rows)
+                result.rows[table] = checksum.rows
+                result.checksums[table] = checksum.hexdigest()
+                checkpoints.append((ticker, table, checksum.rows, checksum.hexdigest(),
+                                    datetime.now().isoformat(sep=' ', timespec='seconds')))
+
+            bulk_upsert(target, self.target_dialect, CHECKPOINT_TABLE,
+                        ['ticker', 'table_name', 'row_count', 'checksum', 'completed_at'],
+                        checkpoints, conflict_columns=['ticker', 'table_name'])
+            target.commit()
+        except Exception as e:
+            target.rollback()
+            result.error = str(e)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def verify_ticker(self, ticker: str) -> TickerResult:
+        """
+        Compare one ticker's row counts and checksums between source and target.
+
+        Returns:
+            TickerResult whose error describes any mismatch
+        """
+        source, target = self._connections()
+        result = TickerResult(ticker=ticker)
+        started = time.perf_counter()
+        problems = []
+        try:
+            for table, columns in MIGRATED_TABLES.items():
+                sums = []
+                for conn, dialect in ((source, 'sqlite'), (target, self.target_dialect)):
+                    checksum = RowChecksum()
+                    for rows in iter_ticker_rows(conn, dialect, table, columns, ticker, self.batch_size):
+                        checksum.update(rows)
+                    sums.append(checksum)
+                target.commit()
+                result.rows[table] = sums[1].rows
+                result.checksums[table] = sums[1].hexdigest()
+                if sums[0].rows != sums[1].rows:
+                    problems.append(f"{table}: {sums[0].rows} source rows, {sums[1].rows} target rows")
+                elif sums[0].hexdigest() != sums[1].hexdigest():
+                    problems.append(f"{table}: checksum mismatch")
+        except Exception as e:
+            target.rollback()
+            problems.append(str(e))
+        result.error = '; '.join(problems) or None
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def run(self, tickers: List[str], action: Callable[[str], TickerResult],
+            progress: Optional[Callable[[], None]] = None) -> MigrationSummary:
+        """
+        Apply migrate_ticker or verify_ticker to tickers with the worker pool.
+
+        Returns:
+            MigrationSummary with completed and failed tickers and per-table row totals
+        """
+        summary = MigrationSummary(rows={table: 0 for table in MIGRATED_TABLES})
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='migrate') as pool:
+            futures = [pool.submit(action, ticker) for ticker in tickers]
+            for future in as_completed(futures):
+                result = future.result()
+                if result.error:
+                    summary.failed[result.ticker] = result.error
+                else:
+                    summary.completed.append(result.ticker)
+                    for table, count in result.rows.items():
+                        summary.rows[table] += count
+                if progress is not None:
+                    progress()
+        # Worker threads are gone; release their connections back to the pool
+        self._close_connections(keep_current=True)
+        summary.seconds = time.perf_counter() - started
+        return summary
+
+
+def _print_failures(summary: MigrationSummary) -> None:
+    for ticker, error in list(summary.failed.items())[:20]:
+        print(f"  - {ticker}: {error}")
+    if len(summary.failed) > 20:
+        print(f"  ... and {len(summary.failed) - 20} more")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Migrate the SQLite database to PostgreSQL")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Tickers migrated concurrently (default {DEFAULT_WORKERS})")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per keyset page (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--restart', action='store_true',
+                        help="Ignore checkpoints and migrate every ticker again")
+    parser.add_argument('--verify-only', action='store_true',
+                        help="Only compare row counts and checksums")
+    parser.add_argument('--skip-verify', action='store_true',
+                        help="Skip the final verification pass")
+    parser.add_argument('--sqlite-path',
+                        default=os.path.join(os.path.dirname(__file__), '../data/trading_patterns.db'))
+    return parser.parse_args(argv)
+
+
+def migrate_data(args: argparse.Namespace):
     """Migrate all data from SQLite to PostgreSQL"""
-
     print("=" * 60)
     print("MIGRATING DATA FROM SQLite TO PostgreSQL")
     print("=" * 60)
 
-    # SQLite connection (local)
-    sqlite_db_path = os.path.join(os.path.dirname(__file__), '../data/trading_patterns.db')
-    sqlite_engine = create_engine(f'sqlite:///{sqlite_db_path}')
+    sqlite_db_path = args.sqlite_path
 
-    # PostgreSQL connection (Railway)
-    postgres_engine = create_engine(settings.DATABASE_URL)
+    # PostgreSQL connection (Railway); one pooled connection per worker
+    postgres_engine = create_engine(settings.DATABASE_URL, pool_size=args.workers + 1)
 
     print(f"\nSQLite DB: {sqlite_db_path}")
     print(f"PostgreSQL DB: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'Railway'}")
 
-    # Migrate tickers table
-    print("\n" + "=" * 60)
-    print("1. MIGRATING TICKERS TABLE")
-    print("=" * 60)
-
-    try:
-        tickers_df = pd.read_sql("SELECT * FROM tickers", sqlite_engine)
-        print(f"Found {len(tickers_df)} tickers in SQLite")
-
-        with postgres_engine.connect() as conn:
-            for idx, row in tqdm(tickers_df.iterrows(), total=len(tickers_df), desc="Inserting tickers"):
-                conn.execute(
-                    text("""
-                        INSERT INTO tickers (symbol, name, type, data_available, earliest_date, latest_date, last_updated)
-                        VALUES (:symbol, :name, :type, :data_available, :earliest_date, :latest_date, :last_updated)
-                        ON CONFLICT (symbol) DO UPDATE SET
-                            name = EXCLUDED.name,
-                            type = EXCLUDED.type,
-                            data_available = EXCLUDED.data_available,
-                            earliest_date = EXCLUDED.earliest_date,
-                            latest_date = EXCLUDED.latest_date,
-                            last_updated = EXCLUDED.last_updated
-                    """),
-                    {
-                        'symbol': row['symbol'],
-                        'name': row['name'],
-                        'type': row['type'],
-                        'data_available': row['data_available'],
-                        'earliest_date': row['earliest_date'],
-                        'latest_date': row['latest_date'],
-                        'last_updated': row['last_updated']
-                    }
-                )
-            conn.commit()
-        print(f"✅ Successfully migrated {len(tickers_df)} tickers")
-    except Exception as e:
-        print(f"❌ Error migrating tickers: {e}")
-        import traceback
-        traceback.print_exc()
-
-    # Migrate historical_prices table in batches
-    print("\n" + "=" * 60)
-    print("2. MIGRATING HISTORICAL PRICES TABLE")
-    print("=" * 60)
-
-    try:
-        # Get total count first
-        with sqlite_engine.connect() as conn:
-            total_count = conn.execute(text("SELECT COUNT(*) FROM historical_prices")).scalar()
-        print(f"Found {total_count:,} price records in SQLite")
-
-        # Read and insert in batches of 10,000
-        batch_size = 10000
-        offset = 0
-
-        with postgres_engine.connect() as pg_conn:
-            with sqlite_engine.connect() as sqlite_conn:
-                while offset < total_count:
-                    # Read batch
-                    batch_df = pd.read_sql(
-                        f"SELECT * FROM historical_prices ORDER BY ticker, date LIMIT {batch_size} OFFSET {offset}",
-                        sqlite_conn
-                    )
-
-                    # Insert batch
-                    for idx, row in tqdm(batch_df.iterrows(), total=len(batch_df),
-                                        desc=f"Inserting prices {offset:,}-{offset+len(batch_df):,}"):
-                        pg_conn.execute(
-                            text("""
-                                INSERT INTO historical_prices
-                                (ticker, date, open, high, low, close, volume, adjusted_close)
-                                VALUES (:ticker, :date, :open, :high, :low, :close, :volume, :adj_close)
-                                ON CONFLICT (ticker, date) DO UPDATE SET
-                                    open = EXCLUDED.open,
-                                    high = EXCLUDED.high,
-                                    low = EXCLUDED.low,
-                                    close = EXCLUDED.close,
-                                    volume = EXCLUDED.volume,
-                                    adjusted_close = EXCLUDED.adjusted_close
-                            """),
-                            {
-                                'ticker': row['ticker'],
-                                'date': row['date'],
-                                'open': float(row['open']) if pd.notna(row['open']) else None,
-                                'high': float(row['high']) if pd.notna(row['high']) else None,
-                                'low': float(row['low']) if pd.notna(row['low']) else None,
-                                'close': float(row['close']) if pd.notna(row['close']) else None,
-                                'volume': int(row['volume']) if pd.notna(row['volume']) else None,
-                                'adj_close': float(row['adjusted_close']) if pd.notna(row['adjusted_close']) else None
-                            }
-                        )
-
-                    # Commit batch
-                    pg_conn.commit()
-                    offset += len(batch_df)
-
-        print(f"✅ Successfully migrated {total_count:,} price records")
-    except Exception as e:
-        print(f"❌ Error migrating prices: {e}")
-        import traceback
-        traceback.print_exc()
-
-    # Migrate daily_returns table in batches
-    print("\n" + "=" * 60)
-    print("3. MIGRATING DAILY RETURNS TABLE")
-    print("=" * 60)
+    migrator = Migrator(
+        connect_source=lambda: sqlite3.connect(sqlite_db_path, check_same_thread=False),
+        connect_target=postgres_engine.raw_connection,
+        target_dialect='postgresql',
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
 
     try:
-        # Get total count first
-        with sqlite_engine.connect() as conn:
-            total_count = conn.execute(text("SELECT COUNT(*) FROM daily_returns")).scalar()
-        print(f"Found {total_count:,} return records in SQLite")
-
-        # Read and insert in batches
-        batch_size = 10000
-        offset = 0
-
-        with postgres_engine.connect() as pg_conn:
-            with sqlite_engine.connect() as sqlite_conn:
-                while offset < total_count:
-                    # Read batch
-                    batch_df = pd.read_sql(
-                        f"SELECT * FROM daily_returns LIMIT {batch_size} OFFSET {offset}",
-                        sqlite_conn
-                    )
-
-                    # Insert batch
-                    for idx, row in tqdm(batch_df.iterrows(), total=len(batch_df),
-                                        desc=f"Inserting returns {offset:,}-{offset+len(batch_df):,}"):
-                        if pd.notna(row['return_pct']):
-                            pg_conn.execute(
-                                text("""
-                                    INSERT INTO daily_returns (ticker, date, return_pct)
-                                    VALUES (:ticker, :date, :return_pct)
-                                    ON CONFLICT (ticker, date) DO UPDATE SET
-                                        return_pct = EXCLUDED.return_pct
-                                """),
-                                {
-                                    'ticker': row['ticker'],
-                                    'date': row['date'],
-                                    'return_pct': float(row['return_pct'])
-                                }
-                            )
-
-                    # Commit batch
-                    pg_conn.commit()
-                    offset += len(batch_df)
-
-        print(f"✅ Successfully migrated {total_count:,} return records")
-    except Exception as e:
-        print(f"❌ Error migrating returns: {e}")
-        import traceback
-        traceback.print_exc()
+        tickers = migrator.source_tickers()
+
+        if not args.verify_only:
+            print("\n" + "=" * 60)
+            print("1. MIGRATING TICKERS TABLE")
+            print("=" * 60)
+            ticker_rows = migrator.prepare(restart=args.restart)
+            print(f"✅ Successfully migrated {ticker_rows} tickers")
+
+            print("\n" + "=" * 60)
+            print("2. MIGRATING PRICES AND RETURNS")
+            print("=" * 60)
+            done = migrator.completed_tickers()
+            pending = [t for t in tickers if t not in done]
+            print(f"Found {len(tickers)} tickers in SQLite: {len(done)} already migrated, {len(pending)} to go")
+
+            with tqdm(total=len(pending), desc="Migrating tickers", unit="ticker") as bar:
+                summary = migrator.run(pending, migrator.migrate_ticker, progress=lambda: bar.update(1))
+
+            total_rows = sum(summary.rows.values())
+            for table, count in summary.rows.items():
+                print(f"  {table}: {count:,} rows")
+            if summary.seconds:
+                print(f"  Loaded {total_rows:,} rows in {summary.seconds:.1f}s "
+                      f"({total_rows / summary.seconds:,.0f} rows/s)")
+            print(f"✅ Migrated {len(summary.completed)} tickers")
+            if summary.failed:
+                print(f"❌ {len(summary.failed)} tickers failed (re-run to resume):")
+                _print_failures(summary)
+
+        if not args.skip_verify:
+            print("\n" + "=" * 60)
+            print("3. VERIFYING ROW COUNTS AND CHECKSUMS")
+            print("=" * 60)
+            with tqdm(total=len(tickers), desc="Verifying tickers", unit="ticker") as bar:
+                verification = migrator.run(tickers, migrator.verify_ticker, progress=lambda: bar.update(1))
+            if verification.failed:
+                print(f"❌ {len(verification.failed)} of {len(tickers)} tickers differ:")
+                _print_failures(verification)
+            else:
+                print(f"✅ All {len(tickers)} tickers match")
+    finally:
+        migrator.close()
 
     print("\n" + "=" * 60)
     print("MIGRATION COMPLETE!")
@@ -205,4 +485,4 @@ def migrate_data():
 
 
 if __name__ == "__main__":
-    migrate_data()
+    migrate_data(parse_args())
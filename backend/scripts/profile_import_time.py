@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Profile the import time of the API application.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the total, the slowest modules, and whether modules that should only
+load on first use (HTTP clients, yfinance, database drivers) stayed out of the
+import. tests/test_import_time.py runs the same check as a regression test.
+
+Usage:
+    python scripts/profile_import_time.py [--runs 5] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Loaded only when the market data fallback or a database connection is used
+DEFERRED_MODULES = ("httpx", "yfinance", "requests", "psycopg2", "sqlite3")
+
+
+def import_profile(module: str = "app.main") -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Dictionary mapping each imported module to (self µs, cumulative µs)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile app.main import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals = [profile[args.module][1] / 1000 for profile in profiles]
+    print(f"📦 import {args.module}: median {statistics.median(totals):.0f} ms "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}) over {args.runs} runs")
+
+    # Top-level packages by cumulative time, from the last run
+    profile = profiles[-1]
+    packages = {name: times for name, times in profile.items() if "." not in name}
+    print(f"\n{'package':<28} {'cumulative ms':>14}")
+    for name, (_, cumulative) in sorted(packages.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{name:<28} {cumulative / 1000:>14.1f}")
+
+    loaded = [name for name in DEFERRED_MODULES if name in profile]
+    if loaded:
+        print(f"\n❌ Imported eagerly: {', '.join(loaded)}")
+        sys.exit(1)
+    print(f"\n✅ Deferred until first use: {', '.join(DEFERRED_MODULES)}")
+
+
+if __name__ == "__main__":
+    main()
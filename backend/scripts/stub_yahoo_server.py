@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Yahoo Finance v8 chart endpoint.
+
+Serves deterministic synthetic daily bars for any symbol so ingestion code can
+be exercised and benchmarked offline. Point a fetcher at it with
+YAHOO_BASE_URL=http://127.0.0.1:<port>/v8/finance/chart/
+
+Usage:
+    python scripts/stub_yahoo_server.py [--port 8765] [--latency 0.2]
+"""
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+CHART_PATH = "/v8/finance/chart/"
+
+
+def build_chart_payload(symbol: str, period1: int, period2: int) -> dict:
+    """
+    Build a chart API response with one bar per weekday in [period1, period2)
+
+    Prices follow a random walk seeded by the symbol, so repeated requests for
+    the same symbol and window return identical data.
+    """
+    start = datetime.fromtimestamp(period1, tz=timezone.utc).date()
+    end = datetime.fromtimestamp(period2, tz=timezone.utc).date()
+    days = [start + timedelta(days=i) for i in range((end - start).days)]
+    days = [d for d in days if d.weekday() < 5]
+
+    # 14:30 UTC is the NYSE open, which is what Yahoo timestamps daily bars with
+    timestamps = [
+        int(datetime(d.year, d.month, d.day, 14, 30, tzinfo=timezone.utc).timestamp())
+        for d in days
+    ]
+    # Seed from the symbol and the first bar's day so overlapping windows agree
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    offset = (start - datetime(1900, 1, 1).date()).days
+    walk = np.cumsum(rng.normal(0, 0.01, offset + len(days) + 1))[offset + 1:]
+    close = 100 * np.exp(walk[: len(days)])
+
+    quote = {
+        "open": (close * 0.995).round(4).tolist(),
+        "high": (close * 1.01).round(4).tolist(),
+        "low": (close * 0.99).round(4).tolist(),
+        "close": close.round(4).tolist(),
+        "volume": [1_000_000 + i for i in range(len(days))],
+    }
+    return {
+        "chart": {
+            "result": [{
+                "meta": {
+                    "symbol": symbol,
+                    "currency": "USD",
+                    "exchangeTimezoneName": "America/New_York",
+                    "gmtoffset": -14400,
+                },
+                "timestamp": timestamps,
+                "indicators": {"quote": [quote]},
+            }],
+            "error": None,
+        }
+    }
+
+
+class StubYahooServer:
+    """
+    Threaded stub chart server, usable as a context manager
+
+    Args:
+        port: Port to bind (0 picks a free port)
+        latency: Seconds to sleep before answering, to simulate network time
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if not parsed.path.startswith(CHART_PATH):
+                    self.send_error(404)
+                    return
+                with server._count_lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                symbol = parsed.path[len(CHART_PATH):]
+                params = parse_qs(parsed.query)
+                period1 = int(params.get("period1", [0])[0])
+                period2 = int(params.get("period2", [int(time.time())])[0])
+                body = json.dumps(build_chart_payload(symbol, period1, period2)).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{CHART_PATH}"
+
+    def start(self) -> "StubYahooServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubYahooServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a stub Yahoo Finance chart API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated response latency (s)")
+    args = parser.parse_args()
+
+    server = StubYahooServer(port=args.port, latency=args.latency)
+    print(f"Serving stub chart API at {server.base_url} (latency {args.latency}s)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
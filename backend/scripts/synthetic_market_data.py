@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic market data for benchmarks and load tests.
+
+Each ticker gets a daily OHLCV history from geometric Brownian motion with a
+per-ticker drift and volatility, overnight gaps between close and the next
+open, missing sessions (holidays, halts), late listings for some tickers,
+and log-normal volume that rises on large moves. The same symbol, seed and
+date range always produce the same frame.
+
+The default 518 tickers x 17 years is about 2.2M price rows plus as many
+daily returns, roughly the production database's 4.4M rows.
+
+Usage:
+    python scripts/synthetic_market_data.py --database-url sqlite:///./data/benchmark.db
+        [--tickers 518] [--years 17] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.bulk_load import bulk_upsert, dialect_of
+from app.utils.records import price_records, return_records
+
+# Real symbols first so the usual queries work against a synthetic database
+ANCHOR_SYMBOLS = ["SPY", "QQQ", "DIA", "IWM", "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "TSLA"]
+DEFAULT_END = date(2024, 12, 31)
+TRADING_DAYS = 252
+
+
+def synthetic_symbols(count: int) -> List[str]:
+    """The anchor symbols followed by T0000, T0001, ... up to count symbols"""
+    symbols = ANCHOR_SYMBOLS[:count]
+    symbols += [f"T{i:04d}" for i in range(count - len(symbols))]
+    return symbols
+
+
+def synthetic_history(symbol: str, years: int = 17, end: date = DEFAULT_END, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a daily OHLCV history for one ticker
+
+    Args:
+        symbol: Ticker symbol (seeds the generator together with seed)
+        years: Calendar years of history before end
+        end: Last session date
+        seed: Global seed; change it for a different universe
+
+    Returns:
+        DataFrame indexed by Date with Open, High, Low, Close, Volume and Adj Close
+    """
+    rng = np.random.default_rng([zlib.crc32(symbol.encode()), seed])
+    days = pd.bdate_range(end - timedelta(days=round(365.25 * years)), end, name="Date")
+
+    # About 1 in 5 tickers listed partway through the window
+    if rng.random() < 0.2:
+        days = days[rng.integers(0, len(days) // 2):]
+    # Holidays and halts: drop ~1.5% of sessions
+    days = days[rng.random(len(days)) > 0.015]
+    n = len(days)
+
+    drift = rng.uniform(-0.02, 0.15)
+    volatility = rng.uniform(0.12, 0.65)
+    daily_sigma = volatility / np.sqrt(TRADING_DAYS)
+    log_returns = (drift - volatility ** 2 / 2) / TRADING_DAYS + daily_sigma * rng.standard_normal(n)
+    # Occasional jumps (earnings, macro shocks)
+    jumps = rng.random(n) < 0.004
+    log_returns[jumps] += rng.normal(0, 6 * daily_sigma, int(jumps.sum()))
+    log_returns[0] = 0.0
+    close = rng.uniform(10, 400) * np.exp(np.cumsum(log_returns))
+
+    # The open gaps away from the previous close; the range covers open and close
+    previous_close = np.concatenate(([close[0]], close[:-1]))
+    open_ = previous_close * np.exp(rng.normal(0, 0.3 * daily_sigma, n))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.5 * daily_sigma, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.5 * daily_sigma, n)))
+
+    base_volume = 10 ** rng.uniform(5, 8)
+    shock = np.abs(log_returns) / daily_sigma
+    volume = np.round(base_volume * rng.lognormal(0, 0.35, n) * (1 + 0.5 * shock))
+
+    return pd.DataFrame({
+        "Open": open_.round(4),
+        "High": high.round(4),
+        "Low": low.round(4),
+        "Close": close.round(4),
+        "Volume": volume,
+        "Adj Close": close.round(4),
+    }, index=days)
+
+
+def populate(
+    bind,
+    symbols: List[str],
+    years: int = 17,
+    seed: int = 0,
+    end: date = DEFAULT_END,
+    progress: Optional[Callable[[int, int, str, int], None]] = None,
+) -> int:
+    """
+    Write synthetic histories, daily returns and tickers rows to a database
+
+    Each ticker is written in its own transaction with bulk upserts, so an
+    interrupted run can simply be restarted.
+
+    Args:
+        bind: SQLAlchemy engine (SQLite or PostgreSQL) with the tables created
+        symbols: Tickers to generate
+        years: Years of history per ticker
+        seed: Global seed
+        end: Last session date
+        progress: Called with (done, total, symbol, price rows) after each ticker
+
+    Returns:
+        Total rows written (prices + returns)
+    """
+    from app.services.ticker_catalog import bump_catalog_version
+
+    dialect = dialect_of(bind)
+    today = datetime.now().date().isoformat()
+    total = 0
+    for done, symbol in enumerate(symbols, 1):
+        data = synthetic_history(symbol, years, end, seed)
+        prices = price_records(symbol, data)
+        returns = return_records(symbol, data["Close"].pct_change() * 100)
+        conn = bind.raw_connection()
+        try:
+            bulk_upsert(
+                conn, dialect, "historical_prices",
+                ["ticker", "date", "open", "high", "low", "close", "volume", "adjusted_close"],
+                prices, conflict_columns=["ticker", "date"],
+            )
+            bulk_upsert(
+                conn, dialect, "daily_returns", ["ticker", "date", "return_pct"],
+                returns, conflict_columns=["ticker", "date"],
+            )
+            bulk_upsert(
+                conn, dialect, "tickers",
+                ["symbol", "name", "type", "data_available", "earliest_date", "latest_date", "last_updated"],
+                [(symbol, f"{symbol} (synthetic)", "etf" if symbol in ANCHOR_SYMBOLS[:4] else "stock", True,
+                  data.index[0].date().isoformat(), data.index[-1].date().isoformat(), today)],
+                conflict_columns=["symbol"],
+            )
+            if done == len(symbols):
+                bump_catalog_version(conn, dialect)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        total += len(prices) + len(returns)
+        if progress:
+            progress(done, len(symbols), symbol, len(prices))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate a database with synthetic market data")
+    parser.add_argument("--database-url", default="sqlite:///./data/benchmark.db")
+    parser.add_argument("--tickers", type=int, default=518)
+    parser.add_argument("--years", type=int, default=17)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from app.database.models import Base
+
+    if args.database_url.startswith("sqlite:///"):
+        directory = os.path.dirname(args.database_url[len("sqlite:///"):])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+
+    def report(done: int, total: int, symbol: str, rows: int):
+        if done % 50 == 0 or done == total:
+            print(f"  [{done}/{total}] {symbol}: {rows:,} prices")
+
+    print(f"🧪 Generating {args.tickers} tickers x {args.years} years (seed {args.seed}) into {args.database_url}")
+    started = time.perf_counter()
+    rows = populate(engine, synthetic_symbols(args.tickers), args.years, args.seed, progress=report)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Wrote {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
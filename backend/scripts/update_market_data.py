@@ -6,109 +6,76 @@ This script fetches the latest trading data from Yahoo Finance for all tickers
 and updates the PostgreSQL database with new price records and daily returns.
 
 Run this script weekly (e.g., every Saturday) to keep the database current.
+
+Tickers flow through three stages connected by bounded queues:
+    fetch (concurrent requests through the market data provider, sharing a
+           token-bucket rate limiter, with retries and a circuit breaker)
+      -> transform (filter new rows, prepare price and return records)
+      -> write (single thread owning the database connection)
+so database writes overlap with network waits.
+
+Daily returns for new bars are chained from each ticker's last stored close,
+so incremental updates match a full recompute; --verify checks that by
+recomputing every ticker's returns from historical_prices.
+
+Usage:
+    python scripts/update_market_data.py [--workers 8] [--rate 2.0] [--burst 4]
+        [--cache-mode off|read_write|replay]
+    python scripts/update_market_data.py --verify [--repair] [--tickers SPY QQQ]
 """
 
 import os
 import sys
 import time
-import random
+import queue
+import asyncio
+import argparse
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date
-from typing import List, Tuple, Dict, Optional
+from typing import Callable, List, Tuple, Dict, Optional
 import psycopg2
-from psycopg2.extras import execute_batch
 import pandas as pd
-import requests
 from tqdm import tqdm
-from sqlalchemy import create_engine, text
 
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-class YahooFinanceFetcher:
-    """Fetch data directly from Yahoo Finance API v8 (Python 3.9 compatible)"""
+from app.services.market_data_provider import MarketDataProvider, TokenBucket, YahooChartProvider
+from app.services.response_cache import CACHE_MODES, ResponseCache
+from app.services.ticker_catalog import bump_catalog_version
+from app.utils.bulk_load import bulk_upsert
+from app.utils.records import price_records, return_records
+from app.utils.returns import DEFAULT_TOLERANCE, DerivationSeed, ReturnsDiff, diff_returns, incremental_returns
 
-    def __init__(self):
-        self.base_url = "https://query2.finance.yahoo.com/v8/finance/chart/"
-        self.session = requests.Session()
-        # Use Windows User-Agent to avoid rate limiting
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
 
-    def fetch_data(self, symbol: str, start_date: date, end_date: date) -> Optional[pd.DataFrame]:
-        """
-        Fetch historical data for a symbol within a date range.
+# Sustained request rate Yahoo tolerates without throttling (requests/second)
+DEFAULT_REQUEST_RATE = 2.0
+DEFAULT_REQUEST_BURST = 4
+DEFAULT_WORKERS = 8
 
-        Args:
-            symbol: Stock/ticker symbol
-            start_date: Start date (inclusive)
-            end_date: End date (inclusive)
+# Sentinel marking the end of a stage's output queue
+_DONE = object()
 
-        Returns:
-            DataFrame with OHLCV data or None if failed
-        """
-        try:
-            # Convert date to datetime for timestamp calculation
-            start_datetime = datetime.combine(start_date, datetime.min.time())
-            end_datetime = datetime.combine(end_date, datetime.min.time())
-
-            # Build request parameters
-            params = {
-                "period1": int(start_datetime.timestamp()),
-                "period2": int((end_datetime + timedelta(days=1)).timestamp()),  # +1 to include end_date
-                "interval": "1d",
-                "includePrePost": True,
-            }
-
-            # Make request
-            url = f"{self.base_url}{symbol}"
-            response = self.session.get(url, params=params, timeout=10)
-
-            if response.status_code != 200:
-                return None
-
-            # Parse JSON response
-            data = response.json()
-            result = data.get("chart", {}).get("result", [])
-
-            if not result:
-                return None
-
-            # Extract data
-            timestamps = result[0].get("timestamp", [])
-            indicators = result[0].get("indicators", {})
-            quote = indicators.get("quote", [{}])[0]
-
-            if not timestamps:
-                return None
-
-            # Build DataFrame
-            df_data = {
-                "Date": [datetime.fromtimestamp(ts) for ts in timestamps],
-                "Open": quote.get("open", []),
-                "High": quote.get("high", []),
-                "Low": quote.get("low", []),
-                "Close": quote.get("close", []),
-                "Volume": quote.get("volume", []),
-            }
-
-            # Create DataFrame
-            df = pd.DataFrame(df_data)
-            df.set_index("Date", inplace=True)
-
-            # Remove any rows with missing data
-            df.dropna(inplace=True)
-
-            # Convert to proper types
-            for col in ["Open", "High", "Low", "Close"]:
-                df[col] = df[col].astype(float)
-            df["Volume"] = df["Volume"].astype(int)
-
-            # Add Adj Close (same as Close)
-            df["Adj Close"] = df["Close"]
-
-            return df
 
-        except Exception as e:
-            return None
+@dataclass
+class UpdateTask:
+    """A ticker to update and the date window to fetch"""
+    ticker: str
+    start_date: date
+    end_date: date
+    latest_in_db: Optional[date] = None
+    seed: Optional[DerivationSeed] = None
+
+
+@dataclass
+class PreparedUpdate:
+    """Insert-ready records for one ticker, produced by the transform stage"""
+    ticker: str
+    price_records: List[Tuple] = field(default_factory=list)
+    return_records: List[Tuple] = field(default_factory=list)
+    latest_date: Optional[date] = None
+    error: bool = False
 
 
 def get_database_url() -> str:
@@ -120,31 +87,100 @@ def get_database_url() -> str:
     return db_url
 
 
-def get_all_tickers(conn) -> List[str]:
-    """Get all ticker symbols from database"""
+def get_latest_dates(conn, source: str = 'prices') -> Dict[str, Optional[date]]:
+    """
+    Get every ticker's latest stored date in one query.
+
+    Args:
+        conn: Database connection
+        source: 'prices' to take MAX(date) from historical_prices (authoritative),
+                or 'tickers' to read the maintained tickers.latest_date column
+
+    Returns:
+        Dictionary mapping every symbol in tickers to its latest date (None if no data)
+    """
+    if source == 'tickers':
+        sql = "SELECT symbol, latest_date FROM tickers ORDER BY symbol;"
+    else:
+        sql = """
+            SELECT t.symbol, MAX(hp.date)
+            FROM tickers t
+            LEFT JOIN historical_prices hp ON hp.ticker = t.symbol
+            GROUP BY t.symbol
+            ORDER BY t.symbol;
+        """
     with conn.cursor() as cur:
-        cur.execute("SELECT symbol FROM tickers ORDER BY symbol;")
-        tickers = [row[0] for row in cur.fetchall()]
-    return tickers
+        cur.execute(sql)
+        return {row[0]: row[1] for row in cur.fetchall()}
 
 
-def get_ticker_latest_date(conn, ticker: str) -> Optional[date]:
-    """Get the latest date for a ticker from historical_prices"""
+def get_derivation_seeds(conn, tickers: List[str]) -> Dict[str, DerivationSeed]:
+    """
+    Get the last stored close of each ticker in one query.
+
+    Args:
+        conn: Database connection
+        tickers: Symbols to look up
+
+    Returns:
+        Dictionary mapping symbol to its DerivationSeed (tickers without prices are omitted)
+    """
+    if not tickers:
+        return {}
     with conn.cursor() as cur:
         cur.execute(
-            "SELECT MAX(date) FROM historical_prices WHERE ticker = %s;",
-            (ticker,)
+            """
+            SELECT DISTINCT ON (ticker) ticker, date, close
+            FROM historical_prices
+            WHERE ticker = ANY(%s) AND close IS NOT NULL
+            ORDER BY ticker, date DESC;
+            """,
+            (list(tickers),)
         )
-        result = cur.fetchone()
-        return result[0] if result and result[0] else None
+        return {row[0]: DerivationSeed(last_date=row[1], last_close=float(row[2])) for row in cur.fetchall()}
+
 
+@dataclass
+class UpdatePlan:
+    """Result of the planning stage"""
+    tasks: List[UpdateTask] = field(default_factory=list)
+    current: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
 
-def fetch_yahoo_data(fetcher: YahooFinanceFetcher, ticker: str, start_date: date, end_date: date) -> Optional[pd.DataFrame]:
+
+def plan_updates(latest_dates: Dict[str, Optional[date]], end_date: date) -> UpdatePlan:
+    """
+    Split tickers into stale (with their fetch windows), current and missing.
+
+    Args:
+        latest_dates: Symbol -> latest stored date, from get_latest_dates
+        end_date: Last date to fetch (inclusive)
+
+    Returns:
+        UpdatePlan; only plan.tasks need any further database or network work
+    """
+    plan = UpdatePlan()
+    for ticker, latest_date in latest_dates.items():
+        if latest_date is None:
+            plan.missing.append(ticker)
+            continue
+
+        # Fetch from the day after the latest stored date
+        start_date = latest_date + timedelta(days=1)
+        if start_date > end_date:
+            plan.current.append(ticker)
+        else:
+            plan.tasks.append(UpdateTask(ticker, start_date, end_date, latest_in_db=latest_date))
+    return plan
+
+
+async def fetch_yahoo_data(provider: MarketDataProvider, ticker: str, start_date: date,
+                           end_date: date) -> Optional[pd.DataFrame]:
     """
     Fetch data from Yahoo Finance for a specific date range.
 
     Args:
-        fetcher: YahooFinanceFetcher instance
+        provider: Market data provider (rate limiting and retries are its job)
         ticker: Ticker symbol
         start_date: Start date (inclusive)
         end_date: End date (inclusive)
@@ -153,11 +189,7 @@ def fetch_yahoo_data(fetcher: YahooFinanceFetcher, ticker: str, start_date: date
         DataFrame with OHLCV data or None if failed
     """
     try:
-        # Add a small delay to avoid rate limiting
-        time.sleep(random.uniform(0.5, 1.5))
-
-        # Fetch data using direct Yahoo API
-        data = fetcher.fetch_data(ticker, start_date, end_date)
+        data = await provider.fetch_history(ticker, start=start_date, end=end_date)
 
         if data is None or data.empty:
             return None
@@ -165,6 +197,7 @@ def fetch_yahoo_data(fetcher: YahooFinanceFetcher, ticker: str, start_date: date
         return data
 
     except Exception as e:
+        # Anything unexpected fails this ticker only; the other fetches carry on
         print(f"  ❌ Error fetching {ticker}: {str(e)}")
         return None
 
@@ -174,44 +207,22 @@ def prepare_price_data(ticker: str, data: pd.DataFrame) -> List[Tuple]:
     Prepare price data for batch insertion.
 
     Returns:
-        List of tuples: (ticker, date, open, high, low, close, volume, adjusted_close)
+        List of tuples: (ticker, date, open, high, low, close, volume, adjusted_close),
+        with volume capped at BIGINT max and None for missing values
     """
-    records = []
-
-    for idx in data.index:
-        date = idx.strftime('%Y-%m-%d')
-
-        # Handle volume - cap at BIGINT max if needed
-        volume_val = data['Volume'].loc[idx]
-        if pd.isna(volume_val):
-            volume_int = None
-        elif volume_val > 9223372036854775807:  # BIGINT max
-            volume_int = 9223372036854775807
-        else:
-            volume_int = int(volume_val)
-
-        # Use 'Adj Close' if available, otherwise use 'Close'
-        adj_close = float(data['Adj Close'].loc[idx]) if 'Adj Close' in data.columns else float(data['Close'].loc[idx])
-
-        record = (
-            ticker,
-            date,
-            float(data['Open'].loc[idx]),
-            float(data['High'].loc[idx]),
-            float(data['Low'].loc[idx]),
-            float(data['Close'].loc[idx]),
-            volume_int,
-            adj_close
-        )
-        records.append(record)
+    return price_records(ticker, data)
 
-    return records
 
+def calculate_daily_returns(data: pd.DataFrame, seed: Optional[DerivationSeed] = None) -> pd.DataFrame:
+    """
+    Calculate daily percentage returns from price data.
 
-def calculate_daily_returns(data: pd.DataFrame) -> pd.DataFrame:
-    """Calculate daily percentage returns from price data"""
+    Args:
+        data: New price rows, sorted by date
+        seed: Last stored close; the first new row's return is taken against it
+    """
     data_copy = data.copy()
-    data_copy['daily_return'] = data_copy['Close'].pct_change() * 100
+    data_copy['daily_return'] = incremental_returns(data_copy['Close'], seed)
     return data_copy
 
 
@@ -220,30 +231,69 @@ def prepare_return_data(ticker: str, data_with_returns: pd.DataFrame) -> List[Tu
     Prepare return data for batch insertion.
 
     Returns:
-        List of tuples: (ticker, date, return_pct)
+        List of tuples: (ticker, date, return_pct), skipping NaN returns
     """
-    records = []
+    return return_records(ticker, data_with_returns['daily_return'])
 
-    for idx in data_with_returns.index:
-        daily_ret = data_with_returns['daily_return'].loc[idx]
 
-        # Skip NaN returns (first day)
-        import numpy as np
-        if pd.isna(daily_ret) or np.isnan(daily_ret):
-            continue
+def transform_ticker(task: UpdateTask, data: Optional[pd.DataFrame]) -> PreparedUpdate:
+    """
+    Transform stage: turn fetched data into insert-ready records.
 
-        record = (
-            ticker,
-            idx.strftime('%Y-%m-%d'),
-            float(daily_ret)
-        )
-        records.append(record)
+    Returns:
+        PreparedUpdate (error=True if the fetch failed)
+    """
+    prepared = PreparedUpdate(ticker=task.ticker)
+    if data is None:
+        prepared.error = True
+        return prepared
 
-    return records
+    # Filter to only new dates (in case Yahoo returns some old data); the seed's
+    # date wins so returns chain from exactly the close they are seeded with
+    cutoff = task.seed.last_date if task.seed is not None else task.latest_in_db
+    if cutoff:
+        # Bars carry a time of day, so compare calendar dates
+        data = data[data.index.normalize() > pd.Timestamp(cutoff)]
 
+    if data.empty:
+        return prepared
 
-def update_ticker_metadata(conn, ticker: str, data: pd.DataFrame):
-    """Update ticker metadata (latest_date, last_updated)"""
+    prepared.price_records = prepare_price_data(task.ticker, data)
+    prepared.return_records = prepare_return_data(task.ticker, calculate_daily_returns(data, task.seed))
+    prepared.latest_date = data.index[-1].date()
+    return prepared
+
+
+def write_update(conn, prepared: PreparedUpdate) -> Dict[str, float]:
+    """
+    Write stage: bulk-load prepared records for one ticker and commit.
+
+    Returns:
+        Dictionary with counts and timing:
+        {'prices_added': int, 'returns_added': int, 'write_seconds': float}
+    """
+    result = {'prices_added': 0, 'returns_added': 0, 'write_seconds': 0.0}
+    if not prepared.price_records:
+        return result
+
+    prices = bulk_upsert(
+        conn, 'postgresql', 'historical_prices',
+        ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume', 'adjusted_close'],
+        prepared.price_records,
+        conflict_columns=['ticker', 'date'],
+        update_columns=[],  # Keep existing rows (DO NOTHING)
+    )
+    returns = bulk_upsert(
+        conn, 'postgresql', 'daily_returns',
+        ['ticker', 'date', 'return_pct'],
+        prepared.return_records,
+        conflict_columns=['ticker', 'date'],
+    )
+    result['prices_added'] = prices.rows
+    result['returns_added'] = returns.rows
+    result['write_seconds'] = prices.seconds + returns.seconds
+
+    # Update ticker metadata
     with conn.cursor() as cur:
         cur.execute(
             """
@@ -254,81 +304,204 @@ def update_ticker_metadata(conn, ticker: str, data: pd.DataFrame):
             WHERE symbol = %s;
             """,
             (
-                data.index[-1].strftime('%Y-%m-%d'),
+                prepared.latest_date.strftime('%Y-%m-%d'),
                 datetime.now().strftime('%Y-%m-%d'),
-                ticker
+                prepared.ticker
             )
         )
 
+    conn.commit()
+
+    return result
+
 
-def update_ticker(conn, fetcher: YahooFinanceFetcher, ticker: str, start_date: date, end_date: date) -> Dict[str, int]:
+def run_pipeline(
+    tasks: List[UpdateTask],
+    provider: MarketDataProvider,
+    write: Callable[[PreparedUpdate], Dict[str, int]],
+    workers: int = DEFAULT_WORKERS,
+    queue_size: int = 64,
+    progress: Optional[Callable[[], None]] = None,
+) -> Dict[str, object]:
     """
-    Update a single ticker with new data.
+    Run the fetch -> transform -> write pipeline over a list of tasks.
+
+    The calling thread runs the write stage, so a database connection owned
+    by the caller is only ever used from one thread.
+
+    Args:
+        tasks: Tickers and date windows to update
+        provider: Market data provider; its rate limiter bounds the aggregate request rate
+        write: Callable that persists one PreparedUpdate and returns counts
+        workers: Number of concurrent fetches
+        queue_size: Capacity of each inter-stage queue (backpressure)
+        progress: Optional callback invoked once per completed ticker
 
     Returns:
-        Dictionary with counts: {'prices_added': int, 'returns_added': int, 'error': bool}
+        Dictionary with prices_added, returns_added, write_seconds and failed_tickers
     """
-    result = {'prices_added': 0, 'returns_added': 0, 'error': False}
+    fetched: queue.Queue = queue.Queue(maxsize=queue_size)
+    prepared_queue: queue.Queue = queue.Queue(maxsize=queue_size)
 
-    # Fetch data from Yahoo Finance
-    data = fetch_yahoo_data(fetcher, ticker, start_date, end_date)
-    if data is None:
-        result['error'] = True
-        return result
+    async def fetch_all() -> None:
+        semaphore = asyncio.Semaphore(workers)
 
-    # Filter to only new dates (in case Yahoo returns some old data)
-    latest_in_db = get_ticker_latest_date(conn, ticker)
-    if latest_in_db:
-        data = data[data.index > pd.Timestamp(latest_in_db)]
+        async def fetch_one(task: UpdateTask) -> None:
+            async with semaphore:
+                data = await fetch_yahoo_data(provider, task.ticker, task.start_date, task.end_date)
+            # The queue is bounded, so wait for the transform stage off the event loop
+            await asyncio.to_thread(fetched.put, (task, data))
 
-    if data.empty:
-        return result
+        try:
+            await asyncio.gather(*(fetch_one(task) for task in tasks))
+        finally:
+            await provider.aclose()
 
-    # Prepare and insert price data
-    price_records = prepare_price_data(ticker, data)
+    def fetch_stage() -> None:
+        try:
+            asyncio.run(fetch_all())
+        finally:
+            fetched.put(_DONE)
 
-    with conn.cursor() as cur:
-        execute_batch(
-            cur,
-            """
-            INSERT INTO historical_prices
-            (ticker, date, open, high, low, close, volume, adjusted_close)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (ticker, date) DO NOTHING
-            """,
-            price_records,
-            page_size=1000
-        )
-        result['prices_added'] = len(price_records)
+    def transform_stage() -> None:
+        try:
+            while True:
+                item = fetched.get()
+                if item is _DONE:
+                    break
+                task, data = item
+                try:
+                    prepared_queue.put(transform_ticker(task, data))
+                except Exception as e:
+                    print(f"  ❌ Error preparing {task.ticker}: {str(e)}")
+                    prepared_queue.put(PreparedUpdate(ticker=task.ticker, error=True))
+        finally:
+            prepared_queue.put(_DONE)
+
+    stages = [
+        threading.Thread(target=fetch_stage, name='fetch-stage', daemon=True),
+        threading.Thread(target=transform_stage, name='transform-stage', daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    totals = {'prices_added': 0, 'returns_added': 0, 'write_seconds': 0.0, 'failed_tickers': []}
+    while True:
+        prepared = prepared_queue.get()
+        if prepared is _DONE:
+            break
+        if prepared.error:
+            totals['failed_tickers'].append(prepared.ticker)
+        else:
+            try:
+                result = write(prepared)
+                totals['prices_added'] += result['prices_added']
+                totals['returns_added'] += result['returns_added']
+                totals['write_seconds'] += result.get('write_seconds', 0.0)
+            except Exception as e:
+                print(f"  ❌ Error updating {prepared.ticker}: {str(e)}")
+                totals['failed_tickers'].append(prepared.ticker)
+        if progress is not None:
+            progress()
 
-    # Calculate and insert returns
-    data_with_returns = calculate_daily_returns(data)
-    return_records = prepare_return_data(ticker, data_with_returns)
+    for stage in stages:
+        stage.join()
 
-    with conn.cursor() as cur:
-        execute_batch(
-            cur,
-            """
-            INSERT INTO daily_returns (ticker, date, return_pct)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (ticker, date) DO UPDATE SET
-                return_pct = EXCLUDED.return_pct
-            """,
-            return_records,
-            page_size=1000
-        )
-        result['returns_added'] = len(return_records)
+    return totals
 
-    # Update ticker metadata
-    update_ticker_metadata(conn, ticker, data)
 
-    conn.commit()
+def verify_returns(conn, tickers: List[str], tolerance: float = DEFAULT_TOLERANCE,
+                   repair: bool = False) -> List[ReturnsDiff]:
+    """
+    Diff stored daily_returns against a full recompute from historical_prices.
 
-    return result
+    Args:
+        conn: Database connection
+        tickers: Symbols to verify
+        tolerance: Largest absolute difference (percentage points) treated as equal
+        repair: Upsert recomputed values for missing and mismatched dates
+
+    Returns:
+        List of ReturnsDiff for tickers that differ
+    """
+    failures = []
+    for ticker in tqdm(tickers, desc="Verifying returns"):
+        with conn.cursor() as cur:
+            cur.execute("SELECT date, close FROM historical_prices WHERE ticker = %s ORDER BY date;", (ticker,))
+            price_rows = cur.fetchall()
+            cur.execute("SELECT date, return_pct FROM daily_returns WHERE ticker = %s;", (ticker,))
+            return_rows = cur.fetchall()
+
+        closes = pd.Series([r[1] for r in price_rows], index=[r[0] for r in price_rows], dtype=float)
+        stored = pd.Series([r[1] for r in return_rows], index=[r[0] for r in return_rows], dtype=float)
+        expected = incremental_returns(closes.dropna())
+        diff = diff_returns(ticker, stored, expected, tolerance)
+        if diff.ok:
+            continue
+        failures.append(diff)
+
+        if repair:
+            fix_dates = diff.missing + diff.mismatched
+            if fix_dates:
+                bulk_upsert(
+                    conn, 'postgresql', 'daily_returns', ['ticker', 'date', 'return_pct'],
+                    [(ticker, d, float(expected.loc[d])) for d in fix_dates],
+                    conflict_columns=['ticker', 'date'],
+                    commit=True,
+                )
+    return failures
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Update market data for all tickers in the database")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent fetch workers (default {DEFAULT_WORKERS})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_REQUEST_RATE,
+                        help=f"Max Yahoo requests per second across all workers (default {DEFAULT_REQUEST_RATE})")
+    parser.add_argument('--burst', type=int, default=DEFAULT_REQUEST_BURST,
+                        help=f"Token bucket burst size (default {DEFAULT_REQUEST_BURST})")
+    parser.add_argument('--plan-source', choices=['prices', 'tickers'], default='prices',
+                        help="Where latest dates come from: MAX(date) over historical_prices "
+                             "(default) or the tickers.latest_date column")
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default=None,
+                        help="Raw response cache: off, read_write, or replay (cache only, no HTTP). "
+                             "Defaults to the YAHOO_CACHE_MODE setting")
+    parser.add_argument('--verify', action='store_true',
+                        help="Diff stored daily_returns against a full recompute instead of updating")
+    parser.add_argument('--repair', action='store_true',
+                        help="With --verify, rewrite missing and mismatched returns")
+    parser.add_argument('--tickers', nargs='+',
+                        help="With --verify, only check these tickers (default: all)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"With --verify, max absolute difference in percent (default {DEFAULT_TOLERANCE})")
+    return parser.parse_args(argv)
+
+
+def run_verify(conn, args: argparse.Namespace) -> None:
+    """Verify (and optionally repair) stored daily returns, then exit"""
+    tickers = args.tickers or list(get_latest_dates(conn, source='tickers'))
+    print(f"🔍 Verifying daily returns for {len(tickers)} tickers "
+          f"(tolerance {args.tolerance:g}{', repairing' if args.repair else ''})...")
+    failures = verify_returns(conn, tickers, tolerance=args.tolerance, repair=args.repair)
+    conn.close()
+
+    print()
+    if not failures:
+        print(f"✅ All {len(tickers)} tickers match a full recompute")
+        return
+    print(f"❌ {len(failures)} tickers differ from a full recompute{' (repaired)' if args.repair else ''}:")
+    for diff in failures[:20]:
+        print(f"  - {diff}")
+    if len(failures) > 20:
+        print(f"  ... and {len(failures) - 20} more")
+    if not args.repair:
+        sys.exit(1)
 
 
 def main():
     """Main update process"""
+    args = parse_args()
+
     print("=" * 70)
     print("Market Data Update Script")
     print("=" * 70)
@@ -345,59 +518,69 @@ def main():
         print(f"❌ Failed to connect to database: {e}")
         sys.exit(1)
 
-    # Create Yahoo Finance fetcher
-    fetcher = YahooFinanceFetcher()
+    if args.verify:
+        run_verify(conn, args)
+        return
 
-    # Get all tickers
-    print(f"📋 Fetching ticker list...")
-    tickers = get_all_tickers(conn)
-    print(f"✅ Found {len(tickers)} tickers")
-    print()
+    # Create the market data provider with the shared rate limiter
+    cache = ResponseCache.from_settings(mode=args.cache_mode)
+    if cache.enabled:
+        print(f"🗄️  Response cache: {cache.mode} ({cache.directory})")
+    # Replay makes no HTTP calls, so there is nothing to rate-limit
+    limiter = None if cache.mode == 'replay' else TokenBucket(rate=args.rate, capacity=args.burst)
+    provider = YahooChartProvider(cache=cache, rate_limiter=limiter, max_connections_per_host=args.workers)
 
     # Calculate date range
     end_date = datetime.now().date() - timedelta(days=1)  # Yesterday
     print(f"📅 End date: {end_date}")
     print()
 
-    # Statistics
-    total_prices_added = 0
-    total_returns_added = 0
-    failed_tickers = []
-
-    # Process each ticker
-    print(f"🔄 Processing tickers...")
+    # Plan: one query for every ticker's latest date, then decide what is stale
+    print(f"📋 Planning updates (latest dates from {args.plan_source})...")
+    latest_dates = get_latest_dates(conn, source=args.plan_source)
+    plan = plan_updates(latest_dates, end_date)
+    tickers = list(latest_dates)
+    tasks = plan.tasks
+    failed_tickers = list(plan.missing)
+    print(f"✅ Found {len(tickers)} tickers: {len(tasks)} stale, "
+          f"{len(plan.current)} current, {len(plan.missing)} without data")
+    for ticker in plan.missing:
+        print(f"  ⚠️  {ticker}: No existing data, skipping")
+
+    # Seed each task with its last stored close so returns chain across updates
+    seeds = get_derivation_seeds(conn, [task.ticker for task in tasks])
+    for task in tasks:
+        task.seed = seeds.get(task.ticker)
     print()
 
-    for ticker in tqdm(tickers, desc="Updating tickers"):
-        # Get latest date for this ticker
-        latest_date = get_ticker_latest_date(conn, ticker)
-
-        if latest_date is None:
-            print(f"  ⚠️  {ticker}: No existing data, skipping")
-            failed_tickers.append(ticker)
-            continue
+    # Process tickers through the pipeline
+    print(f"🔄 Processing {len(tasks)} tickers "
+          f"({args.workers} workers, {args.rate:g} req/s)...")
+    print()
 
-        # Calculate start date (day after latest)
-        start_date = latest_date + timedelta(days=1)
+    started = time.perf_counter()
+    with tqdm(total=len(tasks), desc="Updating tickers") as bar:
+        totals = run_pipeline(
+            tasks,
+            provider,
+            write=lambda prepared: write_update(conn, prepared),
+            workers=args.workers,
+            progress=lambda: bar.update(1),
+        )
+    elapsed = time.perf_counter() - started
 
-        # Check if update is needed
-        if start_date > end_date:
-            # Data is already current
-            continue
+    total_prices_added = totals['prices_added']
+    total_returns_added = totals['returns_added']
+    failed_tickers.extend(totals['failed_tickers'])
 
-        # Update this ticker
+    # Tell running API processes to reload their ticker catalog
+    if total_prices_added:
         try:
-            result = update_ticker(conn, fetcher, ticker, start_date, end_date)
-
-            if result['error']:
-                failed_tickers.append(ticker)
-            else:
-                total_prices_added += result['prices_added']
-                total_returns_added += result['returns_added']
-
+            bump_catalog_version(conn)
+            conn.commit()
         except Exception as e:
-            print(f"  ❌ Error updating {ticker}: {str(e)}")
-            failed_tickers.append(ticker)
+            conn.rollback()
+            print(f"⚠️  Could not bump ticker catalog version: {e}")
 
     # Close connection
     conn.close()
@@ -409,7 +592,17 @@ def main():
     print("=" * 70)
     print(f"✅ Price records added: {total_prices_added:,}")
     print(f"✅ Return records added: {total_returns_added:,}")
+    if totals['write_seconds']:
+        rows_written = total_prices_added + total_returns_added
+        print(f"💾 Bulk load: {rows_written:,} rows in {totals['write_seconds']:.1f}s "
+              f"({rows_written / totals['write_seconds']:,.0f} rows/s)")
     print(f"📊 Tickers processed: {len(tickers)}")
+    print(f"⏱️  Pipeline time: {elapsed:.1f}s "
+          f"({len(tasks) / elapsed if elapsed else 0:.1f} tickers/s)")
+    if cache.enabled:
+        cache_stats = cache.stats()
+        print(f"🗄️  Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['evictions']} evictions")
     print(f"❌ Failed tickers: {len(failed_tickers)}")
 
     if failed_tickers:
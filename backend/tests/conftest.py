@@ -1,3 +1,8 @@
+import os
+
+# Keep the negative ticker cache in memory so test runs leave no files behind
+os.environ.setdefault("NEGATIVE_CACHE_PATH", "")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -90,3 +95,53 @@ def sample_stock_data(db_session):
 
     db_session.commit()
     return "AAPL"
+
+
+@pytest.fixture
+def mock_price_data(monkeypatch):
+    """Serve a deterministic price history from DataService without touching the database."""
+    import numpy as np
+    import pandas as pd
+    from app.services.data_service import data_service
+
+    dates = pd.bdate_range("2015-01-01", periods=1500, name="Date")
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    frame = pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": np.full(len(dates), 1_000_000),
+            "Adj Close": close,
+        },
+        index=dates,
+    )
+
+    async def fake_fetch(ticker, period="20y"):
+        return frame
+
+    monkeypatch.setattr(data_service, "fetch_historical_data", fake_fetch)
+    return frame
+
+
+@pytest.fixture
+def scripts_path():
+    """Make modules in backend/scripts importable."""
+    import os
+    import sys
+
+    scripts_dir = os.path.join(os.path.dirname(__file__), "..", "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return scripts_dir
+
+
+@pytest.fixture
+def stub_yahoo_server(scripts_path):
+    """Local stub of the Yahoo chart API serving synthetic bars (see scripts/stub_yahoo_server.py)."""
+    from stub_yahoo_server import StubYahooServer
+
+    with StubYahooServer() as server:
+        yield server
@@ -91,6 +91,35 @@ def test_query_validation_error(client):
     assert response.status_code == 422  # Validation error
 
 
+def test_query_rejects_malformed_ticker(client):
+    """Malformed symbols are rejected before any database or provider call."""
+    query = {
+        "ticker": "AAPL; DROP TABLE tickers",
+        "condition_type": "percentage_change",
+        "threshold": -3,
+        "operator": "lt",
+    }
+
+    response = client.post("/api/query", json=query)
+    assert response.status_code == 400
+    assert "Invalid ticker symbol" in response.json()["detail"]
+
+
+def test_query_normalizes_ticker(client, mock_price_data):
+    """Tickers are stripped and upper-cased before validation, caching and popularity counts."""
+    from app.services.constituents_service import constituents_service
+
+    before = constituents_service.ticker_index.popularity().get("SPY", 0)
+    query = {"ticker": " spy", "condition_type": "absolute_threshold", "threshold": 0, "operator": "gt"}
+    response = client.post("/api/query", json=query)
+
+    assert response.status_code == 200
+    assert response.json()["ticker"] == "SPY"
+    popularity = constituents_service.ticker_index.popularity()
+    assert popularity["SPY"] == before + 1
+    assert " SPY" not in popularity
+
+
 def test_query_different_time_horizons(client, db_session, sample_stock_data):
     """Test querying with multiple time horizons."""
     query = {
@@ -111,3 +140,157 @@ def test_query_different_time_horizons(client, db_session, sample_stock_data):
     assert "1d" in stats
     assert "1w" in stats
     assert "1m" in stats
+
+
+def test_query_summary_only(client, mock_price_data):
+    """Summary-only queries skip instances but still count every match."""
+    query = {
+        "ticker": "AAPL",
+        "condition_type": "percentage_change",
+        "threshold": -2.0,
+        "operator": "lt",
+        "time_horizons": ["1d", "1w"],
+        "include_instances": "none",
+    }
+
+    response = client.post("/api/query", json=query)
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["instances"] == []
+    assert data["total_occurrences"] > 0
+    assert data["summary_statistics"]["1w"]["count"] > 0
+
+
+def test_query_pagination(client, mock_price_data):
+    """Paging with next_cursor walks every match exactly once."""
+    query = {
+        "ticker": "AAPL",
+        "condition_type": "percentage_change",
+        "threshold": -2.0,
+        "operator": "lt",
+        "time_horizons": ["1d"],
+        "include_instances": "page",
+        "limit": 10,
+        "sort": "date_desc",
+    }
+
+    seen = []
+    while True:
+        response = client.post("/api/query", json=query)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(instance["date"] for instance in data["instances"])
+        if data["next_cursor"] is None:
+            break
+        query["cursor"] = data["next_cursor"]
+
+    assert len(seen) == data["total_occurrences"]
+    assert seen == sorted(seen, reverse=True)
+
+    # A cursor or limit the chosen mode would ignore is rejected
+    base = {key: query[key] for key in ("ticker", "condition_type", "threshold", "operator")}
+    for extra in [{"include_instances": "recent", "cursor": "2020-01-01"},
+                  {"include_instances": "all", "limit": 10},
+                  {"cursor": "2020-01-01"}]:
+        assert client.post("/api/query", json={**base, **extra}).status_code == 422
+
+
+def test_large_responses_are_gzipped(client, mock_price_data):
+    """Large JSON responses are compressed when the client accepts gzip."""
+    query = {
+        "ticker": "AAPL",
+        "condition_type": "absolute_threshold",
+        "threshold": 0,
+        "operator": "gt",
+    }
+
+    response = client.post("/api/query", json=query, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["total_occurrences"] == len(mock_price_data)
+
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health.headers
+
+    body = client.get("/metrics").text
+    assert "# TYPE compression_bytes_in_total counter" in body
+    samples = dict(line.rsplit(" ", 1) for line in body.splitlines() if line.startswith("compression_bytes_"))
+    gzip_in = float(samples['compression_bytes_in_total{encoding="gzip"}'])
+    assert float(samples['compression_bytes_out_total{encoding="gzip"}']) < gzip_in
+
+
+def test_get_historical_prices_downsampled(client, mock_price_data):
+    """max_points downsamples the series but keeps its endpoints."""
+    response = client.get("/api/prices/AAPL?max_points=200")
+    assert response.status_code == 200
+    prices = response.json()["prices"]
+
+    assert len(prices) == 200
+    assert prices[0]["date"] == mock_price_data.index[0].strftime("%Y-%m-%d")
+    assert prices[-1]["date"] == mock_price_data.index[-1].strftime("%Y-%m-%d")
+    assert [p["date"] for p in prices] == sorted(p["date"] for p in prices)
+
+    windowed = client.get("/api/prices/AAPL?start_date=2019-01-01&max_points=50").json()["prices"]
+    assert len(windowed) == 50
+    assert windowed[0]["date"] >= "2019-01-01"
+
+
+def test_get_historical_prices_missing_volume_and_bad_dates(client, mock_price_data):
+    """Missing volumes are served as null, and malformed dates are rejected with 422."""
+    mock_price_data["Volume"] = mock_price_data["Volume"].astype(float)
+    mock_price_data.iloc[0, mock_price_data.columns.get_loc("Volume")] = float("nan")
+
+    prices = client.get("/api/prices/NOVOLUME?end_date=2015-01-09").json()["prices"]
+    assert prices[0]["volume"] is None
+    assert prices[1]["volume"] == 1_000_000
+
+    assert client.get("/api/prices/NOVOLUME?start_date=not-a-date").status_code == 422
+
+
+def test_query_server_timing_header(client, mock_price_data, monkeypatch):
+    """Timed query responses report per-stage durations in Server-Timing when enabled."""
+    from app.core.config import settings
+
+    query = {
+        "ticker": "AAPL",
+        "condition_type": "percentage_change",
+        "threshold": -2.0,
+        "operator": "lt",
+    }
+
+    response = client.post("/api/query", json=query)
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+    monkeypatch.setattr(settings, "TIMING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "SERVER_TIMING_HEADER", True)
+    response = client.post("/api/query", json=query)
+    stages = [part.split(";")[0].strip() for part in response.headers["server-timing"].split(",")]
+    for stage in ["mask", "forward_returns", "stats", "instances", "serialize", "total"]:
+        assert stage in stages
+
+
+def test_metrics_endpoint(client, mock_price_data):
+    """/metrics exposes per-route request counts in Prometheus text format."""
+    client.get("/api/prices/AAPL")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/prices/{ticker}",status="200"}' in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert "process_resident_memory_bytes" in body
+
+
+def test_metrics_label_catch_all_routes_by_template(client):
+    """OPTIONS requests to different paths share the catch-all route's label."""
+    client.options("/api/prices/AAPL")
+    client.options("/api/query/some/deep/path")
+
+    body = client.get("/metrics").text
+    labels = [line for line in body.splitlines() if line.startswith('http_requests_total{method="OPTIONS"')]
+    assert len(labels) == 1
+    assert 'route="/{path}"' in labels[0]
@@ -0,0 +1,74 @@
+"""
+Tests for the shared bulk upsert helper (app/utils/bulk_load.py) on SQLite.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.bulk_load import bulk_upsert
+
+COLUMNS = ["ticker", "date", "close", "volume"]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE prices (ticker TEXT, date TEXT, close REAL, volume INTEGER, UNIQUE (ticker, date))"
+    )
+    yield conn
+    conn.close()
+
+
+def stored(conn):
+    return conn.execute("SELECT ticker, date, close, volume FROM prices ORDER BY ticker, date").fetchall()
+
+
+def test_do_update_overwrites_and_do_nothing_keeps(conn):
+    bulk_upsert(conn, "sqlite", "prices", COLUMNS, [("SPY", "2024-01-02", 1.0, 10)],
+                conflict_columns=["ticker", "date"])
+
+    kept = bulk_upsert(conn, "sqlite", "prices", COLUMNS, [("SPY", "2024-01-02", 2.0, 20)],
+                       conflict_columns=["ticker", "date"], update_columns=[])
+    assert stored(conn) == [("SPY", "2024-01-02", 1.0, 10)]
+    assert (kept.rows, kept.submitted) == (0, 1)
+
+    updated = bulk_upsert(conn, "sqlite", "prices", COLUMNS, [("SPY", "2024-01-02", 3.0, 30)],
+                          conflict_columns=["ticker", "date"], update_columns=["close"])
+    assert stored(conn) == [("SPY", "2024-01-02", 3.0, 10)]
+    assert updated.rows == 1
+
+
+def test_duplicate_keys_in_one_batch(conn):
+    """Within one call the last duplicate wins on DO UPDATE and the first on DO NOTHING."""
+    rows = [("SPY", "2024-01-02", 1.0, 10), ("SPY", "2024-01-02", 2.0, 20)]
+
+    bulk_upsert(conn, "sqlite", "prices", COLUMNS, rows, conflict_columns=["ticker", "date"], update_columns=[])
+    assert stored(conn) == [("SPY", "2024-01-02", 1.0, 10)]
+
+    bulk_upsert(conn, "sqlite", "prices", COLUMNS, rows, conflict_columns=["ticker", "date"])
+    assert stored(conn) == [("SPY", "2024-01-02", 2.0, 20)]
+
+
+def test_frame_missing_values_become_null(conn):
+    frame = pd.DataFrame({
+        "ticker": ["SPY", "SPY"],
+        "date": pd.to_datetime(["2024-01-02", "2024-01-03"]),
+        "close": [1.5, np.nan],
+        "volume": pd.array([None, 5], dtype="Int64"),
+    })
+
+    result = bulk_upsert(conn, "sqlite", "prices", COLUMNS, frame, conflict_columns=["ticker", "date"])
+
+    assert stored(conn) == [("SPY", "2024-01-02", 1.5, None), ("SPY", "2024-01-03", None, 5)]
+    assert (result.rows, result.submitted) == (2, 2)
+
+
+def test_empty_input_writes_nothing(conn):
+    for rows in ([], pd.DataFrame(columns=COLUMNS)):
+        result = bulk_upsert(conn, "sqlite", "prices", COLUMNS, rows, conflict_columns=["ticker", "date"])
+        assert (result.rows, result.submitted) == (0, 0)
+    assert stored(conn) == []
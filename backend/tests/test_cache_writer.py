@@ -0,0 +1,104 @@
+"""
+Tests for the background cache writer behind the DataService fallback fetch.
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.database.models import Base
+from app.services.cache_writer import CacheWriter
+from app.services.data_service import DataService
+from app.services.market_data_provider import FakeMarketDataProvider
+
+
+def test_writer_batches_and_deduplicates_tickers(mock_price_data):
+    """Tickers queued while a batch is in flight are written once, with the newest frame."""
+    release = threading.Event()
+    written = []
+
+    def write_batch(items):
+        release.wait(5)
+        written.append([(ticker, len(frame)) for ticker, frame in items])
+
+    writer = CacheWriter(write_batch, batch_size=2)
+    writer.submit("AAA", mock_price_data)
+    writer.submit("BBB", mock_price_data.iloc[:10])
+    writer.submit("CCC", mock_price_data.iloc[:10])
+    writer.submit("BBB", mock_price_data.iloc[:20])
+    assert writer.pending("BBB") is not None
+    release.set()
+
+    assert writer.flush(timeout=5)
+    writer.stop()
+    batched = sorted(entry for batch in written for entry in batch)
+    assert batched == [("AAA", len(mock_price_data)), ("BBB", 20), ("CCC", 10)]
+    assert all(len(batch) <= 2 for batch in written)
+    assert len(writer) == 0 and writer.pending("AAA") is None
+
+
+def test_writer_retries_failed_batches_then_gives_up(mock_price_data):
+    """A failing write is retried with backoff and dropped after max_retries."""
+    attempts = {"OK": 0, "BAD": 0}
+
+    def write_batch(items):
+        for ticker, _ in items:
+            attempts[ticker] += 1
+            if ticker == "BAD" or attempts[ticker] < 3:
+                raise RuntimeError("database unavailable")
+
+    writer = CacheWriter(write_batch, batch_size=1, max_retries=2, retry_backoff=0.01)
+    writer.submit("OK", mock_price_data)
+    writer.submit("BAD", mock_price_data)
+
+    assert writer.flush(timeout=5)
+    writer.stop()
+    assert attempts == {"OK": 3, "BAD": 3}
+
+
+def test_fallback_returns_before_the_write_and_serves_pending_frames(mock_price_data):
+    """The fetched frame is returned while its write is queued; repeat requests skip the provider."""
+    release = threading.Event()
+    written = []
+
+    def write_batch(items):
+        release.wait(5)
+        written.extend(ticker for ticker, _ in items)
+
+    provider = FakeMarketDataProvider({"ABC": mock_price_data})
+    service = DataService(provider=provider, cache_writer=CacheWriter(write_batch))
+    service._get_from_database = lambda ticker: None
+
+    first = asyncio.run(service.fetch_historical_data("ABC"))
+    second = asyncio.run(service.fetch_historical_data("ABC"))
+
+    assert first.equals(mock_price_data) and second is first
+    assert len(provider.calls) == 1
+    assert written == []
+    release.set()
+    assert service.cache_writer.stop(timeout=5)
+    assert written == ["ABC"]
+
+
+def test_save_batch_writes_every_ticker_in_one_transaction(tmp_path, mock_price_data):
+    """_save_batch bulk-loads prices, returns and tickers rows for each ticker."""
+    path = tmp_path / "cache.db"
+    service = DataService(provider=FakeMarketDataProvider({}))
+    service.db_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(service.db_engine)
+
+    service._save_batch([("AAA", mock_price_data), ("BBB", mock_price_data.iloc[:5])])
+
+    with sqlite3.connect(path) as conn:
+        prices = dict(conn.execute("SELECT ticker, COUNT(*) FROM historical_prices GROUP BY ticker"))
+        returns = dict(conn.execute("SELECT ticker, COUNT(*) FROM daily_returns GROUP BY ticker"))
+        symbols = [row[0] for row in conn.execute("SELECT symbol FROM tickers ORDER BY symbol")]
+    assert prices == {"AAA": len(mock_price_data), "BBB": 5}
+    assert returns == {"AAA": len(mock_price_data) - 1, "BBB": 4}
+    assert symbols == ["AAA", "BBB"]
+
+    with pytest.raises(Exception):
+        service._save_batch([("CCC", mock_price_data.drop(columns=["Close"]))])
@@ -0,0 +1,65 @@
+"""
+Tests for database-backed ETF constituents (app/services/constituents_service.py).
+"""
+
+import asyncio
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.constituents_seed import seed_constituents
+from app.database.models import Base, EtfConstituent
+from app.services.constituents_service import ConstituentsService
+
+
+def test_snapshot_serves_latest_weighted_holdings(tmp_path):
+    """Seeded holdings load with weights; a newer as_of replaces the older list atomically."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'constituents.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    csv_path = tmp_path / "SPY-components.csv"
+    csv_path.write_text("Symbol,Name,Weight\nMSFT,Microsoft Corp,7.1\nAAPL,Apple Inc,6.9\nZZZZ,Zeta Co,0.1\n")
+
+    seed_constituents(bind=engine, csv_path=str(csv_path), as_of=date(2024, 6, 28))
+    service = ConstituentsService(session_factory=Session)
+    assert service.snapshot.source == "defaults"
+    assert service.load_snapshot() and service.snapshot.source == "database"
+
+    spy = asyncio.run(service.get_etf_holdings("spy", with_weights=True))
+    assert [(h.symbol, h.weight) for h in spy] == [("MSFT", 0.071), ("AAPL", 0.069), ("ZZZZ", 0.001)]
+    assert "AAPL" in asyncio.run(service.get_etf_holdings("QQQ"))
+    assert service.ticker_names["AAPL"] == "Apple Inc."  # Curated names win over the CSV
+    assert service.ticker_names["ZZZZ"] == "Zeta Co"
+    old_snapshot = service.snapshot
+
+    # A new ETF and a newer SPY list appear without code changes
+    db = Session()
+    db.add_all([
+        EtfConstituent(etf="XLK", symbol="NVDA", weight=0.2, as_of=date(2024, 7, 31)),
+        EtfConstituent(etf="SPY", symbol="NVDA", weight=0.07, as_of=date(2024, 7, 31)),
+    ])
+    db.commit()
+    db.close()
+
+    assert service.load_snapshot(force=False)
+    assert asyncio.run(service.get_etf_holdings("SPY")) == ["NVDA"]
+    assert asyncio.run(service.get_etf_holdings("XLK")) == ["NVDA"]
+    assert service.snapshot.as_of["SPY"] == date(2024, 7, 31)
+    assert [h.symbol for h in old_snapshot.holdings["SPY"]] == ["MSFT", "AAPL", "ZZZZ"]
+    engine.dispose()
+
+
+def test_popularity_is_saved_only_after_new_queries(tmp_path):
+    """save_popularity skips the write when no query was recorded since the last save."""
+    path = str(tmp_path / "popularity.json")
+    service = ConstituentsService()
+
+    assert not service.save_popularity(path)
+    service.record_query("NVDA")
+    assert service.save_popularity(path)
+    assert not service.save_popularity(path)
+
+    reloaded = ConstituentsService()
+    assert reloaded.load_popularity(path) == 1
+    assert not reloaded.save_popularity(path)
@@ -0,0 +1,34 @@
+"""
+Import-time regression tests: importing the app must not open database
+engines, load HTTP clients or build singletons' data (see scripts/profile_import_time.py).
+"""
+
+import subprocess
+import sys
+
+
+def test_app_import_defers_clients_and_drivers(scripts_path):
+    from profile_import_time import DEFERRED_MODULES, import_profile
+
+    profile = import_profile("app.main")
+
+    assert "app.main" in profile
+    assert [name for name in DEFERRED_MODULES if name in profile] == []
+
+
+def test_app_import_creates_no_engines_or_snapshots():
+    check = (
+        "import app.main\n"
+        "from app.database import models\n"
+        "from app.services.constituents_service import constituents_service\n"
+        "from app.services.data_service import data_service\n"
+        "from app.services.negative_cache import negative_cache\n"
+        "assert models._engine is None\n"
+        "assert data_service._db_engine is None\n"
+        "assert constituents_service._snapshot is None and constituents_service._ticker_index is None\n"
+        "assert not negative_cache._loaded\n"
+        "assert data_service.db_engine is data_service.db_engine\n"
+        "assert models.engine is models.get_engine()\n"
+    )
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
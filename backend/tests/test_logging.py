@@ -0,0 +1,47 @@
+"""
+Tests for queue-based logging and request log sampling (app/core/logging.py).
+"""
+
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from app.core.logging import RequestLogSampler, setup_logging, stop_logging
+
+
+@pytest.fixture
+def queued_logging(tmp_path):
+    setup_logging(str(tmp_path))
+    yield tmp_path
+    stop_logging()
+    setup_logging()
+
+
+def test_records_are_written_by_the_background_listener(queued_logging):
+    """The root logger only enqueues; the listener writes app.log and errors.log."""
+    root = logging.getLogger()
+    assert any(isinstance(h, QueueHandler) for h in root.handlers)
+    assert not any(isinstance(h, logging.FileHandler) for h in root.handlers)
+
+    logging.getLogger("app.test").info("queued %s", "info")
+    logging.getLogger("app.test").error("queued %s", "error")
+    stop_logging()
+
+    app_log = (queued_logging / "app.log").read_text()
+    errors_log = (queued_logging / "errors.log").read_text()
+    assert "queued info" in app_log and "queued error" in app_log
+    assert "queued info" not in errors_log and "queued error" in errors_log
+
+
+def test_sampler_only_drops_fast_successes_under_high_load():
+    sampler = RequestLogSampler(sample_rate=0.0, high_load=2, slow_seconds=1.0)
+
+    assert sampler.start() == 1
+    assert sampler.should_log(1, 200, 0.01)
+    sampler.finish()
+
+    assert not sampler.should_log(3, 200, 0.01)
+    assert sampler.should_log(3, 503, 0.01)
+    assert sampler.should_log(3, 200, 2.5)
+    assert RequestLogSampler(sample_rate=1.0, high_load=2).should_log(50, 200, 0.01)
@@ -0,0 +1,143 @@
+"""
+Tests for the market data provider layer (app/services/market_data_provider.py).
+"""
+
+import asyncio
+import json
+
+import httpx
+import pandas as pd
+import pytest
+
+from app.services.data_service import DataService
+from app.services.market_data_provider import (
+    CircuitOpenError,
+    FakeMarketDataProvider,
+    MarketDataError,
+    YahooChartProvider,
+)
+from app.services.response_cache import ResponseCache
+
+
+def chart_body():
+    return json.dumps({"chart": {"result": [{
+        "meta": {"exchangeTimezoneName": "America/New_York"},
+        "timestamp": [1709901000, 1710163800],
+        "indicators": {"quote": [{
+            "open": [1.0, 2.0], "high": [1.0, 2.0], "low": [1.0, 2.0],
+            "close": [1.0, 2.0], "volume": [10, 20],
+        }]},
+    }], "error": None}}).encode()
+
+
+def make_provider(handler, **kwargs):
+    return YahooChartProvider(
+        base_url="http://chart.test/v8/finance/chart/",
+        cache=ResponseCache("", mode="off"),
+        transport=httpx.MockTransport(handler),
+        backoff_base=0,
+        **kwargs,
+    )
+
+
+def test_retries_transient_errors_then_succeeds():
+    """429/5xx responses are retried; a 404 means no data and is not retried."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/MISSING"):
+            return httpx.Response(404)
+        return httpx.Response(503) if len(calls) < 3 else httpx.Response(200, content=chart_body())
+
+    provider = make_provider(handler, max_retries=3)
+    data = provider.fetch_history_sync("SPY", period="1mo")
+
+    assert len(calls) == 3
+    assert list(data.index) == [pd.Timestamp("2024-03-08"), pd.Timestamp("2024-03-11")]
+    assert provider.fetch_history_sync("MISSING", period="1mo") is None
+    assert len(calls) == 4
+
+
+def test_client_errors_other_than_404_raise():
+    """A 401/403 block is an error (short negative-cache TTL), not an unknown ticker."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(403)
+
+    provider = make_provider(handler, max_retries=3)
+    with pytest.raises(MarketDataError, match="HTTP 403"):
+        provider.fetch_history_sync("SPY", period="1mo")
+    assert len(calls) == 1
+
+
+def test_circuit_opens_after_repeated_failures():
+    """Once a host's circuit opens, requests fail fast without reaching the network."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    provider = make_provider(handler, max_retries=0, breaker_threshold=2, breaker_reset=60)
+    for _ in range(2):
+        with pytest.raises(MarketDataError):
+            provider.fetch_history_sync("SPY", period="1mo")
+    with pytest.raises(CircuitOpenError):
+        provider.fetch_history_sync("SPY", period="1mo")
+
+    assert len(calls) == 2
+    assert provider.breaker("chart.test").state == "open"
+
+
+def test_data_service_falls_back_to_provider(mock_price_data):
+    """DataService fetches a ticker missing from the database through its provider."""
+    provider = FakeMarketDataProvider({"ABC": mock_price_data})
+    service = DataService(provider=provider)
+    service._get_from_database = lambda ticker: None
+    service._save_batch = lambda items: None
+
+    data = asyncio.run(service.fetch_historical_data("ABC", period="20y"))
+
+    assert data.equals(mock_price_data)
+    assert provider.calls == [("ABC", None, None, "20y")]
+    with pytest.raises(ValueError):
+        asyncio.run(service.fetch_historical_data("NOPE"))
+
+
+def test_undecodable_response_raises_market_data_error(tmp_path):
+    """A truncated body surfaces as MarketDataError and is not written to the response cache."""
+    cache = ResponseCache(str(tmp_path), mode="read_write")
+    provider = make_provider(lambda request: httpx.Response(200, content=chart_body()[:40]))
+    provider.cache = cache
+
+    with pytest.raises(MarketDataError):
+        provider.fetch_history_sync("SPY", period="1mo")
+    assert cache.stats()["stores"] == 0
+
+
+def test_cancelled_half_open_trial_releases_the_circuit():
+    """A trial request that is cancelled mid-flight does not leave the circuit stuck open."""
+    responses = iter(["fail", "hang", "ok"])
+
+    async def handler(request):
+        mode = next(responses)
+        if mode == "hang":
+            await asyncio.sleep(10)
+        return httpx.Response(500) if mode == "fail" else httpx.Response(200, content=chart_body())
+
+    provider = make_provider(handler, max_retries=0, breaker_threshold=1, breaker_reset=0)
+
+    async def scenario():
+        with pytest.raises(MarketDataError):
+            await provider.fetch_history("SPY", period="1mo")
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(provider.fetch_history("SPY", period="1mo"), 0.05)
+        data = await provider.fetch_history("SPY", period="1mo")
+        await provider.aclose()
+        return data
+
+    assert len(asyncio.run(scenario())) == 2
+    assert provider.breaker("chart.test").state == "closed"
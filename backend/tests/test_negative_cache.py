@@ -0,0 +1,70 @@
+"""
+Tests for the negative ticker cache in front of the DataService fallback fetch.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.data_service import DataService
+from app.services.market_data_provider import FakeMarketDataProvider
+from app.services.negative_cache import NegativeCache
+
+
+def make_service(provider, cache):
+    service = DataService(provider=provider, negative_cache=cache)
+    service._get_from_database = lambda ticker: None
+    service._save_batch = lambda items: None
+    return service
+
+
+def test_unknown_ticker_is_fetched_once_and_persisted(tmp_path, mock_price_data):
+    path = str(tmp_path / "negative.json")
+    provider = FakeMarketDataProvider({"ABC": mock_price_data}, fail=["BROKEN"])
+    cache = NegativeCache(path, ttl=60)
+    service = make_service(provider, cache)
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="(?i)no data available"):
+            asyncio.run(service.fetch_historical_data("INVALIDTICKER123"))
+    with pytest.raises(ValueError):
+        asyncio.run(service.fetch_historical_data("BROKEN"))
+    with pytest.raises(ValueError, match="cached"):
+        asyncio.run(service.fetch_historical_data("BROKEN"))
+    asyncio.run(service.fetch_historical_data("ABC"))
+
+    assert [call[0] for call in provider.calls] == ["INVALIDTICKER123", "BROKEN", "ABC"]
+
+    # Requests never write the file; save() does, and only when something changed
+    assert not (tmp_path / "negative.json").exists()
+    assert cache.save() and not cache.save()
+
+    # A restarted process keeps the entries
+    reloaded = NegativeCache(path, ttl=60)
+    assert reloaded.get("INVALIDTICKER123") == "no data available"
+    assert reloaded.get("BROKEN").startswith("fetch failed")
+    assert reloaded.get("ABC") is None
+
+
+def test_entries_expire_and_ttl_zero_disables(tmp_path):
+    cache = NegativeCache(str(tmp_path / "negative.json"), ttl=60)
+    cache.add("OLD", "no data available", ttl=-1)
+    assert cache.get("OLD") is None and len(cache) == 0
+
+    disabled = NegativeCache("", ttl=0)
+    disabled.add("NOPE", "no data available")
+    assert disabled.get("NOPE") is None
+
+
+def test_replay_misses_are_not_negative_cached(tmp_path):
+    """In replay mode a response-cache miss is not recorded as an unknown ticker."""
+    from app.services.market_data_provider import YahooChartProvider
+    from app.services.response_cache import ResponseCache
+
+    provider = YahooChartProvider(base_url="http://chart.test/", cache=ResponseCache(str(tmp_path), mode="replay"))
+    cache = NegativeCache("", ttl=60)
+    service = make_service(provider, cache)
+
+    with pytest.raises(ValueError, match="(?i)no data available"):
+        asyncio.run(service.fetch_historical_data("SPY"))
+    assert len(cache) == 0
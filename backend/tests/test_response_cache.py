@@ -0,0 +1,52 @@
+"""
+Tests for the raw Yahoo response cache (app/services/response_cache.py).
+"""
+
+import os
+import time
+from datetime import date
+
+from app.services.market_data_provider import YahooChartProvider
+from app.services.response_cache import ResponseCache
+
+
+def test_replay_serves_cached_responses_without_http(stub_yahoo_server, tmp_path):
+    """A read_write run fills the cache; replay answers from it with no requests."""
+    window = {"start": date(2024, 3, 4), "end": date(2024, 3, 15)}
+    recorder = YahooChartProvider(base_url=stub_yahoo_server.base_url,
+                                  cache=ResponseCache(str(tmp_path), mode="read_write"))
+    recorded = recorder.fetch_history_sync("SPY", **window)
+    assert recorder.fetch_history_sync("SPY", **window).equals(recorded)
+    assert stub_yahoo_server.request_count == 1
+
+    replay = ResponseCache(str(tmp_path), mode="replay")
+    # An unroutable base URL proves replay never touches the network
+    replayer = YahooChartProvider(base_url="http://127.0.0.1:9/v8/finance/chart/", cache=replay)
+    assert replayer.fetch_history_sync("SPY", **window).equals(recorded)
+    assert replayer.fetch_history_sync("QQQ", **window) is None
+    assert replay.stats()["hits"] == 1 and replay.stats()["misses"] == 1
+
+
+def test_cache_expires_and_evicts_least_recently_used(tmp_path):
+    """Entries past the TTL are refetched and the size limit evicts the oldest reads."""
+    cache = ResponseCache(str(tmp_path), mode="read_write", ttl=60, max_bytes=10_000)
+    body = os.urandom(3000)  # Incompressible, so each entry is ~3 KB on disk
+
+    cache.put("AAA", 0, 86400, "1d", body)
+    path = cache._path(cache.cache_key("AAA", 0, 86400, "1d"))
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert cache.get("AAA", 0, 86400, "1d") is None
+    assert ResponseCache(str(tmp_path), mode="replay").get("AAA", 0, 86400, "1d") == body
+
+    for i, symbol in enumerate(["BBB", "CCC", "DDD"]):
+        cache.put(symbol, 0, 86400, "1d", body)
+        entry = cache._path(cache.cache_key(symbol, 0, 86400, "1d"))
+        os.utime(entry, (time.time() - 10 + i, time.time()))
+    # AAA was read least recently, then BBB; a fifth entry pushes the cache over 10 KB
+    cache.put("EEE", 0, 86400, "1d", body)
+
+    assert cache.get("AAA", 0, 86400, "1d") is None
+    assert cache.get("EEE", 0, 86400, "1d") == body
+    assert cache.stats()["evictions"] >= 1
+    assert cache.stats()["bytes"] <= 10_000
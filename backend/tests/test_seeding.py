@@ -0,0 +1,79 @@
+"""
+Tests for concurrent bulk seeding in app/database/init_poc.py.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from app.database.init_poc import load_ticker_csv, seed_tickers
+from app.database.models import Base
+from app.services.market_data_provider import FakeMarketDataProvider
+
+
+def history(periods, start=100.0):
+    index = pd.bdate_range("2024-01-02", periods=periods)
+    close = start + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        "Open": close, "High": close, "Low": close, "Close": close,
+        "Volume": np.full(periods, 1000.0), "Adj Close": close,
+    }, index=index)
+
+
+def test_seed_tickers_loads_each_ticker_and_reports_failures(tmp_path):
+    """Every fetched ticker is written once; failed and empty fetches are reported, not raised."""
+    path = tmp_path / "seed.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    provider = FakeMarketDataProvider(
+        frames={"AAA": history(30), "BBB": history(12, start=50.0)},
+        fail=["BAD"],
+        latency=0.01,
+    )
+    tickers = {"AAA": "AAA Inc.", "BBB": "BBB Corp.", "BAD": "Bad Co.", "NONE": "Empty Co."}
+    seen = []
+    results = {r.ticker: r for r in seed_tickers(
+        tickers, workers=4, provider=provider, bind=engine,
+        progress=lambda done, total, result: seen.append((done, total)),
+    )}
+
+    assert seen == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert (results["AAA"].price_rows, results["AAA"].return_rows) == (30, 29)
+    assert results["BBB"].ok and not results["BAD"].ok and not results["NONE"].ok
+
+    conn = sqlite3.connect(path)
+    counts = dict(conn.execute("SELECT ticker, COUNT(*) FROM historical_prices GROUP BY ticker"))
+    names = dict(conn.execute("SELECT symbol, name FROM tickers"))
+    conn.close()
+    engine.dispose()
+    assert counts == {"AAA": 30, "BBB": 12}
+    assert names == {"AAA": "AAA Inc.", "BBB": "BBB Corp."}
+
+
+def test_load_ticker_csv_skips_header(tmp_path):
+    path = tmp_path / "components.csv"
+    path.write_text("\ufeffSymbol,Name\naapl,Apple Inc.\nMSFT,Microsoft Corp\n\n", encoding="utf-8")
+    assert load_ticker_csv(str(path)) == {"AAPL": "Apple Inc.", "MSFT": "Microsoft Corp"}
+
+
+def test_write_ticker_data_clips_volume(tmp_path):
+    """Missing volumes are stored as NULL and oversized ones are capped at BIGINT max."""
+    from app.database.init_poc import write_ticker_data
+    from app.utils.records import BIGINT_MAX
+
+    path = tmp_path / "seed.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    data = history(3)
+    data["Volume"] = [np.nan, 1e20, 1000.0]
+
+    write_ticker_data("AAA", "AAA Inc.", data, bind=engine)
+
+    conn = sqlite3.connect(path)
+    volumes = [row[0] for row in conn.execute("SELECT volume FROM historical_prices ORDER BY date")]
+    conn.close()
+    engine.dispose()
+    assert volumes == [None, BIGINT_MAX, 1000]
@@ -0,0 +1,63 @@
+"""
+Tests for the synthetic market data generator and the benchmark suite's
+baseline comparison (scripts/synthetic_market_data.py, scripts/benchmark_suite.py).
+"""
+
+import sqlite3
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from app.database.models import Base
+
+
+def test_history_is_deterministic_and_well_formed(scripts_path):
+    from synthetic_market_data import synthetic_history
+
+    data = synthetic_history("AAPL", years=5, end=date(2024, 12, 31))
+
+    pd.testing.assert_frame_equal(data, synthetic_history("AAPL", years=5, end=date(2024, 12, 31)))
+    assert not data.equals(synthetic_history("AAPL", years=5, end=date(2024, 12, 31), seed=1))
+    assert len(data) < len(pd.bdate_range("2020-01-01", "2024-12-31"))  # sessions are missing
+    assert (data["High"] >= data[["Open", "Close"]].max(axis=1)).all()
+    assert (data["Low"] <= data[["Open", "Close"]].min(axis=1)).all()
+    assert (data["Low"] > 0).all() and (data["Volume"] > 0).all()
+    assert (data["Open"] != data["Close"].shift()).iloc[1:].any()  # overnight gaps
+
+
+def test_populate_writes_prices_returns_and_tickers(scripts_path, tmp_path):
+    from synthetic_market_data import populate, synthetic_symbols
+
+    path = tmp_path / "synthetic.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    symbols = synthetic_symbols(3)
+
+    rows = populate(engine, symbols, years=1)
+
+    with sqlite3.connect(path) as conn:
+        prices = dict(conn.execute("SELECT ticker, COUNT(*) FROM historical_prices GROUP BY ticker"))
+        returns = conn.execute("SELECT COUNT(*) FROM daily_returns").fetchone()[0]
+        version = conn.execute("SELECT version FROM data_versions WHERE name = 'tickers'").fetchone()[0]
+    assert symbols == ["SPY", "QQQ", "DIA"]
+    assert set(prices) == set(symbols)
+    assert returns == sum(prices.values()) - len(symbols)
+    assert rows == sum(prices.values()) + returns
+    assert version == 1
+
+
+def test_baseline_comparison_flags_slower_stages(scripts_path):
+    from benchmark_suite import compare_to_baseline
+
+    baseline = {"stages": {"db_load": {"median_ms": 10.0}, "summary_stats": {"median_ms": 2.0}}}
+    results = {"stages": {
+        "db_load": {"median_ms": 14.0},
+        "summary_stats": {"median_ms": 2.1},
+        "serialization": {"median_ms": 1.0},
+    }}
+
+    rows = {row["stage"]: row for row in compare_to_baseline(results, baseline, tolerance=0.25)}
+
+    assert set(rows) == {"db_load", "summary_stats"}
+    assert rows["db_load"]["regressed"] and not rows["summary_stats"]["regressed"]
@@ -0,0 +1,81 @@
+"""
+Tests for the in-memory ticker metadata catalog (app/services/ticker_catalog.py).
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.models import Base, Ticker
+from app.services.ticker_catalog import TickerCatalog, UnknownTickerError, bump_catalog_version
+
+
+@pytest.fixture
+def catalog_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add_all([
+        Ticker(symbol="SPY", name="SPDR S&P 500 ETF", type="etf", exchange="NYSE Arca",
+               earliest_date=date(1993, 1, 29), latest_date=date(2024, 6, 28)),
+        Ticker(symbol="AAPL", name="Apple Inc.", type="stock", exchange="NASDAQ",
+               earliest_date=date(1980, 12, 12), latest_date=date(2024, 6, 28)),
+        Ticker(symbol="MSFT", name="Microsoft Corporation", type="stock", exchange="NASDAQ"),
+    ])
+    db.commit()
+    db.close()
+    yield engine, Session
+    engine.dispose()
+
+
+def test_catalog_indexes_by_symbol_type_and_exchange(catalog_db):
+    _, Session = catalog_db
+    catalog = TickerCatalog(session_factory=Session)
+    assert catalog.load()
+
+    assert catalog.get("aapl").earliest_date == date(1980, 12, 12)
+    assert [t.symbol for t in catalog.tickers(type="stock")] == ["AAPL", "MSFT"]
+    assert [t.symbol for t in catalog.tickers(exchange="NYSE Arca")] == ["SPY"]
+    assert [t.symbol for t in catalog.tickers(type="stock", exchange="NYSE Arca")] == []
+    assert catalog.names()["SPY"] == "SPDR S&P 500 ETF"
+
+
+def test_validate_rejects_unknown_tickers_only_in_strict_mode(catalog_db):
+    _, Session = catalog_db
+    lenient = TickerCatalog(session_factory=Session, strict=False)
+    strict = TickerCatalog(session_factory=Session, strict=True)
+
+    # Nothing is rejected for being unknown before the catalog is loaded
+    assert strict.validate("NVDA") is None
+    with pytest.raises(UnknownTickerError):
+        strict.validate("DROP TABLE")
+
+    lenient.load()
+    strict.load()
+    assert strict.validate("spy").symbol == "SPY"
+    assert lenient.validate("NVDA") is None
+    with pytest.raises(UnknownTickerError, match="Unknown ticker: NVDA"):
+        strict.validate("NVDA")
+
+
+def test_reload_only_after_version_bump(catalog_db):
+    engine, Session = catalog_db
+    catalog = TickerCatalog(session_factory=Session)
+    catalog.load()
+    assert not catalog.load(force=False)
+
+    db = Session()
+    db.add(Ticker(symbol="NVDA", name="NVIDIA Corporation", type="stock"))
+    db.commit()
+    db.close()
+    assert not catalog.load(force=False) and "NVDA" not in catalog
+
+    conn = engine.raw_connection()
+    bump_catalog_version(conn, "sqlite")
+    conn.commit()
+    conn.close()
+    assert catalog.load(force=False)
+    assert "NVDA" in catalog and catalog.version == 1
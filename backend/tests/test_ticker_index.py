@@ -0,0 +1,58 @@
+"""
+Tests for the in-memory ticker search index (app/services/ticker_index.py).
+"""
+
+from app.services.ticker_index import TickerIndex
+
+NAMES = {
+    "AAPL": "Apple Inc.",
+    "AAL": "American Airlines Group",
+    "MSFT": "Microsoft Corporation",
+    "MU": "Micron Technology",
+    "AMD": "Advanced Micro Devices",
+    "SPY": "SPDR S&P 500 ETF",
+}
+
+
+def tickers(results):
+    return [r["ticker"] for r in results]
+
+
+def test_symbol_prefix_then_name_then_substring():
+    index = TickerIndex(NAMES)
+    assert tickers(index.search("aa")) == ["AAL", "AAPL"]
+    assert tickers(index.search("micro")) == ["AMD", "MSFT", "MU"]
+    assert tickers(index.search("advanced micro")) == ["AMD"]
+    assert tickers(index.search("APL")) == ["AAPL"]
+    assert index.search("AAPL") == [{"ticker": "AAPL", "name": "Apple Inc."}]
+    assert index.search("XYZ123NOTFOUND") == []
+    assert len(index.search("A", limit=2)) == 2
+
+
+def test_add_and_rebuild_replace_snapshot():
+    index = TickerIndex(NAMES)
+    index.add({"NVDA": "NVIDIA Corporation"})
+    assert "NVDA" in index and tickers(index.search("nvidia")) == ["NVDA"]
+
+    index.rebuild({"QQQ": "Invesco QQQ Trust"})
+    assert len(index) == 1 and index.search("AAPL") == []
+
+
+def test_ranking_exact_prefix_name_then_fuzzy():
+    """Exact symbol beats prefix matches, and company names rank above typo matches."""
+    index = TickerIndex({**NAMES, "APP": "AppLovin Corporation", "APPF": "AppFolio Inc.",
+                         "NVDA": "NVIDIA Corporation"})
+    assert tickers(index.search("APP"))[:3] == ["APP", "APPF", "AAPL"]
+    assert tickers(index.search("nvida")) == ["NVDA"]
+    assert tickers(index.search("microsft"))[0] == "MSFT"
+
+
+def test_popularity_boost_lifts_name_matches():
+    index = TickerIndex({**NAMES, "APPF": "AppFolio Inc.", "APPN": "Appian Corporation"})
+    assert tickers(index.search("APP"))[-1] == "AAPL"
+
+    for _ in range(50):
+        index.record_query("AAPL")
+    index.record_query("APPN")
+    assert tickers(index.search("APP"))[0] == "AAPL"
+    assert index.popularity() == {"AAPL": 50.0, "APPN": 1.0}
@@ -0,0 +1,150 @@
+"""
+Tests for the market data update pipeline in scripts/update_market_data.py.
+"""
+
+from datetime import date
+
+import pytest
+
+from app.services.market_data_provider import YahooChartProvider
+from app.services.response_cache import ResponseCache
+
+
+def chart_provider(base_url, **kwargs):
+    """Chart provider against the stub server, bypassing the shared response cache."""
+    return YahooChartProvider(base_url=base_url, cache=ResponseCache("", mode="off"), **kwargs)
+
+
+def test_pipeline_updates_every_ticker(stub_yahoo_server):
+    """Every task is fetched, transformed and written exactly once."""
+    from update_market_data import TokenBucket, UpdateTask, run_pipeline
+
+    tasks = [
+        UpdateTask(f"T{i:02d}", date(2024, 3, 4), date(2024, 3, 15), latest_in_db=date(2024, 3, 1))
+        for i in range(20)
+    ]
+    written = {}
+
+    def write(prepared):
+        written[prepared.ticker] = prepared
+        return {"prices_added": len(prepared.price_records),
+                "returns_added": len(prepared.return_records)}
+
+    provider = chart_provider(stub_yahoo_server.base_url, rate_limiter=TokenBucket(rate=1000, capacity=10))
+    totals = run_pipeline(tasks, provider, write, workers=4)
+
+    assert totals["failed_tickers"] == []
+    assert sorted(written) == [task.ticker for task in tasks]
+    assert stub_yahoo_server.request_count == len(tasks)
+    # Ten weekdays between March 4 and 15
+    assert all(len(p.price_records) == 10 for p in written.values())
+    assert totals["prices_added"] == 200
+
+
+def test_pipeline_reports_failed_fetches(stub_yahoo_server):
+    """Tickers whose fetch fails are reported and never reach the writer."""
+    from update_market_data import UpdateTask, run_pipeline
+
+    provider = chart_provider(stub_yahoo_server.base_url.replace("/chart/", "/missing/"))
+    written = []
+    totals = run_pipeline(
+        [UpdateTask("SPY", date(2024, 3, 4), date(2024, 3, 8))],
+        provider,
+        lambda prepared: written.append(prepared) or {"prices_added": 0, "returns_added": 0},
+        workers=2,
+    )
+
+    assert totals["failed_tickers"] == ["SPY"]
+    assert written == []
+
+
+def test_plan_updates_skips_current_and_missing_tickers(stub_yahoo_server):
+    """Only stale tickers become tasks, with windows starting after their latest date."""
+    from update_market_data import plan_updates
+
+    plan = plan_updates(
+        {"SPY": date(2024, 3, 1), "QQQ": date(2024, 3, 8), "NEW": None},
+        end_date=date(2024, 3, 8),
+    )
+
+    assert [(t.ticker, t.start_date, t.end_date) for t in plan.tasks] == [
+        ("SPY", date(2024, 3, 2), date(2024, 3, 8))
+    ]
+    assert plan.current == ["QQQ"]
+    assert plan.missing == ["NEW"]
+
+
+def test_seeded_returns_match_full_recompute(stub_yahoo_server):
+    """Returns chained from the last stored close equal a full recompute, first day included."""
+    from app.utils.returns import DerivationSeed, diff_returns, incremental_returns
+    from update_market_data import UpdateTask, transform_ticker
+
+    provider = chart_provider(stub_yahoo_server.base_url)
+    full = provider.fetch_history_sync("SPY", start=date(2024, 3, 4), end=date(2024, 3, 15))
+    stored, new = full.loc[:"2024-03-08"], full.loc["2024-03-11":]
+
+    seed = DerivationSeed(last_date=date(2024, 3, 8), last_close=float(stored["Close"].iloc[-1]))
+    task = UpdateTask("SPY", date(2024, 3, 9), date(2024, 3, 15), latest_in_db=date(2024, 3, 8), seed=seed)
+    prepared = transform_ticker(task, full)
+
+    expected = incremental_returns(full["Close"])
+    assert len(prepared.return_records) == len(new) == 5
+    assert [r[1] for r in prepared.return_records] == [d.strftime("%Y-%m-%d") for d in new.index]
+    assert [r[2] for r in prepared.return_records] == pytest.approx(expected.loc[new.index].tolist())
+
+    # Verification flags a stored series missing the first new day
+    stored_returns = expected.drop(new.index[0])
+    diff = diff_returns("SPY", stored_returns, expected)
+    assert not diff.ok and diff.missing == [new.index[0]]
+
+
+def test_prepared_records_handle_missing_values(scripts_path):
+    """Record preparation maps NaN to None, caps volume at BIGINT max and skips NaN returns."""
+    import numpy as np
+    import pandas as pd
+    from update_market_data import prepare_price_data, prepare_return_data
+
+    index = pd.DatetimeIndex(["2024-03-04", "2024-03-05", "2024-03-06"])
+    data = pd.DataFrame({
+        "Open": [1.0, np.nan, 3.0],
+        "High": [1.5, 2.5, 3.5],
+        "Low": [0.5, 1.5, 2.5],
+        "Close": [1.2, 2.2, 3.2],
+        "Volume": [100.0, np.nan, 1e20],
+    }, index=index)
+
+    records = prepare_price_data("SPY", data)
+    assert records[0] == ("SPY", "2024-03-04", 1.0, 1.5, 0.5, 1.2, 100, 1.2)
+    assert records[1][2] is None and records[1][6] is None
+    assert records[2][6] == 9223372036854775807
+    assert all(type(value) in (str, float, int, type(None)) for record in records for value in record)
+
+    returns = pd.DataFrame({"daily_return": [np.nan, 0.5, -0.25]}, index=index)
+    assert prepare_return_data("SPY", returns) == [("SPY", "2024-03-05", 0.5), ("SPY", "2024-03-06", -0.25)]
+
+
+def test_pipeline_survives_unexpected_fetch_errors(scripts_path):
+    """An unexpected exception fails its own ticker; every other ticker is still written."""
+    from synthetic_market_data import synthetic_history
+    from update_market_data import UpdateTask, run_pipeline
+
+    from app.services.market_data_provider import FakeMarketDataProvider
+
+    class BrokenProvider(FakeMarketDataProvider):
+        async def fetch_history(self, symbol, *args, **kwargs):
+            if symbol == "BAD":
+                raise RuntimeError("unexpected payload")
+            return await super().fetch_history(symbol, *args, **kwargs)
+
+    symbols = ["AAA", "BAD", "BBB", "CCC"]
+    provider = BrokenProvider({s: synthetic_history(s, years=1, end=date(2024, 3, 15)) for s in symbols})
+    written = []
+    totals = run_pipeline(
+        [UpdateTask(s, date(2024, 3, 4), date(2024, 3, 15)) for s in symbols],
+        provider,
+        lambda prepared: written.append(prepared.ticker) or {"prices_added": 0, "returns_added": 0},
+        workers=1,
+    )
+
+    assert totals["failed_tickers"] == ["BAD"]
+    assert sorted(written) == ["AAA", "BBB", "CCC"]
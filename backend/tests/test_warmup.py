@@ -0,0 +1,76 @@
+"""
+Tests for DataService's in-memory history cache, the startup warm-up and /ready.
+"""
+
+import asyncio
+
+from app.main import app, warmup_tickers
+from app.services.data_service import DataService
+from app.services.market_data_provider import FakeMarketDataProvider
+from app.services.ticker_catalog import CatalogSnapshot, TickerInfo, ticker_catalog
+
+
+def make_service(frames):
+    service = DataService(provider=FakeMarketDataProvider({}))
+    loads = []
+
+    def load(ticker):
+        loads.append(ticker)
+        return frames.get(ticker)
+
+    service._get_from_database = load
+    return service, loads
+
+
+def test_warm_cache_serves_queries_from_memory(mock_price_data):
+    """Warmed tickers skip the database load and reuse the precomputed returns."""
+    service, loads = make_service({"SPY": mock_price_data, "QQQ": mock_price_data.iloc[:100]})
+
+    assert service.warm_cache(["SPY", "QQQ", "MISSING"]) == {"SPY": True, "QQQ": True, "MISSING": False}
+    data = asyncio.run(service.fetch_historical_data("SPY"))
+
+    assert loads == ["SPY", "QQQ", "MISSING"]
+    assert data is mock_price_data
+    assert service.calculate_percentage_change(data) is service.cache["SPY"].pct_change
+
+
+def test_cache_is_bounded_and_invalidated_by_catalog_version(mock_price_data, monkeypatch):
+    """The cache evicts least recently used tickers and drops entries when the catalog version moves."""
+    monkeypatch.setattr(ticker_catalog, "_snapshot", CatalogSnapshot.build([
+        TickerInfo(t, t, "stock", None, True, None, None, None) for t in ("AAA", "BBB", "CCC")
+    ], version=4))
+    service, loads = make_service({t: mock_price_data for t in ("AAA", "BBB", "CCC")})
+    service.cache_size = 2
+    service.warm_cache(["AAA", "BBB"])
+    asyncio.run(service.fetch_historical_data("AAA"))
+    service.warm_cache(["CCC"])
+    assert list(service.cache) == ["AAA", "CCC"]
+
+    # An ingestion bumped the catalog version since AAA was cached
+    service.cache["AAA"] = service.cache["AAA"]._replace(catalog_version=ticker_catalog.version + 1)
+    loads.clear()
+    asyncio.run(service.fetch_historical_data("AAA"))
+    assert loads == ["AAA"]
+
+
+def test_warmup_tickers_include_categories_and_popular_tickers(monkeypatch):
+    from app.services.constituents_service import constituents_service
+
+    monkeypatch.setattr(constituents_service.ticker_index, "_popularity", {"NVDA": 9.0, "SPY": 5.0, "TSLA": 3.0})
+    tickers = warmup_tickers()
+
+    assert tickers[:3] == ["SPY", "QQQ", "DIA"]
+    assert tickers[-2:] == ["NVDA", "TSLA"]
+    assert len(tickers) == len(set(tickers))
+
+
+def test_ready_reports_warmup_separately_from_health(client, monkeypatch):
+    monkeypatch.setattr(app.state, "ready", False)
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 503
+
+    monkeypatch.setattr(app.state, "ready", True)
+    monkeypatch.setattr(app.state, "warmup", {"warmed": 3, "requested": 4, "seconds": 0.1})
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["warmed"] == 3
@@ -0,0 +1,43 @@
+"""
+Tests for vectorized chart JSON parsing (parse_chart_result).
+"""
+
+import pandas as pd
+
+from app.services.chart_parser import parse_chart_result
+
+
+def chart_result(timestamps, close, tz="America/New_York"):
+    n = len(timestamps)
+    return {
+        "meta": {"exchangeTimezoneName": tz},
+        "timestamp": timestamps,
+        "indicators": {"quote": [{
+            "open": [1.0] * n, "high": [2.0] * n, "low": [0.5] * n,
+            "close": close, "volume": [100] * n,
+        }]},
+    }
+
+
+def test_parse_masks_nulls_and_uses_exchange_dates():
+    """Bars with null fields are dropped and daily bars land on the exchange's trading date."""
+    timestamps = [
+        int(pd.Timestamp("1962-01-02 14:30", tz="UTC").timestamp()),  # Before the epoch
+        int(pd.Timestamp("2024-03-07 14:30", tz="UTC").timestamp()),
+        int(pd.Timestamp("2024-03-08 14:30", tz="UTC").timestamp()),
+        # 03:00 UTC on the 12th is still the 11th in New York
+        int(pd.Timestamp("2024-03-12 03:00", tz="UTC").timestamp()),
+    ]
+    df = parse_chart_result(chart_result(timestamps, [10.0, None, 11.5, 12.0]))
+
+    assert list(df.index) == [pd.Timestamp("1962-01-02"), pd.Timestamp("2024-03-08"), pd.Timestamp("2024-03-11")]
+    assert df.index.name == "Date" and df.index.tz is None
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume", "Adj Close"]
+    assert df["Close"].tolist() == [10.0, 11.5, 12.0]
+    assert df["Adj Close"].equals(df["Close"])
+    assert df["Volume"].dtype == "int64"
+
+    intraday = parse_chart_result(chart_result(timestamps[2:3], [11.5]), interval="1h")
+    assert intraday.index[0] == pd.Timestamp("2024-03-08 09:30")
+
+    assert parse_chart_result(chart_result(timestamps[:1], [None])) is None
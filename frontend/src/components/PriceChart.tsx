@@ -23,6 +23,9 @@ interface PriceDataPoint {
   close: number;
 }
 
+// More points than this are not distinguishable at typical chart widths
+const CHART_MAX_POINTS = 400;
+
 interface PriceChartProps {
   ticker: string;
   occurrenceDates: string[];
@@ -38,13 +41,16 @@ export default function PriceChart({ ticker }: PriceChartProps) {
     const fetchPrices = async () => {
       try {
         setLoading(true);
-        const response = await apiService.getHistoricalPrices(ticker);
-
-        // Just show last 2 years of data
-        const twoYearsData = response.prices.slice(-504); // ~252 trading days per year * 2
+        // Just show last 2 years of data, downsampled server-side to the chart width
+        const start = new Date();
+        start.setFullYear(start.getFullYear() - 2);
+        const response = await apiService.getHistoricalPrices(ticker, {
+          startDate: start.toISOString().slice(0, 10),
+          maxPoints: CHART_MAX_POINTS,
+        });
 
         // Transform to simpler format
-        const chartData = twoYearsData.map(price => ({
+        const chartData = response.prices.map(price => ({
           date: price.date,
           close: price.close,
         }));
@@ -28,13 +28,28 @@ export const apiService = {
     return response.data.suggestions;
   },
 
-  async getEtfConstituents(etfTicker: string): Promise<{ etf: string; constituents: string[]; count: number }> {
+  async getEtfConstituents(etfTicker: string): Promise<{
+    etf: string;
+    constituents: string[];
+    weights: Record<string, number | null>;
+    as_of: string | null;
+    count: number;
+  }> {
     const response = await api.get(`/api/tickers/etf/${etfTicker}`);
     return response.data;
   },
 
-  async getHistoricalPrices(ticker: string): Promise<{ ticker: string; prices: Array<{ date: string; open: number; high: number; low: number; close: number; volume: number }> }> {
-    const response = await api.get(`/api/prices/${ticker}`);
+  async getHistoricalPrices(
+    ticker: string,
+    options: { startDate?: string; endDate?: string; maxPoints?: number } = {}
+  ): Promise<{ ticker: string; prices: Array<{ date: string; open: number; high: number; low: number; close: number; volume: number }> }> {
+    const response = await api.get(`/api/prices/${ticker}`, {
+      params: {
+        start_date: options.startDate,
+        end_date: options.endDate,
+        max_points: options.maxPoints,
+      },
+    });
     return response.data;
   },
 
@@ -5,6 +5,10 @@ export interface QueryRequest {
   operator: 'gt' | 'lt' | 'gte' | 'lte' | 'eq';
   time_horizons?: ('1d' | '1w' | '1m' | '1y')[];
   lookback_days?: number;
+  include_instances?: 'all' | 'none' | 'recent' | 'page';
+  limit?: number;
+  cursor?: string;
+  sort?: 'date_asc' | 'date_desc';
 }
 
 export interface PatternInstance {
@@ -29,6 +33,16 @@ export interface QueryResponse {
   instances: PatternInstance[];
   summary_statistics: Record<string, SummaryStatistics>;
   total_occurrences: number;
+  next_cursor?: string | null;
+}
+
+export interface TickerMetadata {
+  symbol: string;
+  name: string | null;
+  type: string | null;
+  exchange: string | null;
+  earliest_date: string | null;
+  latest_date: string | null;
 }
 
 export interface TickerListResponse {
@@ -38,6 +52,8 @@ export interface TickerListResponse {
   sentiment_indicators: string[];
   commodities: string[];
   top_stocks: string[];
+  tickers: TickerMetadata[];
+  catalog_version: number | null;
 }
 
 export interface TickerSuggestion {